@@ -0,0 +1,9 @@
+# ⌘
+#
+#  /fileknight/benchmarks/__init__.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+# FileKnight benchmark package (run it with fileknight_bench.py)
@@ -0,0 +1,146 @@
+# ⌘
+#
+#  /fileknight/benchmarks/runner.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks.trees import SHAPES, generate, touch_fraction
+from core.copier import copy_item
+from core.models import Entry
+
+MODES = ("copy", "mirror")
+PHASES = ("cold", "warm_noop", "small_change")
+CHANGE_FRACTION = 0.01
+
+
+@dataclass
+class PhaseResult:
+    shape: str
+    mode: str
+    phase: str
+    seconds: float
+    files: int  # files looked at (copied + updated + skipped)
+    files_written: int
+    bytes_written: int
+    files_per_s: float
+    mb_per_s: float  # bytes_written / seconds
+    read_syscalls: int | None
+    write_syscalls: int | None
+    peak_rss_kb: int | None
+
+
+def _proc_io() -> dict[str, int] | None:
+    """
+    Linux per-process I/O counters (syscr/syscw = read/write syscalls issued).
+    """
+    try:
+        with open("/proc/self/io", "r", encoding="ascii") as f:
+            return {k: int(v) for k, v in (line.split(": ") for line in f)}
+    except OSError:
+        return None
+
+
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def _measure(shape: str, mode: str, phase: str, entry: Entry, destination_root: Path) -> PhaseResult:
+    io_before = _proc_io()
+    start = time.perf_counter()
+    result = copy_item(entry, destination_root, dry_run=False)
+    seconds = max(time.perf_counter() - start, 1e-9)
+    io_after = _proc_io()
+
+    def io_delta(key: str) -> int | None:
+        if io_before is None or io_after is None:
+            return None
+        return io_after[key] - io_before[key]
+
+    written = result.copied + result.updated
+    return PhaseResult(
+        shape=shape,
+        mode=mode,
+        phase=phase,
+        seconds=round(seconds, 4),
+        files=written + result.skipped,
+        files_written=written,
+        bytes_written=result.bytes_copied,
+        files_per_s=round((written + result.skipped) / seconds, 1),
+        mb_per_s=round(result.bytes_copied / seconds / (1024 * 1024), 2),
+        read_syscalls=io_delta("syscr"),
+        write_syscalls=io_delta("syscw"),
+        peak_rss_kb=_peak_rss_kb(),
+    )
+
+
+def run_case(shape: str, mode: str, workdir: str, scale: float, workers: int) -> list[dict[str, Any]]:
+    """
+    One shape x mode, in its own process so peak RSS and I/O counters are not shared.
+    "cold" means an empty destination; the OS page cache is not dropped.
+    """
+    base = Path(workdir) / f"{shape}-{mode}"
+    shutil.rmtree(base, ignore_errors=True)
+    source = base / "source"
+    destination_root = base / "destination"
+    generate(shape, source, scale)
+
+    entry = Entry(name="bench", source=source, mode=mode, workers=workers)
+    results = [_measure(shape, mode, "cold", entry, destination_root)]
+    results.append(_measure(shape, mode, "warm_noop", entry, destination_root))
+    touch_fraction(source, CHANGE_FRACTION)
+    results.append(_measure(shape, mode, "small_change", entry, destination_root))
+
+    shutil.rmtree(base, ignore_errors=True)
+    return [asdict(r) for r in results]
+
+
+def run_suite(
+    workdir: Path,
+    shapes: list[str] | None = None,
+    modes: list[str] | None = None,
+    scale: float = 1.0,
+    workers: int = 4,
+) -> dict[str, Any]:
+    shapes = shapes or list(SHAPES)
+    modes = modes or list(MODES)
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results: list[dict[str, Any]] = []
+    ctx = multiprocessing.get_context("spawn")
+    for shape in shapes:
+        for mode in modes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                results.extend(pool.submit(run_case, shape, mode, str(workdir), scale, workers).result())
+
+    return {
+        "meta": {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": scale,
+            "workers": workers,
+        },
+        "results": results,
+    }
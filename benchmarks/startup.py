@@ -0,0 +1,100 @@
+# ⌘
+#
+#  /fileknight/benchmarks/startup.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+RUN_SCRIPT = ROOT_DIR / "fileknight_run.py"
+TOP_MODULES = 10
+
+
+def write_config(path: Path, source: Path, entries: int) -> None:
+    """
+    A config with many entries (all on the same small source), like a generated one.
+    """
+    source.mkdir(parents=True, exist_ok=True)
+    (source / "file.txt").write_text("FileKnight\n", encoding="utf-8")
+    cfg = {
+        "language": "auto",
+        "dry_run": True,
+        "destination_root": str(path.parent / "destination"),
+        "entries": [
+            {"name": f"bench-{i}", "source": str(source), "mode": "copy", "exclude": ["*.tmp", "build/"]}
+            for i in range(entries)
+        ],
+    }
+    path.write_text(json.dumps(cfg, indent=2) + "\n", encoding="utf-8")
+
+
+def parse_importtime(stderr: str) -> tuple[float, list[tuple[str, float]]]:
+    """
+    (total import ms, [(module, cumulative ms)] of the top-level imports) from -X importtime output.
+    """
+    top: list[tuple[str, float]] = []
+    for line in stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # other output, or the header line
+        _self_us, cumulative, name = parts
+        if not name[1:].startswith(" "):  # nested imports are indented under the one that made them
+            top.append((name.strip(), int(cumulative) / 1000))
+    return sum(ms for _name, ms in top), top
+
+
+def _run_once(argv: list[str], config: Path) -> tuple[float, str]:
+    env = dict(os.environ, FILEKNIGHT_CONFIG=str(config))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(RUN_SCRIPT), *argv],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    return (time.perf_counter() - start) * 1000, proc.stderr
+
+
+def run_startup(workdir: Path, entries: int = 1000, runs: int = 5) -> dict[str, Any]:
+    """
+    Time `fileknight_run.py --dry-run --entry bench-0` as a cron job would start it, with
+    -X importtime: "cold" has no config cache (each run deletes it first), "cached" reuses it.
+    Reports the median wall time and import time, and the slowest top-level imports.
+    """
+    from core.config_cache import cache_path
+
+    config = workdir / "startup" / "config.json"
+    write_config(config, workdir / "startup" / "source", entries)
+    argv = ["--dry-run", "--entry", "bench-0"]
+
+    phases: dict[str, Any] = {}
+    for phase in ("cold", "cached"):
+        walls: list[float] = []
+        imports: list[float] = []
+        top: list[tuple[str, float]] = []
+        for _ in range(runs):
+            if phase == "cold":
+                cache_path(config).unlink(missing_ok=True)
+            wall, stderr = _run_once(argv, config)
+            total, top = parse_importtime(stderr)
+            walls.append(wall)
+            imports.append(total)
+        phases[phase] = {
+            "wall_ms": round(statistics.median(walls), 1),
+            "import_ms": round(statistics.median(imports), 1),
+            "slowest_imports": [
+                {"module": name, "cumulative_ms": round(ms, 1)}
+                for name, ms in sorted(top, key=lambda item: item[1], reverse=True)[:TOP_MODULES]
+            ],
+        }
+    return {"entries": entries, "runs": runs, "argv": argv, **phases}
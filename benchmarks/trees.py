@@ -0,0 +1,95 @@
+# ⌘
+#
+#  /fileknight/benchmarks/trees.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+import random
+from collections.abc import Callable
+from pathlib import Path
+
+_CHUNK = 1024 * 1024
+
+
+def _write_file(path: Path, size: int, rng: random.Random) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        remaining = size
+        while remaining > 0:
+            n = min(_CHUNK, remaining)
+            f.write(rng.randbytes(n))
+            remaining -= n
+
+
+def tiny_files(root: Path, scale: float, rng: random.Random) -> None:
+    """Many tiny files (0.5-4 KB) spread over 100-file folders."""
+    count = max(1, int(20_000 * scale))
+    for i in range(count):
+        _write_file(root / f"d{i // 100:04d}" / f"f{i:06d}.txt", rng.randint(512, 4096), rng)
+
+
+def huge_files(root: Path, scale: float, rng: random.Random) -> None:
+    """A few huge files."""
+    size = max(_CHUNK, int(256 * _CHUNK * scale))
+    for i in range(4):
+        _write_file(root / f"huge{i}.bin", size, rng)
+
+
+def deep_tree(root: Path, scale: float, rng: random.Random) -> None:
+    """Deep nesting: long chains of folders with a couple of files at each level."""
+    chains = max(1, int(40 * scale))
+    for c in range(chains):
+        folder = root / f"chain{c:03d}"
+        for depth in range(50):
+            folder = folder / f"level{depth:02d}"
+            _write_file(folder / "a.dat", rng.randint(1024, 16 * 1024), rng)
+            _write_file(folder / "b.dat", rng.randint(1024, 16 * 1024), rng)
+
+
+def mixed_tree(root: Path, scale: float, rng: random.Random) -> None:
+    """Roughly source-code/photo-folder shaped: mostly small files, some medium, a few big."""
+    count = max(1, int(5_000 * scale))
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.85:
+            size = rng.randint(256, 32 * 1024)
+        elif roll < 0.99:
+            size = rng.randint(64 * 1024, 4 * _CHUNK)
+        else:
+            size = rng.randint(16 * _CHUNK, 64 * _CHUNK)
+        folder = root / f"p{i % 37:02d}" / f"s{i % 11:02d}"
+        _write_file(folder / f"file{i:05d}.bin", size, rng)
+
+
+SHAPES: dict[str, Callable[[Path, float, random.Random], None]] = {
+    "tiny": tiny_files,
+    "huge": huge_files,
+    "deep": deep_tree,
+    "mixed": mixed_tree,
+}
+
+
+def generate(shape: str, root: Path, scale: float = 1.0, seed: int = 1234) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    SHAPES[shape](root, scale, random.Random(seed))
+
+
+def touch_fraction(root: Path, fraction: float, seed: int = 99) -> int:
+    """
+    Simulate a day's edits: rewrite the first KB of a fraction of the files and bump their mtime.
+    Returns how many files were changed.
+    """
+    rng = random.Random(seed)
+    files = sorted(p for p in root.rglob("*") if p.is_file())
+    picked = rng.sample(files, max(1, int(len(files) * fraction))) if files else []
+    for path in picked:
+        with path.open("r+b") as f:
+            f.write(rng.randbytes(min(1024, path.stat().st_size or 1)))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+    return len(picked)
@@ -17,22 +17,135 @@ sys.path.insert(0, str(SRC_DIR))
 
 CONFIG_PATH = ROOT_DIR / "config.json"
 
+import os
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 
 from core.config_io import write_default_config, export_config, import_config
-from core.config_manager import (
-    load_config_raw,
-    load_config,
-    save_config,
-    add_or_update_entry,
-    remove_entry,
-    set_destination_root,
-    set_dry_run,
-)
-from core.config_manager import validate_entries
-from core.copier import copy_item
+from core.config_manager import set_destination_root, set_dry_run
+from core.config_manager import destination_roots, engine_settings, global_workers, hash_processes, run_limits
+from core.config_model import ConfigModel
+from core.copier import run_entries
 from core.i18n import detect_language_code, load_locale, t
+from core.models import MODES, CopyResult, DestinationError, Entry, RunOptions
+from core.progress import CancelledError, Progress
+from core.throttle import Throttle
+
+POLL_MS = 100  # how often the window drains the backup worker's queue
+SAVE_DELAY_MS = 500  # config edits are written once they stop coming for this long
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def destination_text(cfg: dict | ConfigModel) -> str:
+    """
+    config.destination_root for the text field: several roots are separated by os.pathsep.
+    """
+    raw = cfg.get("destination_root", "")
+    return os.pathsep.join(str(p) for p in raw) if isinstance(raw, list) else str(raw)
+
+
+def format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+class BackupProgressWindow:
+    """
+    One row per entry (progress bar + bytes/s + ETA), a speed limit that applies
+    to the running copies, and a Cancel button.
+    Fed from the Tk thread only.
+    """
+
+    def __init__(self, parent: tk.Tk, entries: list[Entry], on_cancel, throttle: Throttle) -> None:
+        self.top = tk.Toplevel(parent)
+        self.top.title("FileKnight")
+        self.top.transient(parent)
+        self.top.protocol("WM_DELETE_WINDOW", on_cancel)
+
+        self.bars: dict[str, ttk.Progressbar] = {}
+        self.labels: dict[str, tk.StringVar] = {}
+        self.started: dict[str, float] = {}
+
+        frm = tk.Frame(self.top)
+        frm.pack(fill="both", expand=True, padx=10, pady=10)
+        for row, e in enumerate(entries):
+            if e.name in self.bars:
+                continue
+            tk.Label(frm, text=e.name, anchor="w").grid(row=row, column=0, sticky="w", padx=(0, 8))
+            bar = ttk.Progressbar(frm, length=280, maximum=1.0)
+            bar.grid(row=row, column=1, sticky="we", pady=2)
+            label = tk.StringVar(value="waiting")
+            tk.Label(frm, textvariable=label, anchor="w", width=30).grid(row=row, column=2, sticky="w", padx=(8, 0))
+            self.bars[e.name] = bar
+            self.labels[e.name] = label
+        frm.columnconfigure(1, weight=1)
+
+        self.throttle = throttle
+        limit = tk.Frame(self.top)
+        limit.pack(pady=(0, 6))
+        tk.Label(limit, text="Speed limit (Mbps, 0 = none):").pack(side="left")
+        self.limit_var = tk.StringVar(value=f"{throttle.max_mbps:g}")
+        tk.Entry(limit, textvariable=self.limit_var, width=8).pack(side="left", padx=4)
+        tk.Button(limit, text="Apply", command=self._apply_limit).pack(side="left")
+
+        self.cancel_button = tk.Button(self.top, text="Cancel", width=12, command=on_cancel)
+        self.cancel_button.pack(pady=(0, 10))
+
+    def _apply_limit(self) -> None:
+        try:
+            mbps = max(0.0, float(self.limit_var.get().strip() or 0))
+        except ValueError:
+            self.limit_var.set(f"{self.throttle.max_mbps:g}")
+            return
+        self.throttle.configure(mbps, self.throttle.max_files_per_sec)
+        self.limit_var.set(f"{mbps:g}")
+
+    def update(self, p: Progress) -> None:
+        bar = self.bars.get(p.entry)
+        if bar is None:
+            return
+        now = time.monotonic()
+        start = self.started.setdefault(p.entry, now)
+        fraction = p.bytes_done / p.bytes_total if p.bytes_total else (p.files_done / p.files_total if p.files_total else 1.0)
+        bar["value"] = fraction
+
+        elapsed = now - start
+        rate = p.bytes_done / elapsed if elapsed > 0 else 0.0
+        text = f"{p.files_done}/{p.files_total} files"
+        if rate > 0:
+            text += f" | {format_bytes(rate)}/s | ETA {format_eta((p.bytes_total - p.bytes_done) / rate)}"
+        self.labels[p.entry].set(text)
+
+    def finish_entry(self, name: str, outcome: CopyResult | Exception) -> None:
+        """
+        Called once per destination root; a failure on any root stays on the label.
+        """
+        if name not in self.bars or self.labels[name].get().startswith("FAIL"):
+            return
+        if isinstance(outcome, DestinationError) and isinstance(outcome.error, CancelledError):
+            self.labels[name].set("cancelled")
+        elif isinstance(outcome, CancelledError):
+            self.labels[name].set("cancelled")
+        elif isinstance(outcome, Exception):
+            self.labels[name].set(f"FAIL: {outcome}")
+        else:
+            self.bars[name]["value"] = 1.0
+            self.labels[name].set("FAIL: verify" if outcome.verify_failed else "OK")
+
+    def close(self) -> None:
+        self.top.destroy()
 
 
 class FileKnightGUI:
@@ -43,8 +156,9 @@ class FileKnightGUI:
         if not CONFIG_PATH.exists():
             write_default_config(CONFIG_PATH)
 
-        # Load config (raw keeps _meta)
-        self.cfg = load_config_raw(CONFIG_PATH)
+        # Load config (kept in memory, _meta included; edits are saved shortly after they stop)
+        self.cfg = ConfigModel.load(CONFIG_PATH)
+        self._save_job: str | None = None
 
         lang_setting = str(self.cfg.get("language", "auto")).strip()
         lang = detect_language_code() if lang_setting == "auto" else lang_setting
@@ -55,13 +169,40 @@ class FileKnightGUI:
 
         # State
         self.source_var = tk.StringVar(value="")
-        self.dest_var = tk.StringVar(value=str(self.cfg.get("destination_root", "")))
+        self.dest_var = tk.StringVar(value=destination_text(self.cfg))
         self.name_var = tk.StringVar(value="")
         self.mode_var = tk.StringVar(value="mirror")
         self.dry_run_var = tk.BooleanVar(value=bool(self.cfg.get("dry_run", False)))
 
+        # Backup run state (worker thread + queue polled from the Tk loop)
+        self.worker: threading.Thread | None = None
+        self.events: queue.Queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.progress_window: BackupProgressWindow | None = None
+        self.run_ok = 0
+        self.run_fail = 0
+
         self._build_ui()
         self._refresh_entries_list()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _save_soon(self) -> None:
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+        self._save_job = self.root.after(SAVE_DELAY_MS, self._save_now)
+
+    def _save_now(self) -> None:
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+            self._save_job = None
+        try:
+            self.cfg.save()
+        except OSError as ex:
+            self.status.set(f"Could not save config: {ex}")
+
+    def _on_close(self) -> None:
+        self._save_now()
+        self.root.destroy()
 
     def _build_ui(self) -> None:
         pad = 10
@@ -96,7 +237,7 @@ class FileKnightGUI:
         tk.Entry(row_info, textvariable=self.name_var, width=28).pack(side="left", padx=(6, 16))
 
         tk.Label(row_info, text="mode").pack(side="left")
-        tk.OptionMenu(row_info, self.mode_var, "mirror", "copy").pack(side="left", padx=(6, 16))
+        tk.OptionMenu(row_info, self.mode_var, *MODES).pack(side="left", padx=(6, 16))
 
         tk.Checkbutton(row_info, text="dry_run", variable=self.dry_run_var, command=self._toggle_dry_run).pack(side="left")
 
@@ -119,7 +260,8 @@ class FileKnightGUI:
         tk.Button(right, text="Add/Update", width=18, command=self._add_update_entry).pack(pady=(0, 8))
         tk.Button(right, text="Remove", width=18, command=self._remove_selected).pack(pady=(0, 16))
 
-        tk.Button(right, text=t(self.strings, "run_backup"), width=18, command=self._run_backup).pack(pady=(0, 8))
+        self.run_button = tk.Button(right, text=t(self.strings, "run_backup"), width=18, command=self._run_backup)
+        self.run_button.pack(pady=(0, 8))
         tk.Button(right, text=t(self.strings, "export_config"), width=18, command=self._export_cfg).pack(pady=(0, 8))
         tk.Button(right, text=t(self.strings, "import_config"), width=18, command=self._import_cfg).pack(pady=(0, 8))
 
@@ -130,8 +272,8 @@ class FileKnightGUI:
         path = filedialog.askdirectory()
         if path:
             self.dest_var.set(path)
-            set_destination_root(self.cfg, path)
-            save_config(CONFIG_PATH, self.cfg)
+            if self.cfg.change(set_destination_root, path):
+                self._save_soon()
 
     def _choose_source_file(self) -> None:
         path = filedialog.askopenfilename()
@@ -144,31 +286,22 @@ class FileKnightGUI:
             self.source_var.set(path)
 
     def _toggle_dry_run(self) -> None:
-        set_dry_run(self.cfg, self.dry_run_var.get())
-        save_config(CONFIG_PATH, self.cfg)
+        if self.cfg.change(set_dry_run, self.dry_run_var.get()):
+            self._save_soon()
 
     def _refresh_entries_list(self) -> None:
         self.entries_list.delete(0, tk.END)
-        entries = self.cfg.get("entries", [])
-        if isinstance(entries, list):
-            for e in entries:
-                if isinstance(e, dict) and "name" in e:
-                    self.entries_list.insert(tk.END, str(e["name"]))
+        self.entries_list.insert(tk.END, *self.cfg.names())
 
     def _on_select_entry(self, _event: object) -> None:
         sel = self.entries_list.curselection()
         if not sel:
             return
-        name = self.entries_list.get(sel[0])
-        entries = self.cfg.get("entries", [])
-        if not isinstance(entries, list):
-            return
-        for e in entries:
-            if isinstance(e, dict) and str(e.get("name", "")) == name:
-                self.name_var.set(str(e.get("name", "")))
-                self.source_var.set(str(e.get("source", "")))
-                self.mode_var.set(str(e.get("mode", "mirror")))
-                return
+        e = self.cfg.entry(self.entries_list.get(sel[0]))
+        if e is not None:
+            self.name_var.set(str(e.get("name", "")))
+            self.source_var.set(str(e.get("source", "")))
+            self.mode_var.set(str(e.get("mode", "mirror")))
 
     def _add_update_entry(self) -> None:
         name = self.name_var.get().strip()
@@ -182,9 +315,9 @@ class FileKnightGUI:
             messagebox.showwarning("FileKnight", "Please select a source.")
             return
 
-        add_or_update_entry(self.cfg, name=name, source=source, mode=mode)
-        save_config(CONFIG_PATH, self.cfg)
-        self._refresh_entries_list()
+        if self.cfg.upsert_entry(name=name, source=source, mode=mode):
+            self.entries_list.insert(tk.END, name)
+        self._save_soon()
         self.status.set(f"Saved entry: {name}")
 
     def _remove_selected(self) -> None:
@@ -192,44 +325,133 @@ class FileKnightGUI:
         if not sel:
             return
         name = self.entries_list.get(sel[0])
-        if remove_entry(self.cfg, name):
-            save_config(CONFIG_PATH, self.cfg)
-            self._refresh_entries_list()
+        if self.cfg.remove_entry(name):
+            self.entries_list.delete(sel[0])
+            self._save_soon()
             self.status.set(f"Removed entry: {name}")
 
     def _run_backup(self) -> None:
-        # Ensure destination is saved
-        set_destination_root(self.cfg, self.dest_var.get().strip())
-        set_dry_run(self.cfg, self.dry_run_var.get())
-        save_config(CONFIG_PATH, self.cfg)
+        if self.worker is not None and self.worker.is_alive():
+            return
 
-        # Use the validated flow (same as CLI)
-        cfg_no_meta = load_config(CONFIG_PATH)
-        entries = validate_entries(cfg_no_meta)
+        # Ensure destination is saved (several roots: separated by os.pathsep)
+        self.cfg.change(set_destination_root, self.dest_var.get().split(os.pathsep))
+        self.cfg.change(set_dry_run, self.dry_run_var.get())
+        self._save_now()
 
-        destination_root = Path(self.dest_var.get()).expanduser()
+        # Use the validated flow (same as CLI); unchanged entries were validated by an earlier run
+        cfg_no_meta = self.cfg.to_config(meta=False)
+        entries = self.cfg.entries()
+
+        roots = destination_roots(cfg_no_meta)
         dry_run = self.dry_run_var.get()
+        if not roots:
+            messagebox.showwarning("FileKnight", "Please select a destination.")
+            return
 
         if not dry_run:
-            destination_root.mkdir(parents=True, exist_ok=True)
-
-        ok = 0
-        fail = 0
-
-        for e in entries:
+            for root in roots:
+                try:
+                    root.mkdir(parents=True, exist_ok=True)
+                except OSError:
+                    pass  # that root's entries fail with the reason; the other roots still run
+
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.run_ok = 0
+        self.run_fail = 0
+        throttle = Throttle(*run_limits(cfg_no_meta))
+        options = RunOptions(
+            progress=self.events.put, cancel=self.cancel_event, throttle=throttle, engine=engine_settings(cfg_no_meta),
+            hash_processes=hash_processes(cfg_no_meta),
+        )
+
+        self.run_button.config(state="disabled")
+        self.status.set("Backup running...")
+        self.progress_window = BackupProgressWindow(self.root, entries, self._cancel_backup, throttle)
+
+        self.worker = threading.Thread(
+            target=self._backup_worker,
+            args=(entries, roots, dry_run, global_workers(cfg_no_meta), options),
+            daemon=True,
+        )
+        self.worker.start()
+        self.root.after(POLL_MS, self._poll_backup)
+
+    def _backup_worker(
+        self,
+        entries: list[Entry],
+        roots: list[Path],
+        dry_run: bool,
+        workers: int,
+        options: RunOptions,
+    ) -> None:
+        # Runs off the Tk thread: only talks to the window through self.events
+        try:
+            for e, outcome in run_entries(entries, roots, dry_run=dry_run, workers=workers, options=options):
+                self.events.put(("done", e.name, outcome))
+        except Exception as ex:
+            self.events.put(("error", "", ex))
+        finally:
+            self.events.put(("finished", "", None))
+
+    def _cancel_backup(self) -> None:
+        self.cancel_event.set()
+        if self.progress_window is not None:
+            self.progress_window.cancel_button.config(state="disabled", text="Cancelling...")
+        self.status.set("Cancelling after the current files...")
+
+    def _poll_backup(self) -> None:
+        latest: dict[str, Progress] = {}
+        finished = False
+
+        while True:
             try:
-                copy_item(e, destination_root, dry_run=dry_run)
-                ok += 1
-            except Exception:
-                fail += 1
+                item = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, Progress):
+                latest[item.entry] = item  # only the newest snapshot per entry matters
+                continue
+
+            kind, name, outcome = item
+            if kind == "done":
+                if isinstance(outcome, Exception) or outcome.verify_failed:
+                    self.run_fail += 1
+                else:
+                    self.run_ok += 1
+                latest.pop(name, None)
+                if self.progress_window is not None:
+                    self.progress_window.finish_entry(name, outcome)
+            elif kind == "error":
+                self.run_fail += 1
+                self.status.set(f"Backup error: {outcome}")
+            elif kind == "finished":
+                finished = True
+
+        if self.progress_window is not None:
+            for p in latest.values():
+                self.progress_window.update(p)
+
+        if not finished:
+            self.root.after(POLL_MS, self._poll_backup)
+            return
+
+        if self.progress_window is not None:
+            self.progress_window.close()
+            self.progress_window = None
+        self.run_button.config(state="normal")
 
-        self.status.set(f"Backup finished | OK: {ok} | FAIL: {fail}")
-        messagebox.showinfo("FileKnight", f"Done!\nOK: {ok}\nFAIL: {fail}")
+        cancelled = self.cancel_event.is_set()
+        title = "Backup cancelled" if cancelled else "Backup finished"
+        self.status.set(f"{title} | OK: {self.run_ok} | FAIL: {self.run_fail}")
+        messagebox.showinfo("FileKnight", f"{'Cancelled' if cancelled else 'Done'}!\nOK: {self.run_ok}\nFAIL: {self.run_fail}")
 
     def _export_cfg(self) -> None:
         folder = filedialog.askdirectory()
         if not folder:
             return
+        self._save_now()  # export what the window shows, pending edits included
         exported = export_config(CONFIG_PATH, Path(folder))
         self.status.set(f"Exported: {exported}")
         messagebox.showinfo("FileKnight", f"Exported config:\n{exported}")
@@ -238,9 +460,12 @@ class FileKnightGUI:
         path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
         if not path:
             return
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)  # the imported file replaces pending edits
+            self._save_job = None
         import_config(Path(path), CONFIG_PATH)
-        self.cfg = load_config_raw(CONFIG_PATH)
-        self.dest_var.set(str(self.cfg.get("destination_root", "")))
+        self.cfg = ConfigModel.load(CONFIG_PATH)
+        self.dest_var.set(destination_text(self.cfg))
         self.dry_run_var.set(bool(self.cfg.get("dry_run", False)))
         self._refresh_entries_list()
         self.status.set("Config imported.")
@@ -0,0 +1,62 @@
+# ⌘
+#
+#  /fileknight/fileknight_bench.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent
+SRC_DIR = ROOT_DIR / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(ROOT_DIR))
+
+import argparse
+import json
+import tempfile
+
+from benchmarks.runner import MODES, run_suite
+from benchmarks.startup import run_startup
+from benchmarks.trees import SHAPES
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="fileknight_bench", add_help=True)
+    parser.add_argument("--shape", action="append", choices=sorted(SHAPES), help="Tree shape (repeatable, default: all).")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Copy mode (repeatable, default: all).")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply file counts/sizes (default: 1.0).")
+    parser.add_argument("--workers", type=int, default=4, help="Copy workers per entry (default: 4).")
+    parser.add_argument("--workdir", help="Where to generate trees (default: a temp folder).")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="Measure CLI startup instead (-X importtime, one entry out of a large config).",
+    )
+    parser.add_argument("--entries", type=int, default=1000, help="--startup: entries in the config (default: 1000).")
+    parser.add_argument("--runs", type=int, default=5, help="--startup: runs per phase, median reported (default: 5).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="fileknight-bench-") as tmp:
+        workdir = Path(args.workdir).expanduser() if args.workdir else Path(tmp)
+        if args.startup:
+            report = {"startup": run_startup(workdir, args.entries, args.runs)}
+        else:
+            report = run_suite(workdir, args.shape, args.mode, args.scale, args.workers)
+
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        Path(args.output).expanduser().write_text(text, encoding="utf-8")
+        print(f"[OK] Benchmark report written to: {args.output}")
+    else:
+        print(text, end="")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -8,6 +8,7 @@
 
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
@@ -15,16 +16,172 @@ ROOT_DIR = Path(__file__).resolve().parent
 SRC_DIR = ROOT_DIR / "src"
 sys.path.insert(0, str(SRC_DIR))
 
-CONFIG_PATH = ROOT_DIR / "config.json"
+CONFIG_PATH = Path(os.environ.get("FILEKNIGHT_CONFIG") or ROOT_DIR / "config.json")  # env: another config file
 
-import platform
+from collections.abc import Callable
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from core.cli import parse_args
-from core.config_io import export_config, import_config, write_default_config
-from core.config_manager import load_config, expand_user_and_vars, validate_entries
-from core.copier import copy_item
-from core.i18n import detect_language_code, load_locale, t
+# Only what every invocation needs is imported here: the copy engine, restore and daemon
+# modules are imported by the code paths that use them, so a cron job running one entry
+# does not pay for all of them (see fileknight_bench.py --startup).
+from core.cli import CliOptions, parse_args
+from core.config_cache import load_compiled
+from core.config_manager import (
+    daemon_settings,
+    destination_roots,
+    engine_settings,
+    global_workers,
+    hash_processes,
+    metrics_settings,
+    run_limits,
+)
+from core.i18n import t
+from core.metrics import RunMetrics, append_jsonl, timed, write_textfile
+from core.models import CopyResult, DaemonSettings, Entry, RunOptions
+
+if TYPE_CHECKING:
+    from core.throttle import Throttle
+
+
+def print_outcome(
+    e: Entry,
+    outcome: CopyResult | Exception,
+    dry_run: bool,
+    verify_only: bool,
+    show_plan: bool = False,
+    plan_limit: int | None = 20,
+) -> bool:
+    """
+    Print one entry's result block. Returns True when the entry counts as OK.
+    show_plan lists the planned paths, at most plan_limit per kind (None = all).
+    """
+    if isinstance(outcome, Exception):
+        print(f"[FAIL] {e.name}: {outcome}")
+        return False
+
+    if verify_only:
+        status = "VERIFIED"
+    else:
+        status = "SIMULATED" if dry_run else "COPIED"
+    label = "FAIL" if outcome.verify_failed else "OK"
+    print(f"[{label}] {e.name} ({e.mode}) [{status}]")
+    print(f"     from: {e.source}")
+    print(f"       to: {outcome.destination}")
+    if not dry_run or verify_only:
+        print(f"    files: {outcome.summary()}")
+    elif outcome.plan is not None:
+        print(f"     plan: {outcome.plan.summary()}")
+        if show_plan:
+            for line in outcome.plan.format(plan_limit):
+                print(f"           {line}")
+    for rel, strategy in outcome.files:
+        print(f"           {strategy}: {rel}")
+    for rel in outcome.verify_failed:
+        print(f"  [VERIFY FAILED] {rel}")
+    return not outcome.verify_failed
+
+
+def write_plan_json(path: Path, plans: list[dict]) -> None:
+    import json
+
+    totals = {
+        "entries": len(plans),
+        "total_bytes": sum(p.get("total_bytes", 0) for p in plans),
+        "estimated_seconds": round(sum(p.get("estimated_seconds", 0.0) for p in plans), 3),
+    }
+    payload = {"created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), **totals, "plans": plans}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def apply_limits(throttle: Throttle, cfg: dict, options: CliOptions) -> None:
+    """
+    Set the run throttle from config.max_mbps / max_files_per_sec, with the CLI flags taking precedence.
+    """
+    max_mbps, max_files_per_sec = run_limits(cfg)
+    throttle.configure(
+        max_mbps if options.max_mbps is None else options.max_mbps,
+        max_files_per_sec if options.max_files_per_sec is None else options.max_files_per_sec,
+    )
+
+
+def reload_limits(throttle: Throttle, options: CliOptions) -> None:
+    """
+    Re-read config.json and apply its speed limits to the running copies (daemon SIGHUP).
+    Only the limits change; entries and other settings need a restart.
+    """
+    from core.config_manager import load_config, validate_entries
+
+    try:
+        cfg = load_config(CONFIG_PATH)
+        entries = validate_entries(cfg)
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Limits not reloaded: {e}", flush=True)
+        return
+    apply_limits(throttle, cfg, options)
+    for e in entries:
+        throttle.for_entry(e).configure(e.max_mbps, e.max_files_per_sec)
+    print(
+        f"[INFO] Limits reloaded: {throttle.max_mbps:g} Mbps, {throttle.max_files_per_sec:g} files/s (0 = unlimited)",
+        flush=True,
+    )
+
+
+def backup_root(roots: list[Path], entry_name: str) -> Path:
+    """
+    The first destination root holding a backup of entry_name (the first root when none does).
+    """
+    for root in roots:
+        if (root / entry_name).exists():
+            return root
+    return roots[0]
+
+
+def run_daemon_mode(
+    entries: list[Entry],
+    destination_roots: list[Path],
+    workers: int,
+    run_options: RunOptions,
+    settings: DaemonSettings,
+    reload: Callable[[], None] | None = None,
+) -> int:
+    import signal
+    import threading
+
+    from core.daemon import run_daemon
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: stop.set())
+    if reload is not None and hasattr(signal, "SIGHUP"):  # not on Windows
+        signal.signal(signal.SIGHUP, lambda _signum, _frame: reload())
+
+    def report(e: Entry, outcome: CopyResult | Exception, kind: str) -> None:
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(outcome, Exception):
+            print(f"{stamp} [FAIL] {e.name} ({kind}): {outcome}", flush=True)
+        elif outcome.copied or outcome.updated or outcome.deleted or outcome.verify_failed:
+            print(f"{stamp} [OK] {e.name} ({kind}) {outcome.summary()}", flush=True)
+            for rel in outcome.verify_failed:
+                print(f"{stamp}   [VERIFY FAILED] {rel}", flush=True)
+
+    print(
+        f"[INFO] Daemon started: debounce {settings.debounce:g}s, "
+        f"full reconcile every {settings.reconcile_interval / 60:g} min. Ctrl+C to stop.",
+        flush=True,
+    )
+    def warn(reason: str) -> None:
+        print(
+            f"[WARN] inotify unavailable ({reason}); falling back to polling every {settings.poll_interval:g}s",
+            flush=True,
+        )
+
+    try:
+        run_daemon(entries, destination_roots, workers, run_options, settings, report, stop, warn)
+    except KeyboardInterrupt:
+        pass
+    print("[INFO] Daemon stopped.")
+    return 0
 
 
 def main(argv: list[str]) -> int:
@@ -32,6 +189,8 @@ def main(argv: list[str]) -> int:
 
     # If config doesn't exist, create a default one and exit (friendly first-run behavior)
     if not CONFIG_PATH.exists():
+        from core.config_io import write_default_config
+
         write_default_config(CONFIG_PATH)
         print(f"[INFO] config.json was created at: {CONFIG_PATH}")
         print("[INFO] Edit it with your paths and run FileKnight again.")
@@ -39,63 +198,164 @@ def main(argv: list[str]) -> int:
 
     # Import config (replace current)
     if options.import_path is not None:
+        from core.config_io import import_config
+
         import_config(options.import_path, CONFIG_PATH)
         print(f"[OK] Config imported: {options.import_path} -> {CONFIG_PATH}")
         return 0
 
     # Export config (copy to directory)
     if options.export_dir is not None:
+        from core.config_io import export_config
+
         exported = export_config(CONFIG_PATH, options.export_dir)
         print(f"[OK] Config exported to: {exported}")
         return 0
 
-    cfg = load_config(CONFIG_PATH)
-
-    language_setting = str(cfg.get("language", "auto")).strip()
-    lang = detect_language_code() if language_setting == "auto" else language_setting
-    strings = load_locale(lang)
+    run_metrics = RunMetrics()
+    with timed(run_metrics.phases, "config"):
+        # validated entries + locale, cached next to config.json until it (or the environment) changes
+        compiled = load_compiled(CONFIG_PATH)
+    cfg = compiled.cfg
+    strings = compiled.strings
 
     # config.dry_run can be overridden by CLI flags
     dry_run_cfg = bool(cfg.get("dry_run", False))
     dry_run = dry_run_cfg if options.dry_run_override is None else options.dry_run_override
 
-    destination_raw = str(cfg.get("destination_root", "")).strip()
-    if not destination_raw:
+    roots = destination_roots(cfg)
+    if not roots:
         print("[ERROR] config.destination_root is missing")
         return 1
 
-    destination_root = expand_user_and_vars(destination_raw)
+    if options.list_snapshots is not None:
+        from core.rotate import list_rotations, rotation_time
+        from core.snapshot import list_snapshots
+
+        destination_root = backup_root(roots, options.list_snapshots)
+        for name in list_rotations(destination_root / options.list_snapshots):
+            print(f"{name}  |  {rotation_time(name).isoformat(sep=' ')}")
+        for info in list_snapshots(destination_root, options.list_snapshots):
+            print(f"{info.snapshot_id}  |  {info.created_at}  |  files: {info.files}  |  bytes: {info.total_bytes}")
+        return 0
+
+    if options.restore_entry is not None and options.restore_to is not None:
+        from core.compression import restore_tree
+        from core.pack import pack_dir, read_pack_index, restore_pack
+        from core.rotate import list_rotations
+        from core.snapshot import list_snapshots, restore_snapshot
+
+        destination_root = backup_root(roots, options.restore_entry)
+        folder = pack_dir(destination_root, options.restore_entry)
+        if options.snapshot_id is None and read_pack_index(folder) is not None:
+            files = restore_pack(folder, options.restore_to, options.restore_path)
+            print(f"[OK] Restored {options.restore_entry} -> {options.restore_to} (files: {files})")
+            return 0
+        if options.restore_path is not None:
+            print(f"[ERROR] --restore-path needs a pack-mode entry: no pack found at {folder}")
+            return 1
+        rotations = list_rotations(destination_root / options.restore_entry)
+        if rotations:
+            name = options.snapshot_id or rotations[-1]
+            if name not in rotations:
+                print(f"[ERROR] No snapshot {name} for entry {options.restore_entry}")
+                return 1
+            files, decompressed = restore_tree(destination_root / options.restore_entry / name, options.restore_to)
+            print(
+                f"[OK] Restored {options.restore_entry} snapshot {name} -> {options.restore_to} "
+                f"(files: {files}, decompressed: {decompressed})"
+            )
+            return 0
+        if options.snapshot_id is None and not list_snapshots(destination_root, options.restore_entry):
+            files, decompressed = restore_tree(destination_root / options.restore_entry, options.restore_to)
+            print(
+                f"[OK] Restored {options.restore_entry} -> {options.restore_to} "
+                f"(files: {files}, decompressed: {decompressed})"
+            )
+            return 0
+        info = restore_snapshot(destination_root, options.restore_entry, options.restore_to, options.snapshot_id)
+        print(f"[OK] Restored {options.restore_entry} snapshot {info.snapshot_id} -> {options.restore_to}")
+        return 0
+
     if not dry_run:
-        destination_root.mkdir(parents=True, exist_ok=True)
+        for root in roots:
+            try:
+                root.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"[WARN] Destination not available: {root} ({e})")  # its entries fail, the others run
 
-    entries = validate_entries(cfg)
+    with timed(run_metrics.phases, "config"):
+        entries = compiled.entry_list(options.entry)
+    if options.entry is not None and not entries:
+        print(f"[ERROR] No entry named {options.entry!r} in config.json")
+        return 1
+
+    import platform
+
+    from core.copier import copy_item, run_entries
+    from core.throttle import Throttle
+    from core.verifier import verify_item
 
     stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     header = f"{t(strings, 'app_title').strip()}  |  {platform.system()}  |  {stamp}"
     print(header)
-    print(f"{t(strings, 'select_destination')}: {destination_root}")
+    print(f"{t(strings, 'select_destination')}: {', '.join(str(root) for root in roots)}")
     print(f"dry_run: {dry_run}")
     print("-" * 60)
 
+    throttle = Throttle()
+    apply_limits(throttle, cfg, options)
+    run_options = RunOptions(
+        rescan=options.rescan, verbose=options.verbose, verify=options.verify, resume=options.resume,
+        throttle=throttle, engine=engine_settings(cfg, options.engine), hash_processes=hash_processes(cfg),
+    )
+    action = verify_item if options.verify_only else copy_item
+
+    if options.daemon:
+        if dry_run:
+            print("[ERROR] --daemon needs real copies: set config.dry_run = false or pass --run")
+            return 1
+        return run_daemon_mode(
+            entries, roots, global_workers(cfg), run_options, daemon_settings(cfg),
+            reload=lambda: reload_limits(throttle, options),
+        )
+
+    settings = metrics_settings(cfg)
+    metrics_log = options.metrics_log or settings.log
+    metrics_textfile = options.metrics_textfile or settings.textfile
+    run_metrics.dry_run = dry_run
+
     ok = 0
     fail = 0
+    plans: list[dict] = []
+    plan_limit = None if options.verbose else 20
 
-    for e in entries:
-        try:
-            dst_item = copy_item(e, destination_root, dry_run=dry_run)
-
-            status = "SIMULATED" if dry_run else "COPIED"
-            print(f"[OK] {e.name} ({e.mode}) [{status}]")
-            print(f"     from: {e.source}")
-            print(f"       to: {dst_item}")
+    for e, outcome in run_entries(
+        entries, roots, dry_run=dry_run, workers=global_workers(cfg), options=run_options, action=action
+    ):
+        if print_outcome(e, outcome, dry_run, options.verify_only, options.plan, plan_limit):
             ok += 1
-        except Exception as ex:
-            print(f"[FAIL] {e.name}: {ex}")
+        else:
             fail += 1
+        run_metrics.add(e, outcome, outcome.elapsed if isinstance(outcome, CopyResult) else 0.0)
+        if isinstance(outcome, CopyResult) and outcome.plan is not None:
+            plans.append(outcome.plan.to_dict())
+        elif isinstance(outcome, Exception):
+            plans.append({"entry": e.name, "mode": e.mode, "source": str(e.source), "error": str(outcome)})
 
     print("-" * 60)
     print(f"OK: {ok} | FAIL: {fail}")
 
+    run_metrics.finish()
+    if metrics_log is not None:
+        append_jsonl(metrics_log, run_metrics)
+    if metrics_textfile is not None:
+        write_textfile(metrics_textfile, run_metrics)
+
+    if options.plan_json is not None:
+        write_plan_json(options.plan_json, plans)
+        print(f"[OK] Plan written to: {options.plan_json}")
+
     return 0 if fail == 0 else 2
 
 
@@ -0,0 +1,106 @@
+# ⌘
+#
+#  /fileknight/core/aio.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TypeVar
+
+from core.models import EngineSettings
+
+T = TypeVar("T")
+
+
+class _Lanes:
+    """
+    One executor shared by two in-flight limits: metadata operations (mkdir, unlink, rmtree)
+    and data operations (file copies), so a slow copy never holds up the directory work queued
+    behind it, and vice versa.
+    """
+
+    def __init__(self, settings: EngineSettings) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=settings.meta_in_flight + settings.data_in_flight)
+        self.meta = asyncio.Semaphore(settings.meta_in_flight)
+        self.data = asyncio.Semaphore(settings.data_in_flight)
+
+    async def run(self, lane: asyncio.Semaphore, fn: Callable[..., T], *args: object) -> T:
+        async with lane:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+
+async def _drain(tasks: list[Awaitable[T]]) -> list[T]:
+    """
+    Wait for every task, then re-raise the first failure (like the thread pool path).
+    """
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return outcomes  # type: ignore[return-value]
+
+
+def remove_all(paths: list[Path], remove: Callable[[Path], None], settings: EngineSettings) -> None:
+    """
+    Remove paths with up to settings.meta_in_flight removals at a time.
+    The paths must not nest (a plan's deletes are top-most paths only).
+    """
+    if not paths:
+        return
+
+    async def main() -> None:
+        lanes = _Lanes(settings)
+        try:
+            await _drain([lanes.run(lanes.meta, remove, path) for path in paths])
+        finally:
+            lanes.pool.shutdown(wait=True)
+
+    asyncio.run(main())
+
+
+def mkdirs_and_copy(
+    root: Path,
+    dirs: list[str],
+    rels: list[str],
+    job: Callable[[str], T],
+    settings: EngineSettings,
+) -> list[T]:
+    """
+    Create dirs under root and run job(rel) for every file, pipelined: all directory creations
+    are queued up front (each waits only for its own parent), and a file's copy starts as soon
+    as its directory exists instead of after the whole tree is created. Up to
+    settings.meta_in_flight mkdirs and settings.data_in_flight jobs run at once.
+    Returns job's results in rels order; the first failure is re-raised once everything has finished.
+    """
+    async def main() -> list[T]:
+        lanes = _Lanes(settings)
+        made: dict[str, asyncio.Task[None]] = {}
+
+        async def make(rel: str, parent: asyncio.Task[None] | None) -> None:
+            if parent is not None:
+                await parent
+            await lanes.run(lanes.meta, lambda: (root / rel).mkdir(exist_ok=True))
+
+        async def copy(rel: str) -> T:
+            parent = made.get(rel.rpartition("/")[0])
+            if parent is not None:
+                await parent
+            return await lanes.run(lanes.data, job, rel)
+
+        try:
+            for rel in sorted(dirs):  # parents sort before their children
+                made[rel] = asyncio.create_task(make(rel, made.get(rel.rpartition("/")[0])))
+            copies = [asyncio.create_task(copy(rel)) for rel in rels]
+            outcomes = await _drain(list(made.values()) + copies)
+            return outcomes[len(made):]
+        finally:
+            lanes.pool.shutdown(wait=True)
+
+    return asyncio.run(main())
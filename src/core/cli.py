@@ -18,6 +18,25 @@ class CliOptions:
     dry_run_override: bool | None
     export_dir: Path | None
     import_path: Path | None
+    rescan: bool = False
+    resume: bool = False
+    verbose: bool = False
+    verify: bool = False
+    verify_only: bool = False
+    daemon: bool = False
+    list_snapshots: str | None = None
+    restore_entry: str | None = None
+    snapshot_id: str | None = None
+    restore_to: Path | None = None
+    restore_path: str | None = None
+    plan: bool = False
+    plan_json: Path | None = None
+    metrics_log: Path | None = None
+    metrics_textfile: Path | None = None
+    max_mbps: float | None = None
+    max_files_per_sec: float | None = None
+    engine: str | None = None
+    entry: str | None = None
 
 
 def parse_args(argv: list[str]) -> CliOptions:
@@ -33,6 +52,61 @@ def parse_args(argv: list[str]) -> CliOptions:
         action="store_true",
         help="Force real copy (overrides config.dry_run = false).",
     )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore the stored destination index and re-walk every destination tree.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Finish an interrupted run: copy only what its journal does not list as done, without rescanning.",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="List every copied file with the copy mechanism used (reflink, copy_file_range, ...).",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print what each entry would copy, update and delete, then stop (implies --dry-run).",
+    )
+    parser.add_argument(
+        "--plan-json",
+        metavar="FILE",
+        help="Write the plan of every entry to FILE as JSON (implies --dry-run).",
+    )
+    parser.add_argument(
+        "--metrics-log",
+        metavar="FILE",
+        help="Append per-entry timings and counts to FILE as JSON lines (overrides config.metrics.log).",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        metavar="FILE",
+        help="Write run metrics for the node_exporter textfile collector (overrides config.metrics.textfile).",
+    )
+    parser.add_argument(
+        "--max-mbps",
+        type=float,
+        metavar="N",
+        help="Limit the whole run to N megabits per second; 0 = unlimited (overrides config.max_mbps).",
+    )
+    parser.add_argument(
+        "--max-files-per-sec",
+        type=float,
+        metavar="N",
+        help="Start at most N files per second across the run; 0 = unlimited (overrides config.max_files_per_sec).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("threads", "async"),
+        help=(
+            "How copy/mirror entries do their I/O: threads (default) or async, which keeps many "
+            "mkdirs and copies in flight for high-latency network destinations (overrides config.engine)."
+        ),
+    )
     parser.add_argument(
         "--export-config",
         nargs="?",
@@ -44,13 +118,84 @@ def parse_args(argv: list[str]) -> CliOptions:
         help="Import a .json file and replace current config.json.",
     )
 
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Hash every copied file and re-read the destination to check it (all entries).",
+    )
+    parser.add_argument(
+        "--verify-only",
+        action="store_true",
+        help="Do not copy; check that the existing backup matches the source.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running: watch every source and back up changes as they happen.",
+    )
+    parser.add_argument(
+        "--entry",
+        metavar="NAME",
+        help="Run (or plan, verify, watch) only this entry.",
+    )
+    parser.add_argument(
+        "--list-snapshots",
+        metavar="ENTRY",
+        help="List the snapshots stored for a snapshot- or rotate-mode entry.",
+    )
+    parser.add_argument(
+        "--restore",
+        metavar="ENTRY",
+        help=(
+            "Restore an entry: snapshot mode restores the latest snapshot unless --snapshot is given; "
+            "rotate mode copies back the newest snapshot folder (or the one --snapshot names); "
+            "pack mode reads the files out of its archive segments; "
+            "copy/mirror copies the backup back, decompressing compressed files."
+        ),
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="ID",
+        help="Snapshot id (or rotate-mode snapshot name) to restore, as shown by --list-snapshots.",
+    )
+    parser.add_argument(
+        "--restore-to",
+        metavar="DIR",
+        help="Folder to restore into (required with --restore).",
+    )
+    parser.add_argument(
+        "--restore-path",
+        metavar="REL",
+        help="Pack mode: restore only this file or folder (path relative to the entry's source).",
+    )
+
     args = parser.parse_args(argv)
 
     dry_override: bool | None = None
     if args.dry_run and args.run:
         parser.error("Use only one: --dry-run OR --run")
 
-    if args.dry_run:
+    if args.daemon and (args.dry_run or args.verify_only):
+        parser.error("--daemon cannot be combined with --dry-run or --verify-only")
+
+    if args.resume and (args.daemon or args.verify_only or args.rescan):
+        parser.error("--resume cannot be combined with --daemon, --verify-only or --rescan")
+
+    planning = args.plan or args.plan_json is not None
+    if planning and (args.run or args.daemon or args.verify_only):
+        parser.error("--plan/--plan-json cannot be combined with --run, --daemon or --verify-only")
+
+    for flag, value in (("--max-mbps", args.max_mbps), ("--max-files-per-sec", args.max_files_per_sec)):
+        if value is not None and value < 0:
+            parser.error(f"{flag} cannot be negative")
+
+    if args.restore and not args.restore_to:
+        parser.error("--restore requires --restore-to DIR")
+
+    if args.restore_path and not args.restore:
+        parser.error("--restore-path requires --restore ENTRY")
+
+    if args.dry_run or planning:
         dry_override = True
     elif args.run:
         dry_override = False
@@ -62,4 +207,23 @@ def parse_args(argv: list[str]) -> CliOptions:
         dry_run_override=dry_override,
         export_dir=export_dir,
         import_path=import_path,
+        rescan=args.rescan,
+        resume=args.resume,
+        verbose=args.verbose,
+        verify=args.verify,
+        verify_only=args.verify_only,
+        daemon=args.daemon,
+        list_snapshots=args.list_snapshots,
+        restore_entry=args.restore,
+        snapshot_id=args.snapshot,
+        restore_to=Path(args.restore_to).expanduser() if args.restore_to else None,
+        restore_path=args.restore_path,
+        plan=args.plan,
+        plan_json=Path(args.plan_json).expanduser() if args.plan_json else None,
+        metrics_log=Path(args.metrics_log).expanduser() if args.metrics_log else None,
+        metrics_textfile=Path(args.metrics_textfile).expanduser() if args.metrics_textfile else None,
+        max_mbps=args.max_mbps,
+        max_files_per_sec=args.max_files_per_sec,
+        engine=args.engine,
+        entry=args.entry,
     )
\ No newline at end of file
@@ -0,0 +1,204 @@
+# ⌘
+#
+#  /fileknight/core/compression.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import gzip
+import lzma
+import shutil
+from contextlib import nullcontext
+from pathlib import Path
+from typing import IO, Any
+
+from core.hashing import new_hasher
+from core.journal import JOURNAL_FILE_NAME
+from core.manifest import INDEX_FILE_NAME
+from core.scanner import walk
+from core.throttle import PACED_CHUNK, Pace
+
+try:  # optional: faster and smaller than gzip
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+COMPRESSIONS = ("none", "zstd", "gzip", "lzma")
+
+# Compressed files get a marker suffix on top of their name (notes.txt -> notes.txt.fk.gz), so a
+# restore can tell them from source files that happen to end in .gz. A source file that already
+# ends in a marker is always compressed too, which keeps every marker name unambiguous.
+SUFFIXES = {"zstd": ".fk.zst", "gzip": ".fk.gz", "lzma": ".fk.xz"}
+
+DEFAULT_MIN_SIZE = 4 * 1024  # smaller files barely shrink and cost a whole block anyway
+CHUNK_SIZE = 1024 * 1024
+
+# Formats that are compressed already: another pass only burns CPU.
+DEFAULT_SKIP = frozenset({
+    ".7z", ".aac", ".apk", ".avi", ".avif", ".br", ".bz2", ".cab", ".deb", ".docx", ".epub",
+    ".flac", ".gif", ".gz", ".heic", ".jar", ".jpeg", ".jpg", ".lz", ".lz4", ".lzma", ".m4a",
+    ".m4v", ".mkv", ".mov", ".mp3", ".mp4", ".odp", ".ods", ".odt", ".ogg", ".opus", ".png",
+    ".pptx", ".rar", ".rpm", ".tgz", ".txz", ".webm", ".webp", ".whl", ".woff", ".woff2",
+    ".xlsx", ".xz", ".zip", ".zst",
+})
+
+
+def resolve_codec(compression: str) -> str | None:
+    """
+    Codec actually used for an entry's compression setting: zstd falls back to gzip
+    when the zstandard package is not installed; "none" gives None.
+    """
+    if compression == "zstd" and zstandard is None:
+        return "gzip"
+    return compression if compression in SUFFIXES else None
+
+
+def marker_suffix(name: str) -> str | None:
+    for suffix in SUFFIXES.values():
+        if name.endswith(suffix):
+            return suffix
+    return None
+
+
+def should_compress(rel: str, size: int, min_size: int, skip: frozenset[str]) -> bool:
+    name = rel.rpartition("/")[2]
+    if marker_suffix(name) is not None:
+        return True
+    if size < min_size:
+        return False
+    dot = name.rfind(".")
+    return dot <= 0 or name[dot:].lower() not in skip
+
+
+def dst_names(
+    src_index: dict[str, Any],
+    codec: str,
+    min_size: int,
+    skip: frozenset[str],
+) -> dict[str, str]:
+    """
+    Destination name of every source file that gets compressed (the others keep their name).
+    """
+    suffix = SUFFIXES[codec]
+    return {
+        rel: rel + suffix
+        for rel, rec in src_index.items()
+        if not rec.is_dir and should_compress(rel, rec.size, min_size, skip)
+    }
+
+
+def name_variants(rel: str) -> list[str]:
+    """
+    Every name rel may have been stored under by an earlier run (other codec or threshold).
+    """
+    return [rel] + [rel + suffix for suffix in SUFFIXES.values()]
+
+
+def compressed_writer(codec: str, raw: IO[bytes]) -> IO[bytes]:
+    """
+    Writable stream that compresses into raw; closing it leaves raw open.
+    """
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+    if codec == "lzma":
+        return lzma.LZMAFile(raw, "wb", preset=6)
+    return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0)
+
+
+def open_decompressed(path: Path, codec: str | None = None) -> IO[bytes]:
+    """
+    Readable stream of the original bytes of a compressed file
+    (codec taken from its marker suffix unless given).
+    """
+    suffix = SUFFIXES[codec] if codec is not None else marker_suffix(path.name)
+    if suffix == SUFFIXES["zstd"]:
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed: install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if suffix == SUFFIXES["lzma"]:
+        return lzma.open(path, "rb")
+    if suffix == SUFFIXES["gzip"]:
+        return gzip.open(path, "rb")
+    raise ValueError(f"Not a compressed backup file: {path}")
+
+
+def compress_file(
+    src: Path,
+    dst: Path,
+    codec: str,
+    algorithm: str | None = None,
+    pace: Pace | None = None,
+    source: IO[bytes] | None = None,
+) -> str | None:
+    """
+    Stream src into dst through codec, then copy src's metadata onto dst (like shutil.copy2).
+    The codecs release the GIL while they work, so files on the copy pool's threads compress in parallel.
+    With an algorithm, returns the digest of the source bytes that went in (read once).
+    pace (core.throttle) is charged with the source bytes read.
+    source is src's data already opened elsewhere (core.tee); it is read, not closed.
+    """
+    h = new_hasher(algorithm) if algorithm is not None else None
+    size = CHUNK_SIZE if pace is None else PACED_CHUNK
+    with nullcontext(source) if source is not None else open(src, "rb") as fin, open(dst, "wb") as raw:
+        with compressed_writer(codec, raw) as out:
+            while chunk := fin.read(size):
+                if h is not None:
+                    h.update(chunk)
+                out.write(chunk)
+                if pace is not None:
+                    pace(len(chunk))
+    shutil.copystat(src, dst)
+    return h.hexdigest() if h is not None else None
+
+
+def hash_decompressed(path: Path, algorithm: str, codec: str | None = None) -> str:
+    h = new_hasher(algorithm)
+    with open_decompressed(path, codec) as f:
+        while chunk := f.read(CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def decompress_file(src: Path, dst: Path) -> None:
+    with open_decompressed(src) as fin, open(dst, "wb") as fout:
+        shutil.copyfileobj(fin, fout, CHUNK_SIZE)
+    shutil.copystat(src, dst)
+
+
+def _is_metadata(rel: str) -> bool:
+    name = rel.rpartition("/")[2]
+    if name.startswith(".fk-") and name.endswith(".part"):
+        return True  # unfinished write
+    return "/" not in rel and (name.startswith(INDEX_FILE_NAME) or name == JOURNAL_FILE_NAME)
+
+
+def restore_tree(dst_dir: Path, target: Path) -> tuple[int, int]:
+    """
+    Copy a copy/mirror entry's backup (destination_root/<entry.name>) back under target,
+    decompressing files stored with a marker suffix to their original name.
+    FileKnight's own index, journal and unfinished temp files are left out.
+    Returns (files restored, of which decompressed).
+    """
+    if not dst_dir.is_dir():
+        raise FileNotFoundError(f"No backup found: {dst_dir}")
+
+    files = decompressed = 0
+    for rel, rec in walk(dst_dir, follow_symlinks=False):
+        if _is_metadata(rel):
+            continue
+        out = target / rel
+        if rec.is_dir:
+            out.mkdir(parents=True, exist_ok=True)
+            continue
+        out.parent.mkdir(parents=True, exist_ok=True)
+        suffix = marker_suffix(out.name)
+        if suffix is not None:
+            decompress_file(dst_dir / rel, out.with_name(out.name[: -len(suffix)]))
+            decompressed += 1
+        else:
+            shutil.copy2(dst_dir / rel, out)
+        files += 1
+    return files, decompressed
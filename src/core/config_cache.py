@@ -0,0 +1,193 @@
+# ⌘
+#
+#  /fileknight/core/config_cache.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import stat
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from core.models import Entry
+
+CACHE_VERSION = 2
+
+# Environment that decides what a config compiles to: where ~ points and the OS language
+# (language "auto"); variables the config itself references are added when it is compiled.
+_ENV_KEYS = ("HOME", "USERPROFILE", "HOMEDRIVE", "HOMEPATH", "LANG", "LANGUAGE", "LC_ALL", "LC_MESSAGES", "LC_CTYPE")
+_ENV_REF_RE = re.compile(r"\$\{?(\w+)|%(\w+)%")
+
+_CORE_DIR = Path(__file__).resolve().parent
+# The parsing code and the modules it takes defaults from (config_manager's lazy imports).
+_PARSER_SOURCES = tuple(
+    _CORE_DIR / f"{module}.py"
+    for module in ("config_manager", "models", "i18n", "delta", "compression", "filters", "pack", "rotate")
+)
+
+
+@dataclass
+class CompiledConfig:
+    """
+    config.json as a run needs it: the settings (load_config), the validated entries and the
+    locale strings. Everything is plain JSON data (entries as entry_data dicts), so reading a
+    cache never runs code; an Entry is only built for the entries a run asks for.
+    """
+    cfg: dict[str, Any]
+    language: str
+    strings: dict[str, str]
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    error: str | None = None  # validate_entries failed: raised again when the entries are asked for
+    stamps: dict[str, tuple[int, int] | None] = field(default_factory=dict)  # path -> (mtime_ns, size)
+    env: dict[str, str | None] = field(default_factory=dict)
+
+    def entry_list(self, name: str | None = None) -> list[Entry]:
+        """
+        The validated entries, or only the ones called name. Raises ValueError like validate_entries.
+        """
+        if self.error is not None:
+            raise ValueError(self.error)
+        return [entry_from_data(data) for data in self.entries if name is None or data["name"] == name]
+
+
+def entry_data(entry: Entry) -> dict[str, Any]:
+    """
+    entry as JSON data. Filter patterns stay their source strings; core.filters compiles them
+    when the entry runs.
+    """
+    data = asdict(entry)
+    data["source"] = str(entry.source)
+    data["compress_skip"] = sorted(entry.compress_skip)
+    data["include"] = list(entry.include)
+    data["exclude"] = list(entry.exclude)
+    return data
+
+
+def entry_from_data(data: dict[str, Any]) -> Entry:
+    return Entry(**{
+        **data,
+        "source": Path(data["source"]),
+        "compress_skip": frozenset(data["compress_skip"]),
+        "include": tuple(data["include"]),
+        "exclude": tuple(data["exclude"]),
+    })
+
+
+def cache_path(config_path: Path) -> Path:
+    return config_path.with_name(f".{config_path.name}.cache")
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _environment(cfg_text: str) -> dict[str, str | None]:
+    keys = set(_ENV_KEYS)
+    for m in _ENV_REF_RE.finditer(cfg_text):
+        keys.add(m.group(1) or m.group(2))
+    return {key: os.environ.get(key) for key in sorted(keys)}
+
+
+def _fresh(compiled: CompiledConfig) -> bool:
+    return (
+        all(_stamp(Path(path)) == stamp for path, stamp in compiled.stamps.items())
+        and all(os.environ.get(key) == value for key, value in compiled.env.items())
+    )
+
+
+def _trusted(st: os.stat_result) -> bool:
+    """
+    A cache only counts if this user wrote it and nobody else can change it: the config may sit
+    in a shared folder, and a planted cache would decide what is backed up and where.
+    """
+    if not hasattr(os, "getuid"):  # Windows: no owner/mode bits to go by
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def read_cache(config_path: Path) -> CompiledConfig | None:
+    """
+    The compiled config saved by an earlier run, if config.json, the translations, the parsing
+    code and the environment it depends on are all unchanged since; None otherwise (also when
+    the cache file is not owned by this user or is writable by others).
+    """
+    try:
+        with cache_path(config_path).open("rb") as f:
+            if not _trusted(os.fstat(f.fileno())):
+                return None
+            data = json.load(f)
+        if data.pop("version") != CACHE_VERSION:
+            return None
+        data["stamps"] = {path: tuple(stamp) if stamp else None for path, stamp in data["stamps"].items()}
+        compiled = CompiledConfig(**data)
+    except Exception:  # missing, unreadable, damaged, or written by another version
+        return None
+    return compiled if _fresh(compiled) else None
+
+
+def compile_config(config_path: Path) -> CompiledConfig:
+    """
+    Read, validate and expand config.json and load its locale (what every run did on startup).
+    """
+    import json
+
+    from core.config_manager import validate_entries
+    from core.i18n import detect_language_code, load_locale, locale_path
+
+    stamp = _stamp(config_path)
+    text = config_path.read_text(encoding="utf-8")
+    cfg: dict[str, Any] = json.loads(text)
+    cfg.pop("_meta", None)
+
+    language_setting = str(cfg.get("language", "auto")).strip()
+    language = detect_language_code() if language_setting == "auto" else language_setting
+    compiled = CompiledConfig(cfg=cfg, language=language, strings=load_locale(language))
+    try:
+        compiled.entries = [entry_data(e) for e in validate_entries(cfg)]
+    except ValueError as e:
+        compiled.error = str(e)
+
+    sources = [config_path, locale_path(language), *_PARSER_SOURCES]
+    compiled.stamps = {str(path): _stamp(path) for path in sources}
+    compiled.stamps[str(config_path)] = stamp  # as it was when read
+    compiled.env = _environment(text)
+    return compiled
+
+
+def write_cache(config_path: Path, compiled: CompiledConfig) -> None:
+    """
+    Save compiled for the next runs (readable and writable by this user only); a cache that
+    can't be written is skipped silently.
+    """
+    path = cache_path(config_path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.unlink(missing_ok=True)  # created afresh below, so it is ours with our mode
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, **asdict(compiled)}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def load_compiled(config_path: Path) -> CompiledConfig:
+    """
+    The compiled config from the cache next to config_path, compiled and cached on a miss.
+    """
+    compiled = read_cache(config_path)
+    if compiled is None:
+        compiled = compile_config(config_path)
+        write_cache(config_path, compiled)
+    return compiled
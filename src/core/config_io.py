@@ -24,6 +24,7 @@ DEFAULT_CONFIG: dict[str, Any] = {
     },
     "language": "auto",
     "dry_run": False,
+    "workers": 4,
     "destination_root": "~/Desktop/FileKnight",
     "entries": [
         {
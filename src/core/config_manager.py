@@ -10,10 +10,18 @@ from __future__ import annotations
 
 import json
 import os
+import re
 from pathlib import Path
 from typing import Any
 
-from core.models import Entry
+from core.models import MODES, DaemonSettings, EngineSettings, Entry, MetricsSettings
+
+# The modules that define the entry defaults (compression, delta, pack, ...) pull in most of
+# the copy engine; they are imported where entries are parsed, so reading settings stays cheap
+# when the entries come from core.config_cache.
+
+DEFAULT_WORKERS = 4
+ENGINES = ("threads", "async")
 
 
 def expand_user_and_vars(raw_path: str) -> Path:
@@ -25,6 +33,21 @@ def expand_user_and_vars(raw_path: str) -> Path:
     return Path(expanded)
 
 
+def destination_roots(cfg: dict[str, Any]) -> list[Path]:
+    """
+    config.destination_root as a list: a single path or a list of paths (fan-out to every one).
+    Blank and repeated paths are dropped.
+    """
+    raw = cfg.get("destination_root", "")
+    items = raw if isinstance(raw, list) else [raw]
+    roots: list[Path] = []
+    for item in items:
+        text = str(item or "").strip()
+        if text and (root := expand_user_and_vars(text)) not in roots:
+            roots.append(root)
+    return roots
+
+
 def load_config(path: Path) -> dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
         cfg: dict[str, Any] = json.load(f)
@@ -32,107 +55,277 @@ def load_config(path: Path) -> dict[str, Any]:
     return cfg
 
 
-def validate_entries(cfg: dict[str, Any]) -> list[Entry]:
-    entries_raw = cfg.get("entries", [])
-    if not isinstance(entries_raw, list):
-        raise ValueError("config.entries must be a list")
+def parse_workers(value: Any, default: int) -> int:
+    """
+    Accept any positive int-like value; anything else falls back to default.
+    """
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        return default
+    return workers if workers > 0 else default
 
-    parsed: list[Entry] = []
 
-    for item in entries_raw:
-        if not isinstance(item, dict):
-            continue
+def parse_delta_threshold(value: Any) -> int:
+    """
+    delta_threshold_mb: files at least this many MB are updated block by block.
+    Missing: DEFAULT_DELTA_THRESHOLD (off); invalid or 0: off.
+    """
+    from core.delta import DEFAULT_DELTA_THRESHOLD
 
-        name = str(item.get("name", "")).strip()
-        source_raw = str(item.get("source", "")).strip()
-        mode = str(item.get("mode", "mirror")).strip().lower()
+    if value is None:
+        return DEFAULT_DELTA_THRESHOLD
+    try:
+        mb = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return max(0, int(mb * 1024 * 1024))
 
-        if not name or not source_raw:
-            continue
-        if mode not in ("mirror", "copy"):
-            mode = "mirror"
 
-        parsed.append(Entry(name=name, source=expand_user_and_vars(source_raw), mode=mode))
+def global_workers(cfg: dict[str, Any]) -> int:
+    return parse_workers(cfg.get("workers"), DEFAULT_WORKERS)
 
-    if not parsed:
-        raise ValueError("No valid entries found in config.json")
-    return parsed
 
-def load_config_raw(path: Path) -> dict[str, Any]:
+def _positive_float(value: Any, default: float) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+def parse_compress_min_size(value: Any) -> int:
     """
-    Load config.json keeping _meta (useful for GUI and saving without losing metadata).
+    compress_min_kb -> bytes. Missing or invalid: DEFAULT_MIN_SIZE.
     """
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    from core.compression import DEFAULT_MIN_SIZE
+
+    try:
+        kb = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_MIN_SIZE
+    return max(0, int(kb * 1024))
+
+
+def parse_compress_skip(value: Any) -> frozenset[str]:
+    """
+    Extra extensions to store uncompressed, on top of DEFAULT_SKIP ("jpg" or ".jpg").
+    """
+    from core.compression import DEFAULT_SKIP
+
+    extra: set[str] = set()
+    if isinstance(value, list):
+        for item in value:
+            ext = str(item).strip().lower()
+            if ext:
+                extra.add(ext if ext.startswith(".") else "." + ext)
+    return DEFAULT_SKIP | extra
+
+
+def parse_segment_size(value: Any) -> int:
+    """
+    pack_segment_mb -> bytes. Missing, invalid or <= 0: DEFAULT_SEGMENT_SIZE.
+    """
+    from core.pack import DEFAULT_SEGMENT_SIZE
+
+    mb = _positive_float(value, 0.0)
+    return int(mb * 1024 * 1024) if mb > 0 else DEFAULT_SEGMENT_SIZE
+
+
+def parse_keep(value: Any, default: int) -> int:
+    """
+    keep_daily / keep_weekly: how many snapshots rotate retention keeps; missing or invalid: default.
+    """
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        return default
+    return count if count >= 0 else default
+
+
+def parse_rate(value: Any) -> float:
+    """
+    max_mbps / max_files_per_sec: a positive number; missing, invalid or <= 0 means unlimited (0).
+    """
+    return _positive_float(value, 0.0)
+
+
+def hash_processes(cfg: dict[str, Any]) -> int | None:
+    """
+    config.hash_processes: "auto" (default, None) starts worker processes for big hashing jobs;
+    0 hashes in-process; N caps the worker processes at N.
+    """
+    value = cfg.get("hash_processes", "auto")
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        return None
+    return count if count >= 0 else None
 
 
-def save_config(path: Path, cfg: dict[str, Any]) -> None:
+def run_limits(cfg: dict[str, Any]) -> tuple[float, float]:
     """
-    Save config.json preserving existing _meta when possible.
+    Top-level (max_mbps, max_files_per_sec): shared by every entry of a run,
+    on top of the entries' own limits.
     """
-    meta: dict[str, Any] | None = None
+    return parse_rate(cfg.get("max_mbps")), parse_rate(cfg.get("max_files_per_sec"))
 
-    # Try to preserve meta from existing file
-    if path.exists():
-        try:
-            existing = load_config_raw(path)
-            meta = existing.get("_meta")
-        except Exception:
-            meta = None
 
-    # If caller provided _meta, it wins
-    if "_meta" in cfg and isinstance(cfg["_meta"], dict):
-        meta = cfg["_meta"]
+def daemon_settings(cfg: dict[str, Any]) -> DaemonSettings:
+    """
+    Read the optional "daemon" block: debounce_seconds, reconcile_minutes, poll_seconds.
+    """
+    raw = cfg.get("daemon", {})
+    if not isinstance(raw, dict):
+        raw = {}
+    defaults = DaemonSettings()
+    return DaemonSettings(
+        debounce=_positive_float(raw.get("debounce_seconds"), defaults.debounce),
+        reconcile_interval=_positive_float(raw.get("reconcile_minutes"), defaults.reconcile_interval / 60) * 60,
+        poll_interval=_positive_float(raw.get("poll_seconds"), defaults.poll_interval),
+    )
 
-    to_write = dict(cfg)
-    if meta is not None:
-        to_write["_meta"] = meta
 
-    path.write_text(
-        json.dumps(to_write, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8"
+def engine_settings(cfg: dict[str, Any], name: str | None = None) -> EngineSettings:
+    """
+    Read the optional "engine": "threads" | "async", or a block
+    {"name": "async", "data_in_flight": 16, "meta_in_flight": 64}. name (the CLI flag) wins.
+    """
+    raw = cfg.get("engine", {})
+    if isinstance(raw, str):
+        raw = {"name": raw}
+    elif not isinstance(raw, dict):
+        raw = {}
+    defaults = EngineSettings()
+    chosen = str(name or raw.get("name", defaults.name)).strip().lower()
+    return EngineSettings(
+        name=chosen if chosen in ENGINES else defaults.name,
+        data_in_flight=parse_workers(raw.get("data_in_flight"), defaults.data_in_flight),
+        meta_in_flight=parse_workers(raw.get("meta_in_flight"), defaults.meta_in_flight),
     )
 
 
-def set_destination_root(cfg: dict[str, Any], destination_root: str) -> None:
-    cfg["destination_root"] = destination_root
+def metrics_settings(cfg: dict[str, Any]) -> MetricsSettings:
+    """
+    Read the optional "metrics" block: log (JSON-lines file), textfile (Prometheus .prom file).
+    """
+    raw = cfg.get("metrics", {})
+    if not isinstance(raw, dict):
+        raw = {}
 
+    def path_or_none(value: Any) -> Path | None:
+        text = str(value or "").strip()
+        return expand_user_and_vars(text) if text else None
 
-def set_language(cfg: dict[str, Any], language: str) -> None:
-    cfg["language"] = language
+    return MetricsSettings(log=path_or_none(raw.get("log")), textfile=path_or_none(raw.get("textfile")))
 
 
-def set_dry_run(cfg: dict[str, Any], dry_run: bool) -> None:
-    cfg["dry_run"] = bool(dry_run)
+def parse_entry(item: Any, cfg: dict[str, Any], default_workers: int | None = None) -> Entry | None:
+    """
+    One config.entries item as an Entry (cfg supplies the global defaults); None when the item
+    has no name or source. Raises ValueError on an invalid include/exclude pattern.
+    """
+    from core.compression import COMPRESSIONS
+    from core.filters import compile_filter, parse_patterns
+    from core.rotate import DEFAULT_KEEP_DAILY, DEFAULT_KEEP_WEEKLY
 
+    if not isinstance(item, dict):
+        return None
 
-def add_or_update_entry(cfg: dict[str, Any], name: str, source: str, mode: str) -> None:
-    entries = cfg.get("entries", [])
-    if not isinstance(entries, list):
-        entries = []
-        cfg["entries"] = entries
+    name = str(item.get("name", "")).strip()
+    source_raw = str(item.get("source", "")).strip()
+    mode = str(item.get("mode", "mirror")).strip().lower()
+    compare = str(item.get("compare", "mtime")).strip().lower()
 
-    name = str(name).strip()
-    source = str(source).strip()
-    mode = str(mode).strip().lower()
-    if mode not in ("mirror", "copy"):
+    if not name or not source_raw:
+        return None
+    if mode not in MODES:
         mode = "mirror"
+    if compare not in ("mtime", "hash"):
+        compare = "mtime"
+    compression = str(item.get("compression", cfg.get("compression", "none"))).strip().lower()
+    if compression not in COMPRESSIONS:
+        compression = "none"
+    include = parse_patterns(item.get("include", cfg.get("include")))
+    exclude = parse_patterns(item.get("exclude", cfg.get("exclude")))
+    try:
+        compile_filter(include, exclude)
+    except re.error as e:
+        raise ValueError(f"Entry {name!r}: invalid include/exclude pattern ({e})") from e
+
+    return Entry(
+        name=name,
+        source=expand_user_and_vars(source_raw),
+        mode=mode,
+        compare=compare,
+        workers=parse_workers(item.get("workers"), global_workers(cfg) if default_workers is None else default_workers),
+        verify=bool(item.get("verify", False)),
+        delta_threshold=parse_delta_threshold(item.get("delta_threshold_mb", cfg.get("delta_threshold_mb"))),
+        follow_symlinks=bool(item.get("follow_symlinks", True)),
+        compression=compression,
+        compress_min_size=parse_compress_min_size(item.get("compress_min_kb", cfg.get("compress_min_kb"))),
+        compress_skip=parse_compress_skip(item.get("compress_skip", cfg.get("compress_skip"))),
+        max_mbps=parse_rate(item.get("max_mbps")),
+        max_files_per_sec=parse_rate(item.get("max_files_per_sec")),
+        pack_segment_size=parse_segment_size(item.get("pack_segment_mb", cfg.get("pack_segment_mb"))),
+        include=include,
+        exclude=exclude,
+        keep_daily=parse_keep(item.get("keep_daily", cfg.get("keep_daily")), DEFAULT_KEEP_DAILY),
+        keep_weekly=parse_keep(item.get("keep_weekly", cfg.get("keep_weekly")), DEFAULT_KEEP_WEEKLY),
+    )
 
-    for e in entries:
-        if isinstance(e, dict) and str(e.get("name", "")).strip() == name:
-            e["source"] = source
-            e["mode"] = mode
-            return
 
-    entries.append({"name": name, "source": source, "mode": mode})
+def validate_entries(cfg: dict[str, Any]) -> list[Entry]:
+    entries_raw = cfg.get("entries", [])
+    if not isinstance(entries_raw, list):
+        raise ValueError("config.entries must be a list")
 
+    default_workers = global_workers(cfg)
+    parsed = [e for e in (parse_entry(item, cfg, default_workers) for item in entries_raw) if e is not None]
 
-def remove_entry(cfg: dict[str, Any], name: str) -> bool:
-    entries = cfg.get("entries", [])
-    if not isinstance(entries, list):
-        return False
+    if not parsed:
+        raise ValueError("No valid entries found in config.json")
+    return parsed
 
-    name = str(name).strip()
-    before = len(entries)
-    cfg["entries"] = [e for e in entries if not (isinstance(e, dict) and str(e.get("name", "")).strip() == name)]
-    return len(cfg["entries"]) != before
\ No newline at end of file
+
+def load_config_raw(path: Path) -> dict[str, Any]:
+    """
+    Load config.json keeping _meta (useful for GUI and saving without losing metadata).
+    """
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_config_text(path: Path, text: str) -> None:
+    """
+    Replace path with text atomically: written to a temp file next to it, flushed, then renamed
+    over it, so a crash or a full disk never leaves a half-written config.json behind.
+    """
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def set_destination_root(cfg: dict[str, Any], destination_root: str | list[str]) -> None:
+    """
+    A list with a single path is stored as a plain string, like configs that predate fan-out.
+    """
+    if isinstance(destination_root, list):
+        paths = [p.strip() for p in destination_root if p.strip()]
+        destination_root = paths if len(paths) > 1 else (paths[0] if paths else "")
+    cfg["destination_root"] = destination_root
+
+
+def set_language(cfg: dict[str, Any], language: str) -> None:
+    cfg["language"] = language
+
+
+def set_dry_run(cfg: dict[str, Any], dry_run: bool) -> None:
+    cfg["dry_run"] = bool(dry_run)
@@ -0,0 +1,149 @@
+# ⌘
+#
+#  /fileknight/core/config_model.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from core.config_manager import global_workers, load_config_raw, parse_entry, write_config_text
+from core.models import MODES, Entry
+
+
+class ConfigModel:
+    """
+    config.json held in memory, for the GUI. The entries stay one list in file order (what
+    validate_entries and the saved file see); a name index on top makes looking one up, adding
+    or updating it cost the same with ten entries or ten thousand (removing one is a list scan).
+    Edits only mark the model dirty; save() writes it back (atomically, _meta included, nothing
+    re-read), so callers can batch edits and save once things settle.
+    Entries are validated when asked for (entries()), and each one only once until it changes.
+    """
+
+    def __init__(self, path: Path, cfg: dict[str, Any]) -> None:
+        self.path = path
+        self.dirty = False
+        self._settings: dict[str, Any] = {k: v for k, v in cfg.items() if k != "entries"}
+        raw = cfg.get("entries", [])
+        self._items: list[Any] = list(raw) if isinstance(raw, list) else []  # every item, in file order
+        self._index: dict[str, dict[str, Any]] = {}  # name -> first item with it (lookup only)
+        for item in self._items:
+            name = _item_name(item)
+            if name:
+                self._index.setdefault(name, item)
+        self._validated: dict[int, Entry | None] = {}  # id(item) -> parse_entry(item)
+
+    @classmethod
+    def load(cls, path: Path) -> ConfigModel:
+        return cls(path, load_config_raw(path))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._settings.get(key, default)
+
+    def change(self, setter: Callable[..., None], *args: Any) -> bool:
+        """
+        Apply one of core.config_manager's set_* helpers to the top-level settings.
+        Returns whether anything changed (only then is the model dirty).
+        """
+        before = dict(self._settings)
+        setter(self._settings, *args)
+        if self._settings == before:
+            return False
+        self.dirty = True
+        self._validated.clear()  # global defaults may have changed
+        return True
+
+    def names(self) -> list[str]:
+        """
+        Entry names in file order (a repeated name once).
+        """
+        return list(self._index)
+
+    def entry(self, name: str) -> dict[str, Any] | None:
+        return self._index.get(str(name).strip())
+
+    def upsert_entry(self, name: str, source: str, mode: str) -> bool:
+        """
+        Set the source and mode of the entry called name, appending it when there is none
+        (an unknown mode becomes mirror). Returns True when the entry is new.
+        """
+        name, source, mode = str(name).strip(), str(source).strip(), str(mode).strip().lower()
+        if mode not in MODES:
+            mode = "mirror"
+        item = self._index.get(name)
+        if item is not None and item.get("source") == source and item.get("mode") == mode:
+            return False
+        if item is None:
+            item = self._index[name] = {"name": name, "source": source, "mode": mode}
+            self._items.append(item)
+            self.dirty = True
+            return True
+        item["source"] = source
+        item["mode"] = mode
+        self._validated.pop(id(item), None)
+        self.dirty = True
+        return False
+
+    def remove_entry(self, name: str) -> bool:
+        """
+        Remove every entry called name. Returns whether there was one.
+        """
+        name = str(name).strip()
+        if self._index.pop(name, None) is None:
+            return False
+        kept: list[Any] = []
+        for item in self._items:
+            if _item_name(item) == name:
+                self._validated.pop(id(item), None)
+            else:
+                kept.append(item)
+        self._items = kept
+        self.dirty = True
+        return True
+
+    def to_config(self, meta: bool = True) -> dict[str, Any]:
+        """
+        The config as load_config_raw would read it back (meta=False: as load_config would).
+        """
+        cfg = {k: v for k, v in self._settings.items() if meta or k != "_meta"}
+        cfg["entries"] = list(self._items)
+        return cfg
+
+    def entries(self) -> list[Entry]:
+        """
+        Same as config_manager.validate_entries (same entries, same order), reusing what
+        earlier calls validated.
+        """
+        settings = self._settings
+        workers = global_workers(settings)
+        parsed: list[Entry] = []
+        for item in self._items:
+            key = id(item)
+            if key not in self._validated:
+                self._validated[key] = parse_entry(item, settings, workers)
+            if (entry := self._validated[key]) is not None:
+                parsed.append(entry)
+        if not parsed:
+            raise ValueError("No valid entries found in config.json")
+        return parsed
+
+    def save(self) -> bool:
+        """
+        Write the config if anything changed since it was loaded or last saved. Returns whether it wrote.
+        """
+        if not self.dirty:
+            return False
+        write_config_text(self.path, json.dumps(self.to_config(), indent=2, ensure_ascii=False) + "\n")
+        self.dirty = False
+        return True
+
+
+def _item_name(item: Any) -> str:
+    return str(item.get("name", "")).strip() if isinstance(item, dict) else ""
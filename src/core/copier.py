@@ -8,54 +8,672 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import shutil
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import IO
 
-from core.models import Entry
+from core.compression import compress_file, hash_decompressed
+from core.delta import DELTA, DELTA_SUPPORTED, delta_update
+from core.fastcopy import READWRITE, copy_file, copy_stream, fsync_file
+from core.hashing import FAST_ALGORITHM, copy_and_hash, hash_file
+from core.journal import Journal, remove_journal
+from core.manifest import drop_index, save_index
+from core.metrics import timed
+from core.models import CopyResult, DestinationError, EngineSettings, Entry, FileRecord, RunOptions
+from core.pack import DEFAULT_SEGMENT_SIZE, commit_pack, write_segments
+from core.planner import Plan, TreeDiff, compute_destination_paths, plan_entry, source_index
+from core.progress import ProgressTracker, check_cancel
+from core.rotate import clear_leftovers, commit_rotation, link_files, prune_rotations
+from core.snapshot import take_snapshot
+from core.tee import SharedReads, SourceReads
+from core.throttle import Pace, Throttle, entry_throttle
 
 
-def compute_destination_paths(entry: Entry, destination_root: Path) -> tuple[Path, Path]:
+MEASURE_MIN_BYTES = 32 * 1024 * 1024  # smaller runs are dominated by per-file cost, not throughput
+
+
+def remove_path(path: Path) -> None:
+    try:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        pass  # already gone (manifest state can be older than the disk)
+
+
+def make_tracker(options: RunOptions, entry_name: str, files: int, nbytes: int) -> ProgressTracker | None:
+    if options.progress is None and options.cancel is None:
+        return None
+    return ProgressTracker(entry_name, files, nbytes, options.progress, options.cancel)
+
+
+def partial_path(dst: Path) -> Path:
+    """
+    Temp name a file is written under before it is renamed over dst.
+    Derived from the name (not random), so a retry after a crash overwrites the leftover.
+    """
+    tag = hashlib.blake2b(dst.name.encode("utf-8", "surrogateescape"), digest_size=8).hexdigest()
+    return dst.with_name(f".fk-{tag}.part")
+
+
+def copy_one(
+    src: Path,
+    dst: Path,
+    verify: bool,
+    delta: bool = False,
+    codec: str | None = None,
+    pace: Pace | None = None,
+    source: IO[bytes] | None = None,
+    timings: dict[str, float] | None = None,
+) -> tuple[str, bool]:
+    """
+    Copy a single file. Returns (strategy, verified_ok).
+    The data goes to a temp file next to dst that is fsynced, then renamed over it, so dst is
+    always either the old file or the whole new one, never a truncated mix, even after a power
+    loss. The rename itself is only durable once dst's folder is fsynced (core.journal does
+    that before recording the file as done).
+    With verify, the data is hashed on its way through and the temp file is re-read and
+    compared before the rename (a failed check keeps the old dst); this rules out the
+    kernel zero-copy paths.
+    delta=True patches an existing dst in place (core.delta) instead of rewriting it:
+    the point of delta is not to rewrite the file, so that path is not atomic.
+    With a codec, dst is written compressed (core.compression) and verify decompresses it;
+    the strategy reported is the codec name.
+    pace (core.throttle) is handed down to whichever path moves the data.
+    source is src's data already opened (a fan-out read, core.tee): it is read instead of src,
+    which then only provides the metadata. Not used by delta.
+    timings gets the time spent in fsync (the "fsync" phase).
+    """
+    timings = timings if timings is not None else {}
+    if delta and dst.is_file():
+        delta_update(src, dst, pace)
+        with timed(timings, "fsync"):
+            fsync_file(dst)
+        ok = not verify or hash_file(src, FAST_ALGORITHM) == hash_file(dst, FAST_ALGORITHM)
+        return DELTA, ok
+
+    tmp = partial_path(dst)
+    try:
+        if codec is not None:
+            digest = compress_file(src, tmp, codec, FAST_ALGORITHM if verify else None, pace, source)
+            strategy, ok = codec, not verify or hash_decompressed(tmp, FAST_ALGORITHM, codec) == digest
+        elif verify:
+            digest = copy_and_hash(src, tmp, FAST_ALGORITHM, pace, source)
+            strategy, ok = READWRITE, hash_file(tmp, FAST_ALGORITHM) == digest
+        elif source is not None:
+            strategy, ok = copy_stream(source, src, tmp, pace), True
+        else:
+            strategy, ok = copy_file(src, tmp, pace), True
+        if ok:
+            with timed(timings, "fsync"):
+                fsync_file(tmp)
+            os.replace(tmp, dst)
+        else:
+            tmp.unlink()
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return strategy, ok
+
+
+def copy_files(
+    src_root: Path,
+    dst_root: Path,
+    rels: list[str],
+    workers: int,
+    verify: bool = False,
+    delta_rels: frozenset[str] = frozenset(),
+    tracker: ProgressTracker | None = None,
+    sizes: dict[str, FileRecord] | None = None,
+    journal: Journal | None = None,
+    codec: str | None = None,
+    names: dict[str, str] | None = None,
+    throttle: Throttle | None = None,
+    engine: EngineSettings | None = None,
+    mkdirs: list[str] | None = None,
+    reads: SourceReads | None = None,
+    timings: dict[str, float] | None = None,
+) -> list[tuple[str, bool]]:
+    """
+    Copy rels from src_root to dst_root, using a thread pool when workers > 1.
+    rels in delta_rels are existing destination files to patch in place.
+    With a tracker, cancellation is checked before each file and progress
+    (sizes taken from the source scan) is reported after it.
+    With a journal, every file that was written (and passed verification) is recorded.
+    rels in names are compressed with codec and stored under their mapped name.
+    With a throttle, each file waits for its turn under max_files_per_sec and its data is paced
+    under max_mbps; the pacer is looked up per file, so limits changed mid-run take effect.
+    With the async engine, mkdirs are created here too, pipelined with the copies (core.aio);
+    otherwise the caller creates them first.
+    With reads (core.tee), source files other than delta_rels that are shared with other
+    destinations are read through it; the rest are copied directly (core.fastcopy).
+    timings gets the "fsync" phase.
+    Returns (strategy, verified_ok) for each rel, in order.
+    The first failure is re-raised once the pool has drained.
+    """
+    def job(rel: str) -> tuple[str, bool]:
+        if tracker is not None:
+            tracker.check()
+        pace = None
+        if throttle is not None:
+            if throttle.limits_files:
+                throttle.file()
+            pace = throttle.pacer()
+        source = reads.open(rel) if reads is not None and rel not in delta_rels else None
+        try:
+            if names is not None and rel in names:
+                dst = dst_root / names[rel]
+                outcome = copy_one(src_root / rel, dst, verify, codec=codec, pace=pace, source=source, timings=timings)
+            else:
+                dst = dst_root / rel
+                outcome = copy_one(
+                    src_root / rel, dst, verify, rel in delta_rels, pace=pace, source=source, timings=timings
+                )
+        finally:
+            if source is not None:
+                source.close()
+        if journal is not None and outcome[1]:
+            journal.record(rel, dst)
+        if tracker is not None:
+            tracker.advance(sizes[rel].size if sizes is not None else 0)
+        return outcome
+
+    if engine is not None and engine.is_async:
+        from core.aio import mkdirs_and_copy  # asyncio is only loaded when the async engine is used
+
+        return mkdirs_and_copy(dst_root, mkdirs or [], rels, job, engine)
+    if workers <= 1 or len(rels) <= 1:
+        return [job(rel) for rel in rels]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(job, rel) for rel in rels]
+    return [future.result() for future in futures]
+
+
+def record_copies(
+    result: CopyResult,
+    rels: list[str],
+    outcomes: list[tuple[str, bool]],
+    verify: bool,
+    verbose: bool,
+) -> None:
+    for rel, (strategy, ok) in zip(rels, outcomes):
+        result.count_strategy(rel, strategy, verbose)
+        if verify:
+            result.verified += 1
+            if not ok:
+                result.verify_failed.append(rel)
+
+
+def _manifest_changes(
+    src_index: dict[str, FileRecord],
+    dst_index: dict[str, FileRecord],
+    diff: TreeDiff,
+    full: bool,
+    failed: list[str],
+    names: dict[str, str] | None = None,
+) -> list[tuple[str, FileRecord]]:
+    """
+    Records to write back after a successful run, keyed by destination name.
+    Incremental (manifest was used): only what this run touched.
+    Full (destination was scanned): the whole post-run state, including extras kept in copy mode.
+    A copied file is recorded with its source's size/mtime/digest, which the copy now carries.
+    Files that failed verification are left out so the next run copies them again.
+    """
+    names = names or {}
+    def with_digest(rel: str) -> FileRecord:
+        rec = src_index[rel]
+        digest = diff.digests.get(rel)
+        return rec._replace(digest=digest) if digest else rec
+
+    bad = set(failed)
+    if not full:
+        touched = diff.mkdirs + diff.copies + diff.updates + list(diff.digests)
+        return [(names.get(rel, rel), with_digest(rel)) for rel in touched if rel not in bad]
+
+    expected = {names.get(rel, rel) for rel in src_index}
+    deleted = tuple(diff.deletes)
+    deleted_prefixes = tuple(rel + "/" for rel in deleted)
+    kept = [
+        (rel, rec) for rel, rec in dst_index.items()
+        if rel not in expected and rel not in deleted and not rel.startswith(deleted_prefixes)
+    ]
+    return kept + [(names.get(rel, rel), with_digest(rel)) for rel in src_index if rel not in bad]
+
+
+def result_from_plan(plan: Plan) -> CopyResult:
+    """
+    The counts a run of this plan will report, without running it (dry-run).
+    """
+    result = CopyResult(destination=plan.destination, plan=plan, timings=dict(plan.timings))
+    result.copied = len(plan.diff.copies)
+    result.updated = len(plan.diff.updates)
+    result.skipped = plan.diff.skipped
+    result.deleted = plan.deleted
+    result.bytes_copied = plan.total_bytes
+    return result
+
+
+def _execute_snapshot(
+    plan: Plan, entry: Entry, destination_root: Path, options: RunOptions, reads: SourceReads | None = None
+) -> CopyResult:
+    result = CopyResult(destination=plan.destination, plan=plan, timings=dict(plan.timings))
+    result.destination = take_snapshot(
+        plan.source,
+        plan.src_index,
+        destination_root,
+        plan.entry,
+        result,
+        plan.reused,
+        plan.diff.copies,
+        workers=entry.workers,
+        verify=entry.verify or options.verify,
+        cancel=options.cancel,
+        progress=options.progress,
+        timings=result.timings,
+        throttle=entry_throttle(options.throttle, entry),
+        reads=reads,
+        processes=options.hash_processes,
+    )
+    return result
+
+
+def _execute_pack(plan: Plan, entry: Entry, options: RunOptions, reads: SourceReads | None = None) -> CopyResult:
+    """
+    Write new, changed and repacked files into new segments, then commit the pack index
+    (which also drops the segments nothing points to). A failed or cancelled run leaves
+    the previous index and its segments as they were.
+    """
+    pack = plan.pack
+    verify = entry.verify or options.verify
+    result = CopyResult(destination=plan.destination, plan=plan, timings=dict(plan.timings))
+    timings = result.timings
+    rels = sorted(plan.diff.copies + plan.diff.updates + pack.repack)
+    tracker = make_tracker(options, plan.entry, len(rels), plan.total_bytes + pack.repack_bytes)
+
+    with timed(timings, "copy"):
+        state = write_segments(
+            plan.dst_root, plan.src_root, plan.src_index, rels, pack.next_number, plan.codec,
+            entry.pack_segment_size or DEFAULT_SEGMENT_SIZE, verify, tracker,
+            entry_throttle(options.throttle, entry), reads,
+        )
+    extra: dict[str, int] = {}
+    if state.bytes_written >= MEASURE_MIN_BYTES and timings["copy"] > 0:
+        extra["bytes_per_second"] = round(state.bytes_written / timings["copy"])
+    elif plan.measured:
+        extra["bytes_per_second"] = round(plan.bytes_per_second)
+    with timed(timings, "commit"):
+        commit_pack(plan.dst_root, plan.entry, plan.source, plan.codec, plan.src_index, pack, state, extra)
+
+    for rel in rels:
+        result.count_strategy(rel, plan.codec or "tar", options.verbose)
+    if verify:
+        result.verified += len(rels)
+        result.verify_failed.extend(state.failed)
+    result.copied = len(plan.diff.copies)
+    result.updated = len(plan.diff.updates)
+    result.skipped = plan.diff.skipped
+    result.deleted = len(plan.diff.deletes)
+    result.bytes_copied = plan.total_bytes
+    return result
+
+
+def _execute_rotate(plan: Plan, entry: Entry, options: RunOptions, reads: SourceReads | None = None) -> CopyResult:
+    """
+    Build the new snapshot under a temp name: unchanged files are hard-linked from the previous
+    snapshot (copied when the filesystem can't link), the rest copied from the source. It is
+    renamed into place once complete, and only then does retention prune older snapshots.
+    Delta is never used: patching a file in place would change it in every snapshot linking it.
     """
-    Returns:
-      - dst_dir: destination_root/<entry.name>
-      - dst_item: dst_dir/<source_name>
+    rotate = plan.rotate
+    verify = entry.verify or options.verify
+    result = CopyResult(destination=plan.destination, plan=plan, timings=dict(plan.timings))
+    timings = result.timings
+    diff = plan.diff
+
+    with timed(timings, "copy"):
+        clear_leftovers(rotate.folder)
+        plan.dst_root.mkdir(parents=True, exist_ok=True)
+        for rel in diff.mkdirs:
+            (plan.dst_root / rel).mkdir(parents=True, exist_ok=True)
+        unlinked = link_files(rotate.previous, plan.dst_root, rotate.links, plan.names) if rotate.previous else []
+        to_copy = diff.copies + diff.updates + unlinked
+        tracker = make_tracker(
+            options, plan.entry, len(to_copy), plan.total_bytes + sum(plan.src_index[rel].size for rel in unlinked)
+        )
+        outcomes = copy_files(
+            plan.src_root, plan.dst_root, to_copy, entry.workers, verify, frozenset(), tracker, plan.src_index,
+            None, plan.codec, plan.names, entry_throttle(options.throttle, entry), options.engine, [], reads,
+            timings,
+        )
+        record_copies(result, to_copy, outcomes, verify, options.verbose)
+        for rel in rotate.links:
+            if rel not in unlinked:
+                result.count_strategy(rel, "hardlink", options.verbose)
+    with timed(timings, "commit"):
+        commit_rotation(rotate.folder, rotate.name)
+    with timed(timings, "delete"):
+        prune_rotations(rotate.folder, rotate.prune)
+
+    result.copied = len(diff.copies)
+    result.updated = len(diff.updates)
+    result.skipped = diff.skipped
+    result.deleted = len(rotate.prune)
+    result.bytes_copied = plan.total_bytes
+    return result
+
+
+def _delta_rels(plan: Plan, entry: Entry) -> frozenset[str]:
+    """
+    Updated files big enough to be patched in place (never compressed ones).
+    """
+    if entry.delta_threshold <= 0 or not DELTA_SUPPORTED:
+        return frozenset()
+    return frozenset(
+        rel for rel in plan.diff.updates
+        if plan.src_index[rel].size >= entry.delta_threshold and rel not in (plan.names or {})
+    )
+
+
+def _source_reads(plan: Plan, entry: Entry) -> list[str]:
+    """
+    The source files (relative to plan.src_root) that executing plan reads whole.
     """
-    dst_dir = destination_root / entry.name
-    dst_item = dst_dir / entry.source.name
-    return dst_dir, dst_item
+    if plan.mode == "snapshot":
+        return plan.diff.copies
+    if plan.mode == "rotate":
+        return plan.diff.copies + plan.diff.updates
+    if plan.mode == "pack":
+        return plan.diff.copies + plan.diff.updates + plan.pack.repack
+    delta = _delta_rels(plan, entry)
+    return [rel for rel in plan.diff.copies + plan.diff.updates if rel not in delta]
 
 
-def copy_item(entry: Entry, destination_root: Path, dry_run: bool) -> Path:
+def execute_plan(
+    plan: Plan,
+    entry: Entry,
+    destination_root: Path,
+    options: RunOptions | None = None,
+    reads: SourceReads | None = None,
+) -> CopyResult:
+    """
+    Carry out a plan from core.planner.plan_entry.
+    With a manifest, the index is updated on success and dropped on failure;
+    a run that moved enough data also records its speed there for the next estimate.
+    reads (core.tee) supplies the source files when they are shared with other destinations.
+    """
+    options = options or RunOptions()
+    if plan.mode == "snapshot":
+        return _execute_snapshot(plan, entry, destination_root, options, reads)
+    if plan.mode == "pack":
+        return _execute_pack(plan, entry, options, reads)
+    if plan.mode == "rotate":
+        return _execute_rotate(plan, entry, options, reads)
+
+    verify = entry.verify or options.verify
+    src_root, dst_root, diff, src_index = plan.src_root, plan.dst_root, plan.diff, plan.src_index
+    manifest = plan.manifest
+    result = CopyResult(destination=plan.destination, plan=plan, timings=dict(plan.timings))
+    timings = result.timings
+    to_copy = diff.copies + diff.updates
+
+    if plan.resumed and manifest is not None:
+        drop_index(manifest)  # can't be patched from a journal; the next normal run rebuilds it
+        manifest = None
+    pipelined = options.engine is not None and options.engine.is_async
+    journal: Journal | None = None
+    if plan.journal is not None and to_copy:
+        journal = Journal(plan.journal, None if plan.resumed else plan.journal_header(), timings)
+
+    try:
+        with timed(timings, "delete"):
+            if plan.clear_destination:
+                remove_path(dst_root)
+                result.deleted += 1
+            if pipelined:
+                from core.aio import remove_all
+
+                remove_all([dst_root / rel for rel in diff.deletes], remove_path, options.engine)
+            else:
+                for rel in diff.deletes:
+                    remove_path(dst_root / rel)
+
+        with timed(timings, "copy"):
+            dst_root.mkdir(parents=True, exist_ok=True)
+            if not pipelined:
+                for rel in diff.mkdirs:
+                    (dst_root / rel).mkdir(parents=True, exist_ok=True)
+
+            tracker = make_tracker(options, plan.entry, len(to_copy), plan.total_bytes)
+            outcomes = copy_files(
+                src_root, dst_root, to_copy, entry.workers, verify, _delta_rels(plan, entry), tracker, src_index,
+                journal, plan.codec, plan.names, entry_throttle(options.throttle, entry), options.engine,
+                diff.mkdirs, reads, timings,
+            )
+            record_copies(result, to_copy, outcomes, verify, options.verbose)
+    except BaseException:
+        if journal is not None:
+            journal.close(completed=False)
+        if manifest is not None:
+            drop_index(manifest)
+        raise
+
+    if manifest is not None:
+        extra: dict[str, str] = {}
+        if plan.total_bytes >= MEASURE_MIN_BYTES and timings["copy"] > 0:
+            extra["bytes_per_second"] = str(round(plan.total_bytes / timings["copy"]))
+        with timed(timings, "commit"):
+            changes = _manifest_changes(
+                src_index, plan.dst_index, diff, plan.full_scan, result.verify_failed, plan.names
+            )
+            save_index(
+                manifest, src_root, dst_root, changes, [] if plan.full_scan else diff.deletes,
+                replace=plan.full_scan, extra_meta=extra,
+            )
+
+    if journal is not None:
+        journal.close(completed=True)
+    elif plan.journal is not None:
+        remove_journal(plan.journal)  # nothing left to do, so an older unfinished run is moot
+
+    result.copied += len(diff.copies)
+    result.updated += len(diff.updates)
+    result.bytes_copied += plan.total_bytes
+    result.skipped += diff.skipped
+    result.deleted += len(diff.deletes)
+    return result
+
+
+def copy_item(
+    entry: Entry,
+    destination_root: Path,
+    dry_run: bool,
+    options: RunOptions | None = None,
+) -> CopyResult:
     """
     Copy file/dir into destination_root/<entry.name>/<source_name>.
-    Returns the final destination path used for this entry.
+    Only new or changed files are written; unchanged ones are skipped.
+    In mirror mode, destination paths that are gone from the source are deleted.
+    In snapshot mode, file contents go to the shared object store and the returned
+    destination is the new snapshot manifest (see core.snapshot).
+    In pack mode, files are streamed into tar segments under destination_root/<entry.name>/pack
+    (see core.pack).
+    In rotate mode, each run makes a dated snapshot folder under destination_root/<entry.name>,
+    hard-linking unchanged files from the previous one, and prunes by retention (see core.rotate).
+    Directory entries keep a manifest in destination_root/<entry.name> so the
+    destination tree is not re-walked; options.rescan walks it anyway.
+    The run is planned first (core.planner); dry_run stops there and reports the plan's counts.
+    Returns a CopyResult with the final destination path, the counts and the plan.
+    """
+    plan = plan_entry(entry, destination_root, options)
+    if dry_run:
+        return result_from_plan(plan)
+    return execute_plan(plan, entry, destination_root, options)
+
+
+def copy_item_multi(
+    entry: Entry,
+    destination_roots: list[Path],
+    dry_run: bool,
+    options: RunOptions | None = None,
+) -> list[CopyResult | Exception]:
     """
+    copy_item against several destination roots at once. The source is scanned once, and
+    every file more than one destination needs is read from it once and handed to all of
+    them (core.tee). The destinations run concurrently and independently: one that fails
+    (full disk, unreachable share, ...) gets a DestinationError while the others finish.
+    Returns one outcome per root, in order.
+    """
+    options = options or RunOptions()
     if not entry.source.exists():
         raise FileNotFoundError(f"Source does not exist: {entry.source}")
 
-    dst_dir, dst_item = compute_destination_paths(entry, destination_root)
-
+    timings: dict[str, float] = {}
+    with timed(timings, "scan"):
+        scan = source_index(entry)
+    plans: list[Plan | Exception] = []
+    for root in destination_roots:
+        try:
+            plan = plan_entry(entry, root, options, source_scan=scan)
+            plan.timings["scan"] = plan.timings.get("scan", 0.0) + timings["scan"]
+            plans.append(plan)
+        except Exception as ex:
+            plans.append(DestinationError(root, ex))
     if dry_run:
-        return dst_item
+        return [result_from_plan(plan) if isinstance(plan, Plan) else plan for plan in plans]
 
-    dst_dir.mkdir(parents=True, exist_ok=True)
+    readers: dict[str, set[str]] = {}
+    for i, plan in enumerate(plans):
+        if isinstance(plan, Plan):
+            for rel in _source_reads(plan, entry):
+                readers.setdefault(rel, set()).add(str(i))
+    shared = SharedReads(scan[0], readers)
 
-    if entry.source.is_dir():
-        if entry.mode == "mirror" and dst_item.exists():
-            shutil.rmtree(dst_item)
+    def run(i: int) -> CopyResult | Exception:
+        plan = plans[i]
+        if not isinstance(plan, Plan):
+            return plan
+        reads = shared.view(str(i))
+        try:
+            return execute_plan(plan, entry, destination_roots[i], options, reads)
+        except Exception as ex:
+            return DestinationError(destination_roots[i], ex)
+        finally:
+            reads.leave()
 
-        if not dst_item.exists():
-            shutil.copytree(entry.source, dst_item)
-        else:
-            for src_path in entry.source.rglob("*"):
-                rel = src_path.relative_to(entry.source)
-                target = dst_item / rel
-                if src_path.is_dir():
-                    target.mkdir(parents=True, exist_ok=True)
-                else:
-                    target.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src_path, target)
+    with ThreadPoolExecutor(max_workers=len(destination_roots)) as pool:
+        return list(pool.map(run, range(len(destination_roots))))
+
+
+def sync_paths(entry: Entry, destination_root: Path, paths: set[Path], options: RunOptions | None = None) -> CopyResult:
+    """
+    Sync only the given source paths of a directory entry (used by the daemon after file events).
+    Snapshot, pack, rotate and single-file entries have nothing to narrow down, so they get a normal copy_item.
+    """
+    options = options or RunOptions()
+    if entry.mode in ("snapshot", "pack", "rotate") or not entry.source.is_dir():
+        return copy_item(entry, destination_root, dry_run=False, options=options)
+
+    rels: list[str] = []
+    for path in paths:
+        try:
+            rels.append(path.relative_to(entry.source).as_posix())
+        except ValueError:
+            continue
+    rels = ["" if rel == "." else rel for rel in rels]
+
+    if not rels:
+        _dst_dir, dst_item = compute_destination_paths(entry, destination_root)
+        return CopyResult(destination=dst_item)
+
+    plan = plan_entry(entry, destination_root, options, only=rels)
+    return execute_plan(plan, entry, destination_root, options)
+
+
+EntryAction = Callable[[Entry, Path, bool, RunOptions], CopyResult]
+
+
+def _run_entry(
+    entry: Entry,
+    roots: list[Path],
+    dry_run: bool,
+    options: RunOptions,
+    action: EntryAction,
+) -> list[CopyResult | Exception]:
+    started = time.perf_counter()
+    if len(roots) == 1:
+        outcomes: list[CopyResult | Exception] = [action(entry, roots[0], dry_run, options)]
+    elif action is copy_item:
+        outcomes = copy_item_multi(entry, roots, dry_run, options)
     else:
-        shutil.copy2(entry.source, dst_item)
+        outcomes = []
+        for root in roots:
+            try:
+                outcomes.append(action(entry, root, dry_run, options))
+            except Exception as ex:
+                outcomes.append(DestinationError(root, ex))
+    elapsed = time.perf_counter() - started
+    for root, outcome in zip(roots, outcomes):
+        if isinstance(outcome, CopyResult):
+            outcome.elapsed = elapsed
+            outcome.target = root
+    return outcomes
+
+
+def _run_group(
+    group: list[Entry],
+    roots: list[Path],
+    dry_run: bool,
+    options: RunOptions,
+    action: EntryAction,
+) -> list[list[CopyResult | Exception]]:
+    outcomes: list[list[CopyResult | Exception]] = []
+    for entry in group:
+        try:
+            check_cancel(options.cancel)
+            outcomes.append(_run_entry(entry, roots, dry_run, options, action))
+        except Exception as ex:
+            outcomes.append([ex] if len(roots) == 1 else [DestinationError(root, ex) for root in roots])
+    return outcomes
+
+
+def run_entries(
+    entries: list[Entry],
+    destination_root: Path | list[Path],
+    dry_run: bool,
+    workers: int = 1,
+    options: RunOptions | None = None,
+    action: EntryAction = copy_item,
+) -> Iterator[tuple[Entry, CopyResult | Exception]]:
+    """
+    Run action (copy_item by default) for every entry, up to `workers` entries at a time.
+    Entries sharing a name share destination_root/<name>, so they run one after another.
+    destination_root may be a list: every entry then runs against each root (copy_item through
+    copy_item_multi, reading the source once) and one outcome is yielded per root, in list
+    order; failures are DestinationErrors, so one root failing does not stop the others.
+    Outcomes are yielded in the original entry order, whatever order they finish in.
+    """
+    options = options or RunOptions()
+    roots = [destination_root] if isinstance(destination_root, Path) else list(destination_root)
+    groups: dict[str, list[Entry]] = {}
+    for entry in entries:
+        groups.setdefault(entry.name.casefold(), []).append(entry)
 
-    return dst_item
\ No newline at end of file
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures: dict[str, Future[list[list[CopyResult | Exception]]]] = {
+            key: pool.submit(_run_group, group, roots, dry_run, options, action)
+            for key, group in groups.items()
+        }
+        positions = {key: 0 for key in groups}
+        for entry in entries:
+            key = entry.name.casefold()
+            outcomes = futures[key].result()[positions[key]]
+            positions[key] += 1
+            for outcome in outcomes:
+                yield entry, outcome
@@ -0,0 +1,101 @@
+# ⌘
+#
+#  /fileknight/core/daemon.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from core.copier import run_entries, sync_paths
+from core.filters import watch_filter
+from core.models import CopyResult, DaemonSettings, DestinationError, Entry, RunOptions
+from core.watcher import make_watcher
+
+# (entry, outcome, kind) where kind is "full" (scan everything) or "events" (touched paths only)
+Reporter = Callable[[Entry, CopyResult | Exception, str], None]
+
+
+def _owners(entries: list[Entry], path: Path) -> list[int]:
+    owners: list[int] = []
+    for i, entry in enumerate(entries):
+        if path == entry.source or (entry.source.is_dir() and path.is_relative_to(entry.source)):
+            owners.append(i)
+    return owners
+
+
+def run_daemon(
+    entries: list[Entry],
+    destination_roots: list[Path],
+    workers: int,
+    options: RunOptions,
+    settings: DaemonSettings,
+    report: Reporter,
+    stop: threading.Event,
+    warn: Callable[[str], None] | None = None,
+) -> None:
+    """
+    Keep every destination root in step with every entry's source until stop is set.
+
+    1. The watcher is set up, then one full run of every entry is made; what changes while
+       that runs (hours, on a big tree) is queued by the watcher and synced right after.
+    2. File events (inotify, or polling) are collected per entry; once no new event has
+       arrived for settings.debounce seconds, only the touched paths are synced.
+    3. Every settings.reconcile_interval seconds, or when the watcher lost events,
+       a full run catches anything the events missed.
+    Full runs read each source once for all roots (run_entries); event syncs are small and
+    go to the roots one after another.
+    warn is told why file events fell back to polling, if they did.
+    """
+    def full_run() -> None:
+        for entry, outcome in run_entries(entries, destination_roots, dry_run=False, workers=workers, options=options):
+            report(entry, outcome, "full")
+
+    watcher, fallback = make_watcher(
+        [e.source for e in entries], settings.poll_interval, [watch_filter(e) for e in entries]
+    )
+    if fallback is not None and warn is not None:
+        warn(fallback)
+    pending: dict[int, set[Path]] = {}
+    last_event = 0.0
+
+    try:
+        full_run()
+        next_reconcile = time.monotonic() + settings.reconcile_interval
+        while not stop.is_set():
+            now = time.monotonic()
+            timeout = settings.debounce if pending else 1.0
+            changed = watcher.poll(max(0.0, min(timeout, next_reconcile - now)))
+            now = time.monotonic()
+
+            for path in changed:
+                if any(path == root or path.is_relative_to(root) for root in destination_roots):
+                    continue  # our own writes when the destination sits inside a source
+                for i in _owners(entries, path):
+                    pending.setdefault(i, set()).add(path)
+                    last_event = now
+
+            if watcher.overflowed or now >= next_reconcile:
+                watcher.overflowed = False
+                pending.clear()
+                full_run()
+                next_reconcile = time.monotonic() + settings.reconcile_interval
+                continue
+
+            if pending and now - last_event >= settings.debounce:
+                batch, pending = pending, {}
+                for i, paths in sorted(batch.items()):
+                    entry = entries[i]
+                    for root in destination_roots:
+                        try:
+                            report(entry, sync_paths(entry, root, paths, options), "events")
+                        except Exception as ex:
+                            report(entry, ex if len(destination_roots) == 1 else DestinationError(root, ex), "events")
+    finally:
+        watcher.close()
@@ -0,0 +1,97 @@
+# ⌘
+#
+#  /fileknight/core/delta.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+from pathlib import Path
+
+from core.throttle import Pace
+
+DELTA = "delta"  # strategy name reported in CopyResult
+
+DEFAULT_DELTA_THRESHOLD = 0  # off unless delta_threshold_mb is set: in-place patching is not atomic
+BLOCK_SIZE = 1024 * 1024
+WINDOW_SIZE = 256 * BLOCK_SIZE  # mapped at once, so huge files work on 32-bit too
+
+DELTA_SUPPORTED = hasattr(os, "pwrite")  # not on Windows; there updates are plain copies
+
+
+def _write_range(fd: int, data: memoryview, offset: int) -> None:
+    written = 0
+    while written < len(data):
+        written += os.pwrite(fd, data[written:], offset + written)
+
+
+def _patch_window(src_fd: int, dst_fd: int, offset: int, length: int) -> int:
+    """
+    Compare one mapped window block by block and pwrite the runs that differ.
+    Returns the number of bytes written.
+    """
+    written = 0
+    with mmap.mmap(src_fd, length, access=mmap.ACCESS_READ, offset=offset) as src_map, \
+            mmap.mmap(dst_fd, length, access=mmap.ACCESS_READ, offset=offset) as dst_map:
+        src_view = memoryview(src_map)
+        dst_view = memoryview(dst_map)
+        try:
+            run_start = -1
+            for start in range(0, length, BLOCK_SIZE):
+                end = min(start + BLOCK_SIZE, length)
+                if src_view[start:end] != dst_view[start:end]:
+                    if run_start < 0:
+                        run_start = start
+                    continue
+                if run_start >= 0:
+                    _write_range(dst_fd, src_view[run_start:start], offset + run_start)
+                    written += start - run_start
+                    run_start = -1
+            if run_start >= 0:
+                _write_range(dst_fd, src_view[run_start:length], offset + run_start)
+                written += length - run_start
+        finally:
+            src_view.release()
+            dst_view.release()
+    return written
+
+
+def delta_update(src: Path, dst: Path, pace: Pace | None = None) -> int:
+    """
+    Bring an existing dst in line with src by rewriting only the blocks that differ, in place.
+    Suited to big files edited in place (VM images, databases, mailboxes): data is compared at
+    fixed offsets, so a few changed MB cost a few MB of writes instead of the whole file.
+    pace (core.throttle) is charged with the bytes written, after each window.
+    Returns the number of bytes written.
+    """
+    with open(src, "rb") as fsrc, open(dst, "r+b") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        src_size = os.fstat(src_fd).st_size
+        dst_size = os.fstat(dst_fd).st_size
+        common = min(src_size, dst_size)
+
+        written = 0
+        for offset in range(0, common, WINDOW_SIZE):  # WINDOW_SIZE is a multiple of ALLOCATIONGRANULARITY
+            patched = _patch_window(src_fd, dst_fd, offset, min(WINDOW_SIZE, common - offset))
+            written += patched
+            if pace is not None and patched:
+                pace(patched)
+
+        if src_size > common:
+            fsrc.seek(common)
+            fdst.seek(common)
+            while chunk := fsrc.read(BLOCK_SIZE):
+                fdst.write(chunk)
+                if pace is not None:
+                    pace(len(chunk))
+            written += src_size - common
+        elif dst_size > src_size:
+            fdst.truncate(src_size)
+
+    shutil.copystat(src, dst)
+    return written
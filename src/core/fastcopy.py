@@ -0,0 +1,229 @@
+# ⌘
+#
+#  /fileknight/core/fastcopy.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO
+
+from core.throttle import PACED_CHUNK, Pace
+
+# Strategy names, fastest first.
+REFLINK = "reflink"
+COPY_FILE_RANGE = "copy_file_range"
+SENDFILE = "sendfile"
+READWRITE = "readwrite"
+STREAM = "stream"  # data handed over as an open stream (a fan-out read, core.tee)
+
+READWRITE_BUFFER_SIZE = 1024 * 1024
+_MAX_CHUNK = 1024 * 1024 * 1024  # per-syscall cap for copy_file_range / sendfile
+
+_FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+# Errors meaning "this mechanism can't do it here", as opposed to real I/O failures.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EBADF,
+    errno.EPERM,
+}
+
+# (strategy, src st_dev, dst st_dev) pairs known not to work, so later files skip straight past them.
+_unsupported: set[tuple[str, int, int]] = set()
+_unsupported_lock = threading.Lock()
+_buffers = threading.local()
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _mark_unsupported(strategy: str, devices: tuple[int, int]) -> None:
+    with _unsupported_lock:
+        _unsupported.add((strategy, *devices))
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int, pace: Pace | None = None) -> None:
+    import fcntl  # a clone shares extents: no data moves, so there is nothing to pace
+
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+    except OSError as ex:
+        if ex.errno in _UNSUPPORTED_ERRNOS:
+            raise _Unsupported from ex
+        raise
+
+
+def _kernel_loop(call, src_fd: int, dst_fd: int, size: int, pace: Pace | None = None) -> None:
+    """
+    Drive copy_file_range/sendfile until size bytes are copied.
+    Only a failure before the first byte counts as unsupported; later ones are real errors.
+    A call that moves nothing before the first byte is unsupported too (some filesystems,
+    e.g. procfs or FUSE, report 0 instead of an error); one that stops short later is an error.
+    With pace (bandwidth limit), data moves in PACED_CHUNK steps and each step is accounted for.
+    """
+    chunk = _MAX_CHUNK if pace is None else PACED_CHUNK
+    copied = 0
+    while copied < size:
+        try:
+            sent = call(src_fd, dst_fd, copied, min(size - copied, chunk))
+        except OSError as ex:
+            if copied == 0 and ex.errno in _UNSUPPORTED_ERRNOS:
+                raise _Unsupported from ex
+            raise
+        if sent == 0:
+            if copied == 0:
+                raise _Unsupported
+            break  # source shrank while copying
+        copied += sent
+        if pace is not None:
+            pace(sent)
+    if copied != size:
+        raise OSError(errno.EIO, f"short copy: {copied} of {size} bytes")
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int, pace: Pace | None = None) -> None:
+    _kernel_loop(
+        lambda i, o, off, n: os.copy_file_range(i, o, n, off, off),
+        src_fd, dst_fd, size, pace,
+    )
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int, pace: Pace | None = None) -> None:
+    _kernel_loop(lambda i, o, off, n: os.sendfile(o, i, off, n), src_fd, dst_fd, size, pace)
+
+
+def _readwrite(src_fd: int, dst_fd: int, size: int, pace: Pace | None = None) -> None:
+    buf = getattr(_buffers, "buf", None)
+    if buf is None:
+        buf = _buffers.buf = bytearray(READWRITE_BUFFER_SIZE)
+    view = memoryview(buf) if pace is None else memoryview(buf)[:PACED_CHUNK]
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    os.lseek(dst_fd, 0, os.SEEK_SET)
+    while True:
+        n = os.readv(src_fd, [view])
+        if n == 0:
+            break
+        written = 0
+        while written < n:
+            written += os.write(dst_fd, view[written:n])
+        if pace is not None:
+            pace(n)
+
+
+Transfer = Callable[[int, int, int, "Pace | None"], None]
+
+
+def _strategies() -> list[tuple[str, Transfer]]:
+    chain: list[tuple[str, Transfer]] = []
+    if sys.platform.startswith("linux"):
+        chain.append((REFLINK, _reflink))
+    if hasattr(os, "copy_file_range"):
+        chain.append((COPY_FILE_RANGE, _copy_file_range))
+    if sys.platform.startswith("linux") and hasattr(os, "sendfile"):
+        chain.append((SENDFILE, _sendfile))  # file -> file sendfile is Linux-only
+    return chain
+
+
+STRATEGY_CHAIN = _strategies()
+
+
+def copy_file(src: Path, dst: Path, pace: Pace | None = None) -> str:
+    """
+    Copy data + metadata like shutil.copy2, trying the cheapest mechanism first:
+    reflink clone (btrfs/XFS), copy_file_range, sendfile, then a plain read/write loop.
+    pace (core.throttle) is called with every chunk copied; None keeps the unthrottled fast paths.
+    Returns the name of the strategy that did the copy.
+    """
+    if not hasattr(os, "readv"):  # Windows: let shutil use its native fast path
+        if pace is None:
+            shutil.copy2(src, dst)
+        else:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                while chunk := fsrc.read(PACED_CHUNK):
+                    fdst.write(chunk)
+                    pace(len(chunk))
+            shutil.copystat(src, dst)
+        return READWRITE
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        src_stat = os.fstat(src_fd)
+        devices = (src_stat.st_dev, os.fstat(dst_fd).st_dev)
+        size = src_stat.st_size
+
+        used = READWRITE
+        for name, func in STRATEGY_CHAIN:
+            if size == 0 or (name, *devices) in _unsupported:
+                continue
+            try:
+                func(src_fd, dst_fd, size, pace)
+                used = name
+                break
+            except _Unsupported:
+                _mark_unsupported(name, devices)
+                os.ftruncate(dst_fd, 0)
+        else:
+            _readwrite(src_fd, dst_fd, size, pace)
+
+    shutil.copystat(src, dst)
+    return used
+
+
+def fsync_file(path: Path) -> None:
+    """
+    Flush path's data to disk. Done before a temp file is renamed over the real one, so the
+    rename can never reach the disk ahead of the data.
+    """
+    # read-only is enough on POSIX (and the copy may already carry a read-only source's mode);
+    # Windows only flushes handles open for writing
+    fd = os.open(path, os.O_RDONLY if os.name != "nt" else os.O_RDWR | os.O_BINARY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path: Path) -> None:
+    """
+    Flush a directory's entries (the renames into it) to disk. A no-op where a directory
+    can't be opened (Windows) or synced (some network filesystems).
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    except OSError as ex:
+        if ex.errno not in (errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP):
+            raise
+    finally:
+        os.close(fd)
+
+
+def copy_stream(source: IO[bytes], src: Path, dst: Path, pace: Pace | None = None) -> str:
+    """
+    Write the data read from source (src's contents, already open) to dst, then copy src's
+    metadata onto it. source is read, not closed.
+    """
+    with open(dst, "wb") as fdst:
+        while chunk := source.read(READWRITE_BUFFER_SIZE if pace is None else PACED_CHUNK):
+            fdst.write(chunk)
+            if pace is not None:
+                pace(len(chunk))
+    shutil.copystat(src, dst)
+    return STREAM
@@ -0,0 +1,237 @@
+# ⌘
+#
+#  /fileknight/core/filters.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.models import Entry
+
+IGNORE_FILE_NAME = ".fileknightignore"  # gitignore-style exclude patterns for its folder and everything below
+
+_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+
+
+def _translate(glob: str) -> str:
+    """
+    Regex for one gitignore glob: * and ? stop at "/", [...] is a character class,
+    a leading "**/" matches any folders (or none), a trailing "/**" everything below.
+    """
+    out: list[str] = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            at_start = i == 0 or glob[i - 1] == "/"
+            if glob.startswith("**/", i) and at_start:
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if glob.startswith("**", i) and at_start and i + 2 == n:
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+            while i + 1 < n and glob[i + 1] == "*":
+                i += 1
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = glob.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                chars = glob[i + 1:end].replace("\\", "\\\\")
+                if chars[0] in "!^":
+                    chars = "^" + chars[1:]
+                out.append(f"[{chars}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _parse(line: str) -> tuple[str, bool, bool] | None:
+    """
+    (regex, negated, dir_only) for one pattern line; None for blanks and # comments.
+    """
+    line = line.rstrip("\r\n")
+    if not line.endswith("\\ "):
+        line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated or line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line  # "a/b" and "/a" match from the base folder, "a" at any depth
+    body = _translate(line.lstrip("/"))
+    return (body if anchored else "(?:.*/)?" + body), negated, dir_only
+
+
+def _alternation(items: list[tuple[int, str]]) -> re.Pattern[str] | None:
+    if not items:
+        return None
+    # Latest pattern first: the first alternative that matches is the one gitignore says wins.
+    return re.compile("|".join(f"(?P<p{i}>{regex})" for i, regex in reversed(items)), _FLAGS)
+
+
+class Rules:
+    """
+    A list of gitignore-style patterns compiled into one regex for folders and one for files
+    (dir_only patterns, "name/", only go into the first). One fullmatch per path finds the
+    last pattern that matches, which decides like in gitignore.
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        parsed = [p for p in map(_parse, lines) if p is not None]
+        self.negated = [negated for _regex, negated, _dir_only in parsed]
+        self._dirs = _alternation([(i, regex) for i, (regex, _n, _d) in enumerate(parsed)])
+        self._files = _alternation([(i, regex) for i, (regex, _n, dir_only) in enumerate(parsed) if not dir_only])
+
+    def __bool__(self) -> bool:
+        return bool(self.negated)
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """
+        True when the last matching pattern is a plain one, False when it is a !negation,
+        None when nothing matches.
+        """
+        regex = self._dirs if is_dir else self._files
+        m = regex.fullmatch(rel) if regex is not None else None
+        if m is None:
+            return None
+        return not self.negated[int(m.lastgroup[1:])]
+
+
+@dataclass(frozen=True)
+class Scope:
+    """
+    The filter state inside one folder during a walk.
+    """
+    chain: tuple[tuple[str, Rules], ...]  # (base folder prefix "a/b/", rules), outermost first
+    selected: bool  # inside a folder the include patterns matched (or there are none)
+
+
+class PathFilter:
+    """
+    An entry's include/exclude patterns (gitignore syntax), compiled once.
+    exclude leaves paths out; a .fileknightignore file adds exclude patterns for its folder
+    and below, and deeper ones take precedence, as in git. An excluded folder is pruned: it is
+    not walked, and nothing inside can be brought back. include, when set, keeps only the files
+    it matches (a matched folder selects everything below it); folders holding none are left out.
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = (), ignore_files: bool = True) -> None:
+        self.include = Rules(include)
+        self.exclude = Rules(exclude)
+        self.ignore_files = ignore_files
+
+    def root_scope(self) -> Scope:
+        return Scope((("", self.exclude),) if self.exclude else (), not self.include)
+
+    def enter(self, scope: Scope, folder: Path | str, prefix: str, names: Iterable[str] | None = None) -> Scope:
+        """
+        scope with folder's .fileknightignore added (folder is the one at prefix, "a/b/").
+        names are the folder's entries when they have been listed already (saves a stat).
+        """
+        if not self.ignore_files:
+            return scope
+        if names is not None and IGNORE_FILE_NAME not in names:
+            return scope
+        try:
+            with open(os.path.join(folder, IGNORE_FILE_NAME), encoding="utf-8", errors="replace") as f:
+                rules = Rules(f)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError, PermissionError):
+            return scope
+        return Scope(scope.chain + ((prefix, rules),), scope.selected) if rules else scope
+
+    def excluded(self, scope: Scope, rel: str, is_dir: bool) -> bool:
+        for base, rules in reversed(scope.chain):
+            decision = rules.match(rel[len(base):], is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    def selected(self, scope: Scope, rel: str, is_dir: bool) -> bool:
+        return scope.selected or self.include.match(rel, is_dir) is True
+
+    def descend(self, scope: Scope, rel: str) -> Scope:
+        """
+        The scope for the folder rel (not excluded) below scope.
+        """
+        if scope.selected or not self.selected(scope, rel, True):
+            return scope
+        return Scope(scope.chain, True)
+
+    def locate(self, tree: Path, rel: str, is_dir: bool) -> Scope | None:
+        """
+        Check one path without walking the tree (reads the .fileknightignore files on the way).
+        Returns None when rel is filtered out, otherwise the scope inside it (for a folder;
+        its own ignore file is read when it is listed).
+        """
+        scope = self.root_scope()
+        parts = rel.split("/") if rel else []
+        current = ""
+        for depth, name in enumerate(parts):
+            scope = self.enter(scope, tree / current, current + "/" if current else "")
+            current = f"{current}/{name}" if current else name
+            folder = is_dir or depth < len(parts) - 1
+            if self.excluded(scope, current, folder):
+                return None
+            if folder:
+                scope = self.descend(scope, current)
+            elif not self.selected(scope, current, False):
+                return None
+        return scope
+
+
+def parse_patterns(value: object) -> tuple[str, ...]:
+    """
+    include / exclude from config: a list of patterns or one string with a pattern per line.
+    """
+    if isinstance(value, str):
+        value = value.splitlines()
+    if not isinstance(value, list):
+        return ()
+    return tuple(p for p in (str(item).strip() for item in value) if p and not p.startswith("#"))
+
+
+@lru_cache(maxsize=None)
+def compile_filter(include: tuple[str, ...], exclude: tuple[str, ...]) -> PathFilter:
+    """
+    The PathFilter for these patterns, built once and shared (raises re.error on a bad pattern).
+    """
+    return PathFilter(include, exclude)
+
+
+def entry_filter(entry: Entry) -> PathFilter:
+    return compile_filter(entry.include, entry.exclude)
+
+
+def watch_filter(entry: Entry) -> PathFilter:
+    """
+    The folders of entry worth watching for changes (core.watcher): only exclude patterns and
+    .fileknightignore files prune them; include picks files, and one it matches may yet appear
+    in any folder.
+    """
+    return compile_filter((), entry.exclude)
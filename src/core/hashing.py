@@ -0,0 +1,113 @@
+# ⌘
+#
+#  /fileknight/core/hashing.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import IO, Any
+
+from core.throttle import PACED_CHUNK, Pace
+
+try:  # optional: much faster than blake2b on large files
+    import xxhash
+except ImportError:  # pragma: no cover - depends on the environment
+    xxhash = None
+
+BUFFER_SIZE = 4 * 1024 * 1024
+
+# Content addresses and stored digests always use blake2b so they stay comparable
+# across machines; FAST_ALGORITHM is for digests that are only compared within a run.
+STORED_ALGORITHM = "blake2b"
+FAST_ALGORITHM = "xxh3_128" if xxhash is not None else STORED_ALGORITHM
+
+_buffers = threading.local()
+
+
+def new_hasher(algorithm: str = STORED_ALGORITHM) -> Any:
+    if algorithm == "xxh3_128" and xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b()
+
+
+def thread_buffer() -> memoryview:
+    """
+    One large buffer per thread, reused for every file that thread hashes.
+    """
+    buf = getattr(_buffers, "buf", None)
+    if buf is None:
+        buf = _buffers.buf = memoryview(bytearray(BUFFER_SIZE))
+    return buf
+
+
+def hash_file(path: Path, algorithm: str = STORED_ALGORITHM) -> str:
+    h = new_hasher(algorithm)
+    view = thread_buffer()
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(view):
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def _write_all(fd: int, chunk: bytes | memoryview) -> None:
+    written = 0
+    while written < len(chunk):
+        written += os.write(fd, chunk[written:])
+
+
+def copy_stream_and_hash(
+    src: Path,
+    dst_fd: int,
+    algorithm: str = STORED_ALGORITHM,
+    pace: Pace | None = None,
+    source: IO[bytes] | None = None,
+) -> str:
+    """
+    Copy src into an already open file descriptor, hashing the bytes as they pass (one read).
+    pace (core.throttle) is called after every chunk.
+    source is src's data already opened elsewhere (a fan-out read, core.tee); it is read, not closed.
+    """
+    h = new_hasher(algorithm)
+    view = thread_buffer() if pace is None else thread_buffer()[:PACED_CHUNK]
+    if source is not None:
+        while chunk := source.read(len(view)):
+            h.update(chunk)
+            _write_all(dst_fd, chunk)
+            if pace is not None:
+                pace(len(chunk))
+        return h.hexdigest()
+    with open(src, "rb", buffering=0) as fsrc:
+        while n := fsrc.readinto(view):
+            chunk = view[:n]
+            h.update(chunk)
+            _write_all(dst_fd, chunk)
+            if pace is not None:
+                pace(n)
+    return h.hexdigest()
+
+
+def copy_and_hash(
+    src: Path,
+    dst: Path,
+    algorithm: str = FAST_ALGORITHM,
+    pace: Pace | None = None,
+    source: IO[bytes] | None = None,
+) -> str:
+    """
+    Like shutil.copy2, but returns the digest of the data that was copied.
+    """
+    fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        digest = copy_stream_and_hash(src, fd, algorithm, pace, source)
+    finally:
+        os.close(fd)
+    shutil.copystat(src, dst)
+    return digest
@@ -9,7 +9,6 @@
 from __future__ import annotations
 
 import json
-import locale
 import os
 from pathlib import Path
 from typing import Any
@@ -28,6 +27,8 @@ def detect_language_code() -> str:
     """
     Return 'pt-BR' if OS language starts with Portuguese, otherwise 'en'.
     """
+    import locale
+
     lang = (locale.getlocale()[0] or "")
     if not lang:
         lang = (
@@ -39,20 +40,21 @@ def detect_language_code() -> str:
     return "pt-BR" if lang.startswith("pt") else "en"
 
 
+def locale_path(language_code: str) -> Path:
+    """
+    The translations file load_locale reads for language_code (en.json when there is none).
+    """
+    preferred = translations_dir() / f"{language_code}.json"
+    return preferred if preferred.exists() else translations_dir() / "en.json"
+
+
 def load_locale(language_code: str) -> dict[str, str]:
     """
     Load translations JSON from core/translations.
     Falls back to en.json.
     """
-    def read_json(path: Path) -> dict[str, Any]:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-
-    preferred = translations_dir() / f"{language_code}.json"
-    fallback = translations_dir() / "en.json"
-
-    data: dict[str, Any]
-    data = read_json(preferred) if preferred.exists() else read_json(fallback)
+    with locale_path(language_code).open("r", encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
 
     data.pop("_meta", None)
     return {k: str(v) for k, v in data.items()}
@@ -0,0 +1,165 @@
+# ⌘
+#
+#  /fileknight/core/journal.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from core.fastcopy import fsync_dir
+from core.metrics import timed
+
+JOURNAL_FILE_NAME = ".fileknight_journal.jsonl"
+JOURNAL_VERSION = 1
+SYNC_INTERVAL = 2.0  # seconds between writes (and fsyncs) of the done records
+
+
+def journal_path(dst_dir: Path) -> Path:
+    """
+    The journal of an unfinished run lives next to the index: destination_root/<entry.name>/.fileknight_journal.jsonl
+    """
+    return dst_dir / JOURNAL_FILE_NAME
+
+
+def _dump(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class Journal:
+    """
+    Append-only record of one copy/mirror run.
+    Line 1 is the header: what the run set out to do (see Plan.journal_header).
+    Every following line is a file that was completely written: {"rel", "size", "mtime_ns"}
+    with the destination's stat right after it was renamed into place, so a resume can
+    tell a finished file from one that was lost or changed since (see read_journal).
+    Records are held back and written every SYNC_INTERVAL seconds: first the folders the files
+    were renamed into are fsynced (copy_one already fsynced their data), then the records, so
+    after a power loss the journal never lists a file whose data or name did not survive.
+    The file is removed once the run completes; a run that dies or is cancelled leaves it behind.
+    """
+
+    def __init__(
+        self, path: Path, header: dict[str, Any] | None = None, timings: dict[str, float] | None = None
+    ) -> None:
+        """
+        With a header, start a new journal (replacing any old one); without, append to the existing one.
+        timings gets the time spent in fsync (the "fsync" phase).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._timings = timings if timings is not None else {}
+        self._pending: list[str] = []
+        self._dirs: set[Path] = set()
+        if header is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "w", encoding="utf-8")
+            self._file.write(_dump({"version": JOURNAL_VERSION, **header}))
+            self._file.flush()
+            with timed(self._timings, "fsync"):
+                os.fsync(self._file.fileno())
+        else:
+            self._file = open(path, "a", encoding="utf-8")
+        self._synced = time.monotonic()
+
+    def record(self, rel: str, dst: Path) -> None:
+        """
+        Mark rel as done. Safe to call from the copy worker threads.
+        """
+        st = dst.stat()
+        line = _dump({"rel": rel, "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+        with self._lock:
+            self._pending.append(line)
+            self._dirs.add(dst.parent)
+            if time.monotonic() - self._synced >= SYNC_INTERVAL:
+                self._sync()
+
+    def _sync(self) -> None:
+        """
+        Make the pending files durable, then record them. Call with the lock held.
+        """
+        with timed(self._timings, "fsync"):
+            for folder in self._dirs:
+                fsync_dir(folder)
+            self._dirs.clear()
+            if self._pending:
+                self._file.write("".join(self._pending))
+                self._pending.clear()
+                self._file.flush()
+                os.fsync(self._file.fileno())
+        self._synced = time.monotonic()
+
+    def close(self, completed: bool) -> None:
+        """
+        A completed run still fsyncs the folders it wrote to: the copies must be durable before
+        the index (or the absence of a journal) says they are there.
+        """
+        with self._lock:
+            if completed:
+                with timed(self._timings, "fsync"):
+                    for folder in self._dirs:
+                        fsync_dir(folder)
+                self._dirs.clear()
+                self._pending.clear()
+            else:
+                try:
+                    self._sync()
+                except OSError:
+                    pass  # not recorded: a resume copies those files again
+            self._file.close()
+        if completed:
+            self.path.unlink(missing_ok=True)
+
+
+def new_header(source: Path, target: Path, mode: str) -> dict[str, Any]:
+    return {
+        "source": str(source),
+        "target": str(target),
+        "mode": mode,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def read_journal(
+    path: Path, source: Path, target: Path, mode: str
+) -> tuple[dict[str, Any], dict[str, tuple[int, int]]] | None:
+    """
+    Return (header, done) left by an unfinished run of the same source -> target in the same mode,
+    or None. done maps rel -> (size, mtime_ns) of the destination file as it was written.
+    A torn last line (the run died mid-write) is ignored.
+    """
+    if not path.is_file():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if (
+                header.get("version") != JOURNAL_VERSION
+                or header.get("source") != str(source)
+                or header.get("target") != str(target)
+                or header.get("mode") != mode
+            ):
+                return None
+            done: dict[str, tuple[int, int]] = {}
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    break
+                done[item["rel"]] = (item["size"], item["mtime_ns"])
+    except (OSError, ValueError, KeyError):
+        return None
+    return header, done
+
+
+def remove_journal(path: Path) -> None:
+    path.unlink(missing_ok=True)
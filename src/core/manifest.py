@@ -0,0 +1,165 @@
+# ⌘
+#
+#  /fileknight/core/manifest.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+
+from core.models import FileRecord
+
+INDEX_FILE_NAME = ".fileknight_index.sqlite"
+SCHEMA_VERSION = "2"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT
+);
+"""
+
+
+def index_path(dst_dir: Path) -> Path:
+    """
+    The manifest lives next to the entry's copy: destination_root/<entry.name>/.fileknight_index.sqlite
+    """
+    return dst_dir / INDEX_FILE_NAME
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    # A rollback journal, not WAL: the index sits on the backup drive, often removable or a network
+    # share where WAL's shared-memory file is unsupported, and no -wal/-shm files are left behind.
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+    if "inode" in columns:  # schema 1 kept the source inode; its rows are dropped and rebuilt by a rescan
+        conn.executescript("DROP TABLE files; DELETE FROM meta;")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _expected_meta(src_root: Path, dst_root: Path) -> dict[str, str]:
+    return {"version": SCHEMA_VERSION, "source": str(src_root), "target": str(dst_root)}
+
+
+def _meta_matches(conn: sqlite3.Connection, src_root: Path, dst_root: Path) -> bool:
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    return all(meta.get(k) == v for k, v in _expected_meta(src_root, dst_root).items())
+
+
+def read_throughput(path: Path) -> float | None:
+    """
+    Copy speed (bytes/s) measured by the last run that moved enough data, if any.
+    """
+    if not path.is_file():
+        return None
+    try:
+        conn = sqlite3.connect(path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'bytes_per_second'").fetchone()
+        finally:
+            conn.close()
+        return float(row[0]) if row else None
+    except (sqlite3.DatabaseError, ValueError):
+        return None
+
+
+def load_index(path: Path, src_root: Path, dst_root: Path) -> dict[str, FileRecord] | None:
+    """
+    Return what the last successful run left in dst_root, or None when there is no usable
+    manifest (missing, other source/target, old schema). Each file is recorded with the size,
+    mtime and digest of the source it was copied from (copystat carries the mtime over);
+    inodes are not kept, so the records carry inode 0.
+    """
+    if not path.is_file() or not dst_root.exists():
+        return None
+
+    try:
+        conn = _connect(path)
+        try:
+            if not _meta_matches(conn, src_root, dst_root):
+                return None
+            return {
+                row[0]: FileRecord(bool(row[1]), row[2], row[3], 0, row[4])
+                for row in conn.execute("SELECT path, is_dir, size, mtime_ns, digest FROM files")
+            }
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return None
+
+
+def has_index(path: Path, src_root: Path, dst_root: Path) -> bool:
+    """
+    True when a usable manifest exists, without loading its rows.
+    """
+    if not path.is_file():
+        return False
+    try:
+        conn = _connect(path)
+        try:
+            return _meta_matches(conn, src_root, dst_root)
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return False
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def save_index(
+    path: Path,
+    src_root: Path,
+    dst_root: Path,
+    upserts: Iterable[tuple[str, FileRecord]],
+    deletes: Iterable[str],
+    replace: bool = False,
+    extra_meta: dict[str, str] | None = None,
+) -> None:
+    """
+    Apply one run's changes in a single transaction.
+    deletes are top-most paths; their children are dropped too.
+    replace=True rewrites the whole manifest (used after a full destination scan).
+    extra_meta stores run facts next to the identity keys (e.g. bytes_per_second).
+    """
+    conn = _connect(path)
+    try:
+        with conn:
+            if replace:
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM meta")
+            meta = {**_expected_meta(src_root, dst_root), **(extra_meta or {})}
+            conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+
+            for rel in deletes:
+                conn.execute(
+                    "DELETE FROM files WHERE path = ? OR path LIKE ? ESCAPE '\\'",
+                    (rel, _escape_like(rel) + "/%"),
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO files (path, is_dir, size, mtime_ns, digest) VALUES (?, ?, ?, ?, ?)",
+                ((rel, int(r.is_dir), r.size, r.mtime_ns, r.digest) for rel, r in upserts),
+            )
+    finally:
+        conn.close()
+
+
+def drop_index(path: Path) -> None:
+    """
+    Forget the manifest so the next run rescans the destination (used after a failed run).
+    """
+    for suffix in ("", "-journal", "-wal", "-shm"):  # -wal/-shm: indexes written by older versions
+        Path(str(path) + suffix).unlink(missing_ok=True)
@@ -0,0 +1,257 @@
+# ⌘
+#
+#  /fileknight/core/metrics.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from core.models import CopyResult, DestinationError, Entry
+
+
+_timings_lock = threading.Lock()
+
+
+@contextmanager
+def timed(timings: dict[str, float], phase: str) -> Iterator[None]:
+    """
+    Add the wall time of the with-block to timings[phase] (phases can be entered several times,
+    from several threads).
+    Entry phases: scan, diff, delete, copy, commit (index, manifest, pack index or rotation written), verify,
+    and fsync: the time spent flushing copied files, their folders and the resume journal to disk.
+    fsync happens inside copy, on the copy threads, so with workers > 1 it is summed across them.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _timings_lock:
+            timings[phase] = timings.get(phase, 0.0) + elapsed
+
+
+@dataclass
+class EntryMetrics:
+    entry: str
+    source: str
+    mode: str
+    ok: bool
+    seconds: float  # wall time of the whole entry
+    target: str = ""  # destination root (entries run against several when destination_root is a list)
+    phases: dict[str, float] = field(default_factory=dict)
+    copied: int = 0
+    updated: int = 0
+    skipped: int = 0
+    deleted: int = 0
+    bytes: int = 0
+    verify_failed: int = 0
+    error_type: str | None = None
+    error: str | None = None
+
+    @property
+    def throughput(self) -> float:
+        """
+        Bytes per second over the copy phase (or the whole entry when it has no copy phase).
+        """
+        seconds = self.phases.get("copy") or self.seconds
+        return self.bytes / seconds if seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "type": "entry",
+            "entry": self.entry,
+            "source": self.source,
+            "mode": self.mode,
+            "target": self.target,
+            "status": "ok" if self.ok else "fail",
+            "seconds": round(self.seconds, 6),
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "files": {"copied": self.copied, "updated": self.updated, "skipped": self.skipped, "deleted": self.deleted},
+            "bytes": self.bytes,
+            "bytes_per_second": round(self.throughput),
+            "verify_failed": self.verify_failed,
+            "error_type": self.error_type,
+            "error": self.error,
+        }
+
+
+@dataclass
+class RunMetrics:
+    """
+    Everything measured during one fileknight_run invocation.
+    Run-level phases (e.g. "config") live in phases; per-entry ones in each EntryMetrics.
+    """
+    dry_run: bool = False
+    started_at: float = field(default_factory=time.time)
+    phases: dict[str, float] = field(default_factory=dict)
+    entries: list[EntryMetrics] = field(default_factory=list)
+    seconds: float = 0.0
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def add(self, entry: Entry, outcome: CopyResult | Exception, seconds: float) -> EntryMetrics:
+        if isinstance(outcome, DestinationError):
+            item = EntryMetrics(
+                entry.name, str(entry.source), entry.mode, False, seconds, str(outcome.destination_root),
+                error_type=type(outcome.error).__name__, error=str(outcome.error),
+            )
+        elif isinstance(outcome, Exception):
+            item = EntryMetrics(
+                entry.name, str(entry.source), entry.mode, False, seconds,
+                error_type=type(outcome).__name__, error=str(outcome),
+            )
+        else:
+            item = EntryMetrics(
+                entry.name,
+                str(entry.source),
+                entry.mode,
+                not outcome.verify_failed,
+                seconds,
+                str(outcome.target or ""),
+                phases=dict(outcome.timings),
+                copied=outcome.copied,
+                updated=outcome.updated,
+                skipped=outcome.skipped,
+                deleted=outcome.deleted,
+                bytes=outcome.bytes_copied,
+                verify_failed=len(outcome.verify_failed),
+                error_type="VerifyFailed" if outcome.verify_failed else None,
+            )
+        self.entries.append(item)
+        return item
+
+    def finish(self) -> None:
+        self.seconds = time.perf_counter() - self._start
+
+    @property
+    def errors(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for item in self.entries:
+            if item.error_type is not None:
+                counts[item.error_type] = counts.get(item.error_type, 0) + 1
+        return counts
+
+    def run_record(self) -> dict[str, Any]:
+        ok = sum(1 for item in self.entries if item.ok)
+        nbytes = sum(item.bytes for item in self.entries)
+        return {
+            "type": "run",
+            "started_at": round(self.started_at, 3),
+            "dry_run": self.dry_run,
+            "seconds": round(self.seconds, 6),
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "entries": {"ok": ok, "fail": len(self.entries) - ok},
+            "files": {
+                key: sum(getattr(item, key) for item in self.entries)
+                for key in ("copied", "updated", "skipped", "deleted")
+            },
+            "bytes": nbytes,
+            "bytes_per_second": round(nbytes / self.seconds) if self.seconds > 0 else 0,
+            "errors": self.errors,
+        }
+
+
+def append_jsonl(path: Path, metrics: RunMetrics) -> None:
+    """
+    Append one line per entry, then one "run" line, to a JSON-lines log.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [item.to_dict() for item in metrics.entries] + [metrics.run_record()]
+    stamp = round(metrics.started_at, 3)
+    with open(path, "a", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps({"run": stamp, **line}, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(item: EntryMetrics) -> dict[str, str]:
+    return {"entry": item.entry, "source": item.source, "target": item.target}
+
+
+def prometheus_text(metrics: RunMetrics) -> str:
+    """
+    Render the run in the Prometheus text exposition format (node_exporter textfile collector).
+    Entry series carry the source too, since several entries may share a name,
+    and the destination root, since an entry may be backed up to several.
+    """
+    out: list[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> None:
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            rendered = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            number = repr(float(value)) if isinstance(value, float) else str(value)
+            out.append(f"{name}{{{rendered}}} {number}" if rendered else f"{name} {number}")
+
+    run = metrics.run_record()
+    metric("fileknight_last_run_timestamp_seconds", "gauge", "Start time of the last run.", [({}, round(metrics.started_at))])
+    metric("fileknight_last_run_duration_seconds", "gauge", "Wall time of the last run.", [({}, metrics.seconds)])
+    metric("fileknight_last_run_dry_run", "gauge", "1 when the last run was a simulation.", [({}, int(metrics.dry_run))])
+    metric(
+        "fileknight_last_run_phase_seconds", "gauge", "Run-level phase wall time.",
+        [({"phase": phase}, seconds) for phase, seconds in sorted(metrics.phases.items())],
+    )
+    metric(
+        "fileknight_last_run_entries", "gauge", "Entries by status in the last run.",
+        [({"status": status}, count) for status, count in run["entries"].items()],
+    )
+    metric(
+        "fileknight_last_run_errors", "gauge", "Failed entries in the last run by error type.",
+        [({"type": kind}, count) for kind, count in sorted(metrics.errors.items())],
+    )
+    metric(
+        "fileknight_entry_success", "gauge", "1 when the entry succeeded in the last run.",
+        [({**_labels(item), "mode": item.mode}, int(item.ok)) for item in metrics.entries],
+    )
+    metric(
+        "fileknight_entry_duration_seconds", "gauge", "Wall time of the entry in the last run.",
+        [(_labels(item), item.seconds) for item in metrics.entries],
+    )
+    metric(
+        "fileknight_entry_phase_seconds", "gauge", "Wall time per phase of the entry in the last run.",
+        [
+            ({**_labels(item), "phase": phase}, item.phases[phase])
+            for item in metrics.entries for phase in item.phases
+        ],
+    )
+    metric(
+        "fileknight_entry_files", "gauge", "Files by action for the entry in the last run.",
+        [
+            ({**_labels(item), "action": action}, getattr(item, action))
+            for item in metrics.entries for action in ("copied", "updated", "skipped", "deleted")
+        ],
+    )
+    metric(
+        "fileknight_entry_bytes", "gauge", "Bytes copied for the entry in the last run.",
+        [(_labels(item), item.bytes) for item in metrics.entries],
+    )
+    metric(
+        "fileknight_entry_throughput_bytes_per_second", "gauge", "Copy throughput of the entry in the last run.",
+        [(_labels(item), round(item.throughput)) for item in metrics.entries],
+    )
+    return "\n".join(out) + "\n"
+
+
+def write_textfile(path: Path, metrics: RunMetrics) -> None:
+    """
+    Replace the .prom file atomically so node_exporter never scrapes half a file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(prometheus_text(metrics), encoding="utf-8")
+    os.replace(tmp, path)
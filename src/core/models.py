@@ -8,12 +8,135 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from core.progress import ProgressCallback
+
+if TYPE_CHECKING:
+    from core.planner import Plan
+    from core.throttle import Throttle
+
+
+MODES = ("mirror", "copy", "snapshot", "pack", "rotate")
 
 
 @dataclass
 class Entry:
     name: str
     source: Path
-    mode: str  # "mirror" or "copy"
\ No newline at end of file
+    mode: str  # one of MODES
+    compare: str = "mtime"  # "mtime" (size + mtime) or "hash" (size + content)
+    workers: int = 1  # concurrent file copies inside this entry
+    verify: bool = False  # hash while copying, then re-read the destination and compare
+    delta_threshold: int = 0  # changed files at least this big (bytes) are patched in place; 0 = off
+    follow_symlinks: bool = True  # False skips symlinks in the source instead of copying their targets
+    compression: str = "none"  # copy/mirror: "none", "zstd", "gzip" or "lzma" (core.compression)
+    compress_min_size: int = 0  # bytes; smaller files are stored as they are
+    compress_skip: frozenset[str] = frozenset()  # lowercase extensions stored as they are (".jpg", ...)
+    max_mbps: float = 0.0  # bandwidth limit in megabits per second (core.throttle); 0 = unlimited
+    max_files_per_sec: float = 0.0  # files started per second; 0 = unlimited
+    pack_segment_size: int = 0  # pack mode: bytes per archive segment; 0 = core.pack.DEFAULT_SEGMENT_SIZE
+    include: tuple[str, ...] = ()  # gitignore-style patterns; when set, only matching files are backed up
+    exclude: tuple[str, ...] = ()  # gitignore-style patterns left out (core.filters), plus .fileknightignore files
+    keep_daily: int = 7  # rotate mode: newest snapshot of each of this many days is kept (core.rotate)
+    keep_weekly: int = 4  # rotate mode: ... and of each of this many ISO weeks; both 0 keep every snapshot
+
+
+class FileRecord(NamedTuple):
+    is_dir: bool
+    size: int
+    mtime_ns: int
+    inode: int
+    digest: str | None = None  # only known in compare == "hash"
+    mode: int = 0  # permission bits
+
+
+@dataclass
+class RunOptions:
+    """
+    Per-run knobs that are not part of an entry's config.
+    """
+    rescan: bool = False  # ignore the destination index and re-walk the destination
+    verbose: bool = False  # keep a per-file log in CopyResult.files
+    verify: bool = False  # force Entry.verify on for every entry
+    resume: bool = False  # continue an interrupted run from its journal instead of planning anew
+    progress: ProgressCallback | None = None  # called from worker threads
+    cancel: threading.Event | None = None  # set it to stop at the next file boundary
+    throttle: Throttle | None = None  # run-wide limits; entries get a child of it (core.throttle)
+    engine: EngineSettings | None = None  # copy/mirror execution; None = the thread pool (entry.workers)
+    hash_processes: int | None = None  # compare=hash / verify-only hashing: None = auto, 0 = in-process, N = at most N
+
+
+@dataclass
+class DaemonSettings:
+    debounce: float = 2.0  # seconds without new events before touched paths are synced
+    reconcile_interval: float = 3600.0  # seconds between full runs that catch missed events
+    poll_interval: float = 30.0  # rescan period when inotify is not available
+
+
+@dataclass
+class EngineSettings:
+    """
+    The asyncio engine (core.aio), for destinations where every operation is a network round trip.
+    """
+    name: str = "threads"  # "threads" (entry.workers) or "async"
+    data_in_flight: int = 16  # file copies running at once, per entry
+    meta_in_flight: int = 64  # mkdirs / deletes running at once, per entry
+
+    @property
+    def is_async(self) -> bool:
+        return self.name == "async"
+
+
+@dataclass
+class MetricsSettings:
+    log: Path | None = None  # JSON-lines run log (appended every run)
+    textfile: Path | None = None  # Prometheus textfile-collector output (.prom, replaced every run)
+
+
+@dataclass
+class CopyResult:
+    destination: Path
+    copied: int = 0  # new files
+    updated: int = 0  # files that existed but changed
+    skipped: int = 0  # unchanged files
+    deleted: int = 0  # destination paths removed (mirror extras, type clashes)
+    bytes_copied: int = 0  # source bytes of copied + updated files
+    strategies: dict[str, int] = field(default_factory=dict)  # copy mechanism -> files
+    files: list[tuple[str, str]] = field(default_factory=list)  # (path, strategy), verbose only
+    verified: int = 0  # files re-read and checked after copying (or by --verify-only)
+    verify_failed: list[str] = field(default_factory=list)  # paths whose check failed
+    plan: Plan | None = None  # what the run was planned to do (core.planner)
+    timings: dict[str, float] = field(default_factory=dict)  # phase -> seconds (core.metrics.timed)
+    elapsed: float = 0.0  # wall time of the whole entry, set by run_entries
+    target: Path | None = None  # destination_root the entry ran against, set by run_entries
+
+    def count_strategy(self, rel: str, strategy: str, verbose: bool) -> None:
+        self.strategies[strategy] = self.strategies.get(strategy, 0) + 1
+        if verbose:
+            self.files.append((rel, strategy))
+
+    def summary(self) -> str:
+        text = (
+            f"copied: {self.copied} | updated: {self.updated} | "
+            f"skipped: {self.skipped} | deleted: {self.deleted}"
+        )
+        if self.strategies:
+            text += " | " + ", ".join(f"{k}: {v}" for k, v in sorted(self.strategies.items()))
+        if self.verified:
+            text += f" | verified: {self.verified - len(self.verify_failed)}/{self.verified}"
+        return text
+
+
+class DestinationError(Exception):
+    """
+    An entry failed for one destination root of a multi-destination run; the others are unaffected.
+    """
+
+    def __init__(self, destination_root: Path, error: Exception) -> None:
+        super().__init__(f"{destination_root}: {error}")
+        self.destination_root = destination_root
+        self.error = error
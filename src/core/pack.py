@@ -0,0 +1,441 @@
+# ⌘
+#
+#  /fileknight/core/pack.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tarfile
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from lzma import LZMAError
+from pathlib import Path
+from typing import IO, Any
+
+from core.compression import CHUNK_SIZE, SUFFIXES, compressed_writer, marker_suffix, open_decompressed
+from core.hashing import FAST_ALGORITHM, hash_file, new_hasher
+from core.models import FileRecord
+from core.progress import ProgressTracker
+from core.tee import SourceReads
+from core.throttle import Pace, Throttle
+
+PACK_DIR_NAME = "pack"
+PACK_INDEX_NAME = "index.json"
+PACK_VERSION = 1
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024  # a segment is closed once it holds this much (uncompressed)
+MIN_LIVE_FRACTION = 0.5  # a segment with less of its data still current is rewritten, not reused
+SMALL_SEGMENT_FRACTION = 0.25  # segments under this share of segment_size are merged when there are several
+TAR_BLOCK = 512
+
+_SEGMENT_RE = re.compile(r"^(\d{6,})\.tar(\.fk\.\w+)?$")
+
+
+def pack_dir(destination_root: Path, entry_name: str) -> Path:
+    """
+    destination_root/<entry.name>/pack: the segments (000001.tar, 000002.tar.fk.zst, ...) and index.json.
+    """
+    return destination_root / entry_name / PACK_DIR_NAME
+
+
+def read_pack_index(folder: Path) -> dict[str, Any] | None:
+    """
+    The sidecar index of a pack folder, or None when there is none (or it is unreadable).
+    "files" maps rel -> {"segment", "offset", "size", "mtime_ns", "mode"}, offset being where the
+    file's data starts in the uncompressed tar stream of its segment.
+    """
+    try:
+        with open(folder / PACK_INDEX_NAME, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == PACK_VERSION else None
+
+
+def segment_name(number: int, codec: str | None) -> str:
+    return f"{number:06d}.tar" + (SUFFIXES[codec] if codec is not None else "")
+
+
+def _weight(size: int) -> int:
+    """
+    Bytes a file takes in a tar stream: one header block + its data padded to whole blocks.
+    """
+    return TAR_BLOCK + -(-size // TAR_BLOCK) * TAR_BLOCK
+
+
+@dataclass
+class PackPlan:
+    """
+    Segment-level side of a pack run (the file-level side is the Plan's TreeDiff).
+    Unchanged files keep their place when their segment is kept; those in a segment that has
+    become mostly stale are repacked into the new segments together with new and changed files.
+    """
+    keep: list[str] = field(default_factory=list)  # segments reused as they are
+    drop: list[str] = field(default_factory=list)  # segments unreferenced once the run commits
+    repack: list[str] = field(default_factory=list)  # unchanged files moved out of dropped segments
+    repack_bytes: int = 0
+    kept_files: dict[str, dict[str, Any]] = field(default_factory=dict)  # rel -> index record, untouched
+    next_number: int = 1
+
+
+def plan_pack(
+    src_index: dict[str, FileRecord],
+    folder: Path,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+) -> tuple[list[str], list[str], list[str], int, PackPlan]:
+    """
+    Compare the source scan with the pack index: (copies, updates, deletes, skipped, pack plan).
+    A file is unchanged when size + mtime_ns match its index record and its segment is still there.
+    A segment is kept while at least MIN_LIVE_FRACTION of it is unchanged; small segments (the
+    tail of each incremental run) are merged once there are several, so their number stays low.
+    """
+    index = read_pack_index(folder) or {}
+    previous: dict[str, dict[str, Any]] = index.get("files", {})
+    segments: dict[str, dict[str, Any]] = index.get("segments", {})
+    present = {name for name in segments if (folder / name).is_file()}
+
+    copies: list[str] = []
+    updates: list[str] = []
+    unchanged: dict[str, list[str]] = {}
+    for rel, rec in src_index.items():
+        if rec.is_dir:
+            continue
+        old = previous.get(rel)
+        if old is None:
+            copies.append(rel)
+        elif old["segment"] in present and old["size"] == rec.size and old["mtime_ns"] == rec.mtime_ns:
+            unchanged.setdefault(old["segment"], []).append(rel)
+        else:
+            updates.append(rel)
+    deletes = sorted(rel for rel in previous if rel not in src_index or src_index[rel].is_dir)
+
+    plan = PackPlan()
+    kept: list[str] = []
+    for name in sorted(segments):
+        live = unchanged.get(name, [])
+        live_weight = sum(_weight(previous[rel]["size"]) for rel in live)
+        if live and live_weight >= MIN_LIVE_FRACTION * segments[name].get("weight", live_weight):
+            kept.append(name)
+        else:
+            plan.drop.append(name)
+    small = [name for name in kept if segments[name].get("weight", 0) < SMALL_SEGMENT_FRACTION * segment_size]
+    if len(small) > 1:
+        kept = [name for name in kept if name not in small]
+        plan.drop = sorted(plan.drop + small)
+
+    plan.keep = kept
+    for name in kept:
+        plan.kept_files.update((rel, previous[rel]) for rel in unchanged[name])
+    for name in plan.drop:
+        live = unchanged.get(name, [])
+        plan.repack.extend(live)
+        plan.repack_bytes += sum(previous[rel]["size"] for rel in live)
+
+    numbers = [int(m.group(1)) for m in map(_SEGMENT_RE.match, os.listdir(folder)) if m] if folder.is_dir() else []
+    plan.next_number = max(numbers, default=0) + 1
+    plan.repack.sort()
+    skipped = sum(len(rels) for rels in unchanged.values())
+    return sorted(copies), sorted(updates), deletes, skipped, plan
+
+
+class _SourceReader:
+    """
+    The file object tarfile pulls a member's data from: hashes and paces the bytes as they pass.
+    """
+
+    def __init__(self, f: IO[bytes], hasher: Any, pace: Pace | None) -> None:
+        self._f = f
+        self._hasher = hasher
+        self._pace = pace
+
+    def read(self, n: int = -1) -> bytes:
+        chunk = self._f.read(n)
+        if self._hasher is not None:
+            self._hasher.update(chunk)
+        if self._pace is not None and chunk:
+            self._pace(len(chunk))
+        return chunk
+
+
+@dataclass
+class PackState:
+    """
+    What write_segments produced, to be committed by commit_pack.
+    """
+    segments: dict[str, dict[str, Any]] = field(default_factory=dict)  # new segment -> {"files", "weight"}
+    files: dict[str, dict[str, Any]] = field(default_factory=dict)  # rel -> index record, for written files
+    failed: list[str] = field(default_factory=list)  # rels whose data did not read back correctly
+    bytes_written: int = 0
+
+
+def _open_segment(path: Path, codec: str | None) -> tuple[IO[bytes], IO[bytes], tarfile.TarFile]:
+    raw = open(path, "wb")
+    out = compressed_writer(codec, raw) if codec is not None else raw
+    tar = tarfile.open(fileobj=out, mode="w|", format=tarfile.PAX_FORMAT)
+    tar.copybufsize = CHUNK_SIZE
+    return raw, out, tar
+
+
+def _close_segment(raw: IO[bytes], out: IO[bytes], tar: tarfile.TarFile) -> None:
+    tar.close()
+    if out is not raw:
+        out.close()
+    raw.close()
+
+
+def _read_stream(path: Path) -> IO[bytes]:
+    """
+    The uncompressed tar stream of a segment.
+    """
+    return open_decompressed(path) if marker_suffix(path.name) is not None else open(path, "rb")
+
+
+def _read_range(stream: IO[bytes], size: int) -> Iterator[bytes]:
+    while size > 0:
+        chunk = stream.read(min(CHUNK_SIZE, size))
+        if not chunk:
+            raise EOFError("Pack segment is truncated")
+        size -= len(chunk)
+        yield chunk
+
+
+def _check_segment(path: Path, digests: dict[str, str]) -> list[str]:
+    """
+    Read a finished segment back and return the members whose data does not hash to digests[rel].
+    """
+    bad = set(digests)
+    with _read_stream(path) as stream, tarfile.open(fileobj=stream, mode="r|") as tar:
+        for member in tar:
+            expected = digests.get(member.name)
+            data = tar.extractfile(member) if expected is not None else None
+            if data is None:
+                continue
+            h = new_hasher(FAST_ALGORITHM)
+            while chunk := data.read(CHUNK_SIZE):
+                h.update(chunk)
+            if h.hexdigest() == expected:
+                bad.discard(member.name)
+    return sorted(bad)
+
+
+def write_segments(
+    folder: Path,
+    src_root: Path,
+    src_index: dict[str, FileRecord],
+    rels: list[str],
+    first_number: int,
+    codec: str | None,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    verify: bool = False,
+    tracker: ProgressTracker | None = None,
+    throttle: Throttle | None = None,
+    reads: SourceReads | None = None,
+) -> PackState:
+    """
+    Stream rels (in order, for locality) into new segments numbered from first_number, starting a
+    new segment whenever the current one reaches segment_size. Each segment is written under a
+    temp name and renamed when closed, so a segment file is always complete; nothing points to
+    the new segments until commit_pack writes the index.
+    Segments are plain tar (optionally compressed whole): extracting them in number order with
+    any tar tool also gives the files back.
+    With verify, every segment is read back and checked against the digests taken while writing.
+    reads (core.tee) opens the source files when they are read once for several destinations.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    state = PackState()
+    number = first_number
+    current: tuple[IO[bytes], IO[bytes], tarfile.TarFile] | None = None
+    name = ""
+    digests: dict[str, str] = {}
+
+    def finish() -> None:
+        nonlocal current
+        if current is None:
+            return
+        _close_segment(*current)
+        current = None
+        final = folder / name
+        os.replace(folder / f".{name}.part", final)
+        if verify:
+            state.failed.extend(_check_segment(final, digests))
+
+    try:
+        for rel in rels:
+            if tracker is not None:
+                tracker.check()
+            if current is None:
+                name = segment_name(number, codec)
+                number += 1
+                current = _open_segment(folder / f".{name}.part", codec)
+                state.segments[name] = {"files": 0, "weight": 0}
+                digests = {}
+            tar = current[2]
+
+            rec = src_index[rel]
+            info = tarfile.TarInfo(rel)
+            info.size = rec.size
+            info.mtime = rec.mtime_ns / 1_000_000_000
+            info.mode = rec.mode or 0o644
+            hasher = new_hasher(FAST_ALGORITHM) if verify else None
+            pace = None
+            if throttle is not None:
+                if throttle.limits_files:
+                    throttle.file()
+                pace = throttle.pacer()
+            shared = reads.open(rel) if reads is not None else None
+            with shared if shared is not None else open(src_root / rel, "rb") as f:
+                tar.addfile(info, _SourceReader(f, hasher, pace))
+            if hasher is not None:
+                digests[rel] = hasher.hexdigest()
+
+            offset = tar.offset - (_weight(rec.size) - TAR_BLOCK)  # start of the data just written
+            state.files[rel] = {
+                "segment": name, "offset": offset, "size": rec.size, "mtime_ns": rec.mtime_ns, "mode": rec.mode,
+            }
+            state.segments[name]["files"] += 1
+            state.segments[name]["weight"] += _weight(rec.size)
+            state.bytes_written += rec.size
+            if tracker is not None:
+                tracker.advance(rec.size)
+            if tar.offset >= segment_size:
+                finish()
+        finish()
+    except BaseException:
+        if current is not None:
+            _close_segment(*current)
+            (folder / f".{name}.part").unlink(missing_ok=True)
+        raise
+    return state
+
+
+def commit_pack(
+    folder: Path,
+    entry_name: str,
+    source: Path,
+    codec: str | None,
+    src_index: dict[str, FileRecord],
+    plan: PackPlan,
+    state: PackState,
+    extra: dict[str, Any] | None = None,
+) -> None:
+    """
+    Atomically replace index.json with the post-run state (kept + newly written files), then remove
+    the segments nothing points to any more (dropped ones and leftovers of interrupted runs).
+    Files that failed verification are left out, so the next run writes them again.
+    """
+    previous = read_pack_index(folder) or {}
+    old_segments: dict[str, dict[str, Any]] = previous.get("segments", {})
+    failed = set(state.failed)
+    files = dict(plan.kept_files)
+    files.update((rel, rec) for rel, rec in state.files.items() if rel not in failed)
+    segments = {name: old_segments[name] for name in plan.keep}
+    segments.update(state.segments)
+
+    index = {
+        "version": PACK_VERSION,
+        "entry": entry_name,
+        "source": str(source),
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "codec": codec,
+        **(extra or {}),
+        "dirs": sorted(rel for rel, rec in src_index.items() if rec.is_dir),
+        "segments": segments,
+        "files": dict(sorted(files.items())),
+    }
+    tmp = folder / f".{PACK_INDEX_NAME}.tmp"
+    tmp.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, folder / PACK_INDEX_NAME)
+
+    for item in os.listdir(folder):
+        if _SEGMENT_RE.match(item) and item not in segments:
+            (folder / item).unlink(missing_ok=True)
+        elif item.startswith(".") and item.endswith(".part"):
+            (folder / item).unlink(missing_ok=True)
+
+
+def _selected(files: dict[str, dict[str, Any]], only: str | None) -> dict[str, dict[str, Any]]:
+    if not only:
+        return files
+    only = only.strip("/")
+    return {rel: meta for rel, meta in files.items() if rel == only or rel.startswith(only + "/")}
+
+
+def restore_pack(folder: Path, target: Path, only: str | None = None) -> int:
+    """
+    Rebuild a packed entry under target; only restores one file or folder (relative path) of it.
+    The index gives every file's segment and data offset, so a single file is read straight from
+    its place: a seek in a plain segment, a forward read of one stream in a compressed one.
+    Returns the number of files restored.
+    """
+    index = read_pack_index(folder)
+    if index is None:
+        raise FileNotFoundError(f"No pack index found: {folder}")
+    files = _selected(index.get("files", {}), only)
+    if only and not files and only.strip("/") not in index.get("dirs", []):
+        raise FileNotFoundError(f"Not in the pack: {only}")
+
+    for rel in _selected({d: {} for d in index.get("dirs", [])}, only):
+        (target / rel).mkdir(parents=True, exist_ok=True)
+
+    by_segment: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+    for rel, meta in files.items():
+        by_segment.setdefault(meta["segment"], []).append((rel, meta))
+
+    for name, items in sorted(by_segment.items()):
+        items.sort(key=lambda item: item[1]["offset"])
+        with _read_stream(folder / name) as stream:
+            for rel, meta in items:
+                stream.seek(meta["offset"])
+                out = target / rel
+                out.parent.mkdir(parents=True, exist_ok=True)
+                with open(out, "wb") as f:
+                    for chunk in _read_range(stream, meta["size"]):
+                        f.write(chunk)
+                os.chmod(out, meta.get("mode") or 0o644)
+                os.utime(out, ns=(meta["mtime_ns"], meta["mtime_ns"]))
+    return len(files)
+
+
+def verify_pack(folder: Path, src_root: Path, src_files: list[str]) -> list[str]:
+    """
+    Check every source file against its packed copy (--verify-only); returns the rels that differ
+    or are missing from the pack. Each segment is read once, front to back.
+    """
+    index = read_pack_index(folder)
+    if index is None:
+        raise FileNotFoundError(f"No pack index found: {folder}")
+    files: dict[str, dict[str, Any]] = index.get("files", {})
+    failed = [rel for rel in src_files if rel not in files]
+    wanted = {rel: files[rel] for rel in src_files if rel in files}
+
+    by_segment: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+    for rel, meta in wanted.items():
+        by_segment.setdefault(meta["segment"], []).append((rel, meta))
+
+    for name, items in sorted(by_segment.items()):
+        items.sort(key=lambda item: item[1]["offset"])
+        packed: dict[str, str] = {}
+        try:
+            with _read_stream(folder / name) as stream:
+                for rel, meta in items:
+                    stream.seek(meta["offset"])
+                    h = new_hasher(FAST_ALGORITHM)
+                    for chunk in _read_range(stream, meta["size"]):
+                        h.update(chunk)
+                    packed[rel] = h.hexdigest()
+        except (OSError, EOFError, ValueError, LZMAError):
+            pass  # missing or damaged segment: the files not read from it fail below
+        for rel, _meta in items:
+            try:
+                ok = rel in packed and packed[rel] == hash_file(src_root / rel, FAST_ALGORITHM)
+            except FileNotFoundError:
+                ok = False
+            if not ok:
+                failed.append(rel)
+    return sorted(failed)
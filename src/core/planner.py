@@ -0,0 +1,668 @@
+# ⌘
+#
+#  /fileknight/core/planner.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from core.compression import dst_names, marker_suffix, name_variants, resolve_codec
+from core.filters import entry_filter
+from core.hashing import hash_file
+from core.journal import journal_path, new_header, read_journal
+from core.manifest import has_index, index_path, load_index, read_throughput
+from core.metrics import timed
+from core.models import Entry, FileRecord, RunOptions
+from core.scanner import record_from_stat, scan_paths, scan_tree
+from core.pack import DEFAULT_SEGMENT_SIZE, PackPlan, pack_dir, plan_pack, read_pack_index
+from core.procpool import hash_many
+from core.rotate import RotatePlan, list_rotations, new_rotation_name, partial_dir, retain
+from core.snapshot import plan_snapshot, snapshots_dir
+
+
+DEFAULT_BYTES_PER_SECOND = 100 * 1024 * 1024  # until a real run has measured this destination
+SECONDS_PER_FILE = 0.002  # open/create/close/metadata cost per copied or deleted path
+
+
+def compute_destination_paths(entry: Entry, destination_root: Path) -> tuple[Path, Path]:
+    """
+    Returns:
+      - dst_dir: destination_root/<entry.name>
+      - dst_item: dst_dir/<source_name>
+    """
+    dst_dir = destination_root / entry.name
+    dst_item = dst_dir / entry.source.name
+    return dst_dir, dst_item
+
+
+def is_unchanged(src: Path, src_rec: FileRecord, dst: Path, dst_rec: FileRecord, compare: str) -> str | bool:
+    """
+    size + mtime (whole seconds, like rsync) decides by default.
+    With compare == "hash", equal sizes are confirmed by content instead of mtime:
+    the source digest is returned (truthy) when it matches, so callers can record it.
+    A digest already stored for dst saves re-reading the destination file.
+    """
+    if src_rec.size != dst_rec.size:
+        return False
+    if compare == "hash":
+        src_digest = hash_file(src)
+        dst_digest = dst_rec.digest or hash_file(dst)
+        return src_digest if src_digest == dst_digest else False
+    return src_rec.mtime_ns // 1_000_000_000 == dst_rec.mtime_ns // 1_000_000_000
+
+
+def _compare_by_hash(
+    diff: TreeDiff,
+    src_root: Path,
+    src_index: dict[str, FileRecord],
+    dst_root: Path,
+    to_hash: list[tuple[str, FileRecord]],
+    processes: int | None,
+) -> None:
+    """
+    is_unchanged(compare="hash") for a batch: every source file, and every destination file
+    without a stored digest, hashed in one hash_many call. Updates keep the source order.
+    """
+    paths = [src_root / rel for rel, _dst_rec in to_hash]
+    sizes = [src_index[rel].size for rel, _dst_rec in to_hash]
+    unknown = [(rel, dst_rec) for rel, dst_rec in to_hash if not dst_rec.digest]
+    paths += [dst_root / rel for rel, _dst_rec in unknown]
+    sizes += [dst_rec.size for _rel, dst_rec in unknown]
+    digests = hash_many(paths, sizes, processes=processes)
+    dst_digests = dict(zip((rel for rel, _dst_rec in unknown), digests[len(to_hash):]))
+
+    changed: set[str] = set()
+    for (rel, dst_rec), src_digest in zip(to_hash, digests):
+        dst_digest = dst_rec.digest or dst_digests[rel]
+        if src_digest is not None and src_digest == dst_digest:
+            diff.skipped += 1
+            if src_digest != dst_rec.digest:
+                diff.digests[rel] = src_digest
+        else:
+            changed.add(rel)
+    if changed:
+        changed.update(diff.updates)
+        diff.updates = [rel for rel in src_index if rel in changed]
+
+
+@dataclass
+class TreeDiff:
+    mkdirs: list[str] = field(default_factory=list)
+    copies: list[str] = field(default_factory=list)
+    updates: list[str] = field(default_factory=list)
+    deletes: list[str] = field(default_factory=list)  # top-most paths only
+    skipped: int = 0
+    digests: dict[str, str] = field(default_factory=dict)  # source digests learned while comparing
+
+
+def diff_trees(
+    src_root: Path,
+    src_index: dict[str, FileRecord],
+    dst_root: Path,
+    dst_index: dict[str, FileRecord],
+    compare: str,
+    mirror: bool,
+    names: dict[str, str] | None = None,
+    keep: Callable[[str], bool] | None = None,
+    processes: int | None = None,
+) -> TreeDiff:
+    """
+    Compare the source scan against the destination state (scan or manifest).
+    deletes only holds top-most paths: removing a dir takes its children with it.
+    Type clashes (file <-> dir) are always deleted, even in copy mode.
+
+    names (source rel -> destination rel) lists the files stored compressed (core.compression).
+    Those are compared by mtime only, since sizes differ and the content can't be compared
+    without decompressing. When names is given (even empty), copies left under another name
+    by an earlier run (compression turned on/off, other codec, size threshold crossed) are deleted.
+    Every list holds source rels except deletes, which holds destination rels.
+    Mirror leaves the destination rels keep() is true for (what the entry's filter leaves out).
+    With compare == "hash", the files to hash are collected first and hashed in one batch
+    (core.procpool: in worker processes when there is enough data; processes is the limit).
+    """
+    diff = TreeDiff()
+    deletes: list[str] = []
+    to_hash: list[tuple[str, FileRecord]] = []  # compare == "hash": same size, content decides
+    expected = set(src_index) if names is None else {names.get(rel, rel) for rel in src_index}
+
+    for rel, src_rec in src_index.items():
+        dst_name = rel if names is None else names.get(rel, rel)
+        dst_rec = dst_index.get(dst_name)
+
+        if dst_rec is not None and src_rec.is_dir != dst_rec.is_dir:
+            deletes.append(dst_name)
+            dst_rec = None
+
+        if names is not None and not src_rec.is_dir:
+            deletes.extend(
+                other for other in name_variants(rel)
+                if other != dst_name and other in dst_index and other not in expected
+            )
+
+        if src_rec.is_dir:
+            if dst_rec is None:
+                diff.mkdirs.append(rel)
+            continue
+        if dst_rec is None:
+            diff.copies.append(rel)
+            continue
+
+        if dst_name != rel:
+            unchanged = src_rec.mtime_ns // 1_000_000_000 == dst_rec.mtime_ns // 1_000_000_000
+        elif compare == "hash" and src_rec.size == dst_rec.size:
+            to_hash.append((rel, dst_rec))
+            continue
+        else:
+            unchanged = is_unchanged(src_root / rel, src_rec, dst_root / rel, dst_rec, compare)
+        if unchanged:
+            diff.skipped += 1
+        else:
+            diff.updates.append(rel)
+
+    if to_hash:
+        _compare_by_hash(diff, src_root, src_index, dst_root, to_hash, processes)
+
+    if mirror:
+        covered = None  # last top-most extra: what is below it goes (or stays) with it
+        for rel in sorted(rel for rel in dst_index if rel not in expected):
+            if covered is not None and rel.startswith(covered):
+                continue
+            covered = rel + "/"
+            if keep is None or not keep(rel):
+                deletes.append(rel)
+
+    for rel in sorted(set(deletes)):
+        if diff.deletes and rel.startswith(diff.deletes[-1] + "/"):
+            continue
+        diff.deletes.append(rel)
+
+    diff.mkdirs.sort()  # parents before children
+    return diff
+
+
+@dataclass
+class Plan:
+    """
+    What one entry's run will do, computed before anything is written.
+    The executor (core.copier.execute_plan) works from this exact plan, so a dry-run
+    reports the same copies/updates/deletes a real run performs.
+    For snapshot entries, copies are the files to hash and store: some may turn out
+    to be in the store already and are then counted as skipped by the real run.
+    For pack entries, deletes are files dropped from the archive index, and pack says
+    which segments are kept and which unchanged files get repacked (core.pack).
+    For rotate entries, the diff is against the newest snapshot: skipped files are hard-linked
+    from it, and rotate names the new snapshot and the old ones retention drops (core.rotate).
+    """
+    entry: str
+    mode: str
+    source: Path
+    destination: Path  # copy/mirror: dst_item; snapshot: the entry's snapshots folder; pack: its pack folder;
+    # rotate: the new snapshot's dst_item
+    src_root: Path
+    dst_root: Path
+    diff: TreeDiff
+    copy_bytes: int = 0
+    update_bytes: int = 0
+    estimated_seconds: float = 0.0
+    bytes_per_second: float = DEFAULT_BYTES_PER_SECOND
+    measured: bool = False  # bytes_per_second comes from a previous run, not the default
+
+    # executor state
+    src_index: dict[str, FileRecord] = field(default_factory=dict, repr=False)
+    dst_index: dict[str, FileRecord] = field(default_factory=dict, repr=False)
+    manifest: Path | None = None  # index to update after the run (None = don't keep one)
+    full_scan: bool = True  # dst_index is a scan (True) or the stored manifest (False)
+    clear_destination: bool = False  # a file sits where the source dir goes
+    reused: dict[str, dict[str, Any]] = field(default_factory=dict, repr=False)  # snapshot: unchanged files
+    journal: Path | None = None  # where the executor journals finished files (None = no journal)
+    codec: str | None = None  # compression codec for copy/mirror (core.compression)
+    names: dict[str, str] | None = None  # with a codec: source rel -> stored name of compressed files
+    resumed: bool = False  # rebuilt from an interrupted run's journal, not from a scan
+    pack: PackPlan | None = field(default=None, repr=False)  # pack mode: segments to keep / rewrite
+    rotate: RotatePlan | None = field(default=None, repr=False)  # rotate mode: new snapshot, links, pruning
+    timings: dict[str, float] = field(default_factory=dict, repr=False)  # phase -> seconds (core.metrics)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.copy_bytes + self.update_bytes
+
+    @property
+    def deleted(self) -> int:
+        pruned = len(self.rotate.prune) if self.rotate is not None else 0
+        return len(self.diff.deletes) + (1 if self.clear_destination else 0) + pruned
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entry": self.entry,
+            "mode": self.mode,
+            "source": str(self.source),
+            "destination": str(self.destination),
+            "compression": self.codec,
+            "compressed": len(self.names or {}),
+            "mkdir": self.diff.mkdirs,
+            "copy": self.diff.copies,
+            "update": self.diff.updates,
+            "delete": ([""] if self.clear_destination else []) + self.diff.deletes,
+            "skipped": self.diff.skipped,
+            "copy_bytes": self.copy_bytes,
+            "update_bytes": self.update_bytes,
+            "total_bytes": self.total_bytes,
+            "bytes_per_second": round(self.bytes_per_second),
+            "estimated_seconds": round(self.estimated_seconds, 3),
+            **({} if self.pack is None else {
+                "segments_kept": self.pack.keep,
+                "segments_dropped": self.pack.drop,
+                "repack": self.pack.repack,
+                "repack_bytes": self.pack.repack_bytes,
+            }),
+            **({} if self.rotate is None else {
+                "previous": self.rotate.previous.parent.name if self.rotate.previous else None,
+                "link": len(self.rotate.links),
+                "prune": self.rotate.prune,
+            }),
+        }
+
+    def journal_header(self) -> dict[str, Any]:
+        """
+        Enough of the plan for --resume to finish it without scanning again (core.journal).
+        """
+        return {
+            **new_header(self.source, self.dst_root, self.mode),
+            "clear_destination": self.clear_destination,
+            "mkdirs": self.diff.mkdirs,
+            "deletes": self.diff.deletes,
+            "copies": [[rel, self.src_index[rel].size] for rel in self.diff.copies],
+            "updates": [[rel, self.src_index[rel].size] for rel in self.diff.updates],
+            "skipped": self.diff.skipped,
+            "codec": self.codec,
+            "names": self.names,
+        }
+
+    def summary(self) -> str:
+        return (
+            f"copy: {len(self.diff.copies)} | update: {len(self.diff.updates)} | "
+            f"skip: {self.diff.skipped} | delete: {self.deleted} | "
+            f"bytes: {self.total_bytes} | est: {format_seconds(self.estimated_seconds)}"
+            + ("" if self.measured else " (default speed)")
+            + (" | resumed" if self.resumed else "")
+            + (
+                ""
+                if self.pack is None
+                else f" | segments kept: {len(self.pack.keep)}, dropped: {len(self.pack.drop)}, "
+                f"repack: {len(self.pack.repack)}"
+            )
+            + (
+                ""
+                if self.rotate is None
+                else f" | link: {len(self.rotate.links)} | prune: {len(self.rotate.prune)} snapshot(s)"
+            )
+        )
+
+    def format(self, limit: int | None = 20) -> list[str]:
+        """
+        Plan lines for the terminal: one per action, at most `limit` paths per kind (None = all).
+        """
+        lines: list[str] = []
+        kinds = (
+            ("delete", ([""] if self.clear_destination else []) + self.diff.deletes),
+            ("copy", self.diff.copies),
+            ("update", self.diff.updates),
+            ("prune", self.rotate.prune if self.rotate is not None else []),
+        )
+        for kind, rels in kinds:
+            rels = sorted(rels)
+            shown = rels if limit is None else rels[:limit]
+            lines.extend(f"{kind}: {rel or '.'}" for rel in shown)
+            if len(rels) > len(shown):
+                lines.append(f"{kind}: ... and {len(rels) - len(shown)} more")
+        return lines
+
+
+def format_seconds(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+def _estimate(plan: Plan) -> None:
+    diff = plan.diff
+    plan.copy_bytes = sum(plan.src_index[rel].size for rel in diff.copies)
+    plan.update_bytes = sum(plan.src_index[rel].size for rel in diff.updates)
+    paths = len(diff.copies) + len(diff.updates) + plan.deleted
+    plan.estimated_seconds = plan.total_bytes / plan.bytes_per_second + paths * SECONDS_PER_FILE
+    if plan.pack is not None:  # one archive stream: no per-file cost on the destination, but repacked data is rewritten
+        plan.estimated_seconds = (plan.total_bytes + plan.pack.repack_bytes) / plan.bytes_per_second
+
+
+SourceScan = tuple[Path, dict[str, FileRecord]]
+
+
+def source_index(entry: Entry) -> SourceScan:
+    """
+    (src_root, scan). A file source is a one-item tree rooted at its parent.
+    Pass it to plan_entry as source_scan to plan several destinations from one scan.
+    """
+    if entry.source.is_dir():
+        return entry.source, scan_tree(entry.source, entry.follow_symlinks, entry_filter(entry))
+    return entry.source.parent, {entry.source.name: record_from_stat(entry.source.stat())}
+
+
+def _filtered_out(entry: Entry, dst_index: dict[str, FileRecord], compressed: bool) -> Callable[[str], bool]:
+    """
+    keep() for diff_trees: whether a destination path is one the entry's filter leaves out
+    (include/exclude patterns, .fileknightignore files). Mirror does not delete those.
+    """
+    path_filter = entry_filter(entry)
+
+    def keep(rel: str) -> bool:
+        suffix = marker_suffix(rel) if compressed else None
+        src_rel = rel[: -len(suffix)] if suffix else rel
+        return path_filter.locate(entry.source, src_rel, dst_index[rel].is_dir) is None
+
+    return keep
+
+
+def _plan_snapshot(entry: Entry, destination_root: Path, source_scan: SourceScan | None = None) -> Plan:
+    timings: dict[str, float] = {}
+    with timed(timings, "scan"):
+        src_root, src_index = source_scan or source_index(entry)
+    with timed(timings, "diff"):
+        reused, to_store = plan_snapshot(src_index, destination_root, entry.name)
+    plan = Plan(
+        entry=entry.name,
+        mode=entry.mode,
+        source=entry.source,
+        destination=snapshots_dir(destination_root, entry.name),
+        src_root=src_root,
+        dst_root=snapshots_dir(destination_root, entry.name),
+        diff=TreeDiff(copies=to_store, skipped=len(reused)),
+        src_index=src_index,
+        reused=reused,
+        timings=timings,
+    )
+    _estimate(plan)
+    return plan
+
+
+def _plan_pack(entry: Entry, destination_root: Path, source_scan: SourceScan | None = None) -> Plan:
+    timings: dict[str, float] = {}
+    folder = pack_dir(destination_root, entry.name)
+    with timed(timings, "scan"):
+        src_root, src_index = source_scan or source_index(entry)
+    with timed(timings, "diff"):
+        copies, updates, deletes, skipped, pack = plan_pack(
+            src_index, folder, entry.pack_segment_size or DEFAULT_SEGMENT_SIZE
+        )
+    measured = (read_pack_index(folder) or {}).get("bytes_per_second")
+    plan = Plan(
+        entry=entry.name,
+        mode=entry.mode,
+        source=entry.source,
+        destination=folder,
+        src_root=src_root,
+        dst_root=folder,
+        diff=TreeDiff(copies=copies, updates=updates, deletes=deletes, skipped=skipped),
+        bytes_per_second=measured or DEFAULT_BYTES_PER_SECOND,
+        measured=measured is not None,
+        src_index=src_index,
+        codec=resolve_codec(entry.compression),
+        pack=pack,
+        timings=timings,
+    )
+    _estimate(plan)
+    return plan
+
+
+def _plan_rotate(
+    entry: Entry, destination_root: Path, source_scan: SourceScan | None = None, processes: int | None = None
+) -> Plan:
+    dst_dir, dst_item = compute_destination_paths(entry, destination_root)
+    timings: dict[str, float] = {}
+    codec = resolve_codec(entry.compression)
+    existing = list_rotations(dst_dir)
+    name = new_rotation_name(dst_dir, datetime.now())
+    inner = Path(entry.source.name if entry.source.is_dir() else ".")  # a file source sits in the snapshot itself
+
+    with timed(timings, "scan"):
+        src_root, src_index = source_scan or source_index(entry)
+        previous = dst_dir / existing[-1] / inner if existing else None
+        prev_index: dict[str, FileRecord] = {}
+        if previous is not None:
+            if entry.source.is_dir():
+                prev_index = scan_tree(previous, follow_symlinks=False)
+            else:
+                for other in name_variants(entry.source.name):
+                    if (previous / other).is_file():
+                        prev_index[other] = record_from_stat((previous / other).stat())
+    with timed(timings, "diff"):
+        names = dst_names(src_index, codec, entry.compress_min_size, entry.compress_skip) if codec else {}
+        diff = diff_trees(
+            src_root, src_index, previous or dst_dir / name, prev_index, entry.compare, False, names,
+            processes=processes,
+        )
+        changed = set(diff.copies) | set(diff.updates)
+        links = [rel for rel, rec in src_index.items() if not rec.is_dir and rel not in changed]
+        diff.mkdirs = sorted(rel for rel, rec in src_index.items() if rec.is_dir)  # the new tree starts empty
+        diff.deletes = []
+        keep = retain(existing + [name], entry.keep_daily, entry.keep_weekly)
+
+    new_root = partial_dir(dst_dir, name) / inner
+    plan = Plan(
+        entry=entry.name,
+        mode=entry.mode,
+        source=entry.source,
+        destination=dst_dir / name / inner,
+        src_root=src_root,
+        dst_root=new_root,
+        diff=diff,
+        src_index=src_index,
+        dst_index=prev_index,
+        codec=codec,
+        names=names,
+        rotate=RotatePlan(dst_dir, name, previous, links, [n for n in existing if n not in keep]),
+        timings=timings,
+    )
+    _estimate(plan)
+    return plan
+
+
+def _plan_from_journal(
+    entry: Entry,
+    src_root: Path,
+    dst_root: Path,
+    journal: Path,
+    header: dict[str, Any],
+    done: dict[str, tuple[int, int]],
+) -> Plan:
+    """
+    What is left of an interrupted run: the files its journal does not list as written.
+    A listed file whose destination no longer has the recorded size + mtime is copied again.
+    Deletes only run where the destination still has the wrong type (a type clash the
+    previous run had not fixed yet) or, for mirror extras, where something is still there.
+    """
+    names: dict[str, str] | None = header.get("names")
+
+    def finished(rel: str) -> bool:
+        try:
+            st = (dst_root / (names or {}).get(rel, rel)).stat()
+        except OSError:
+            return False
+        return done.get(rel) == (st.st_size, st.st_mtime_ns)
+
+    copies = [(rel, size) for rel, size in header["copies"] if not (rel in done and finished(rel))]
+    updates = [(rel, size) for rel, size in header["updates"] if not (rel in done and finished(rel))]
+    resumed_files = len(header["copies"]) + len(header["updates"]) - len(copies) - len(updates)
+
+    mkdirs = set(header["mkdirs"])
+    files = {rel for rel, _ in header["copies"]} | {rel for rel, _ in header["updates"]}
+
+    def still_to_delete(rel: str) -> bool:
+        path = dst_root / rel
+        if rel in mkdirs:
+            return path.exists() and not path.is_dir()
+        if rel in files:
+            return path.is_dir()
+        return path.exists() or path.is_symlink()
+
+    clear_destination = header["clear_destination"] and dst_root.exists() and not dst_root.is_dir()
+    diff = TreeDiff(
+        mkdirs=header["mkdirs"],
+        copies=[rel for rel, _ in copies],
+        updates=[rel for rel, _ in updates],
+        deletes=[rel for rel in header["deletes"] if still_to_delete(rel)],
+        skipped=header["skipped"] + resumed_files,
+    )
+    src_index = {rel: FileRecord(False, size, 0, 0) for rel, size in copies + updates}
+    plan = Plan(
+        entry=entry.name,
+        mode=entry.mode,
+        source=entry.source,
+        destination=dst_root if entry.source.is_dir() else dst_root / entry.source.name,
+        src_root=src_root,
+        dst_root=dst_root,
+        diff=diff,
+        src_index=src_index,
+        manifest=index_path(journal.parent),
+        full_scan=False,
+        clear_destination=clear_destination,
+        journal=journal,
+        resumed=True,
+        codec=header.get("codec"),
+        names=names,
+    )
+    _estimate(plan)
+    return plan
+
+
+def plan_entry(
+    entry: Entry,
+    destination_root: Path,
+    options: RunOptions | None = None,
+    only: list[str] | None = None,
+    source_scan: SourceScan | None = None,
+) -> Plan:
+    """
+    Scan the source and the destination state (the stored index when there is one,
+    otherwise a destination walk) and work out what a run of this entry would do.
+    Nothing is written. only limits a directory entry to these relative paths
+    (and what is below them) on both sides; the index is then patched, never created.
+    source_scan (from source_index) replaces the source scan, e.g. when one scan feeds
+    several destinations; it is not used with only.
+    """
+    if not entry.source.exists():
+        raise FileNotFoundError(f"Source does not exist: {entry.source}")
+
+    options = options or RunOptions()
+    if entry.mode == "snapshot":
+        return _plan_snapshot(entry, destination_root, source_scan)
+    if entry.mode == "pack":
+        return _plan_pack(entry, destination_root, source_scan)
+    if entry.mode == "rotate":
+        return _plan_rotate(entry, destination_root, source_scan, options.hash_processes)
+
+    dst_dir, dst_item = compute_destination_paths(entry, destination_root)
+    mirror = entry.mode == "mirror"
+    timings: dict[str, float] = {}
+    journal = journal_path(dst_dir)
+    codec = resolve_codec(entry.compression)
+
+    if options.resume and only is None:
+        src_root, dst_root = (entry.source, dst_item) if entry.source.is_dir() else (entry.source.parent, dst_dir)
+        with timed(timings, "scan"):
+            state = read_journal(journal, entry.source, dst_root, entry.mode)
+        if state is not None:
+            plan = _plan_from_journal(entry, src_root, dst_root, journal, *state)
+            plan.timings = timings
+            return plan
+
+    if not entry.source.is_dir():
+        with timed(timings, "scan"):
+            src_root, src_index = source_scan or source_index(entry)
+            dst_index: dict[str, FileRecord] = {}
+            try:
+                dst_index[dst_item.name] = record_from_stat(dst_item.stat())
+            except FileNotFoundError:
+                pass
+        with timed(timings, "diff"):
+            names = dst_names(src_index, codec, entry.compress_min_size, entry.compress_skip) if codec else {}
+            for other in name_variants(entry.source.name)[1:]:
+                if (dst_dir / other).exists():
+                    dst_index[other] = record_from_stat((dst_dir / other).stat())
+            diff = diff_trees(src_root, src_index, dst_dir, dst_index, entry.compare, False, names)
+        plan = Plan(
+            entry=entry.name,
+            mode=entry.mode,
+            source=entry.source,
+            destination=dst_dir / (names or {}).get(dst_item.name, dst_item.name),
+            src_root=src_root,
+            dst_root=dst_dir,
+            diff=diff,
+            src_index=src_index,
+            dst_index=dst_index,
+            journal=journal,
+            codec=codec,
+            names=names,
+            timings=timings,
+        )
+        _estimate(plan)
+        return plan
+
+    manifest: Path | None = index_path(dst_dir)
+    clear_destination = dst_item.exists() and not dst_item.is_dir()
+    with timed(timings, "scan"):
+        if only is not None:
+            src_index = scan_paths(entry.source, only, entry.follow_symlinks, entry_filter(entry))
+            dst_index = scan_paths(dst_item, only, follow_symlinks=False)
+            full_scan = False
+            if not has_index(manifest, entry.source, dst_item):
+                manifest = None
+        else:
+            src_index = source_scan[1] if source_scan is not None else source_index(entry)[1]
+            loaded = None
+            if not options.rescan and not clear_destination:
+                loaded = load_index(manifest, entry.source, dst_item)
+            full_scan = loaded is None
+            dst_index = scan_tree(dst_item, follow_symlinks=False) if loaded is None else loaded
+    with timed(timings, "diff"):
+        names = dst_names(src_index, codec, entry.compress_min_size, entry.compress_skip) if codec else {}
+        keep = _filtered_out(entry, dst_index, codec is not None) if mirror else None
+        diff = diff_trees(
+            entry.source, src_index, dst_item, dst_index, entry.compare, mirror, names, keep, options.hash_processes
+        )
+
+    measured = read_throughput(index_path(dst_dir))
+    plan = Plan(
+        entry=entry.name,
+        mode=entry.mode,
+        source=entry.source,
+        destination=dst_item,
+        src_root=entry.source,
+        dst_root=dst_item,
+        diff=diff,
+        bytes_per_second=measured or DEFAULT_BYTES_PER_SECOND,
+        measured=measured is not None,
+        src_index=src_index,
+        dst_index=dst_index,
+        manifest=manifest,
+        full_scan=full_scan,
+        clear_destination=clear_destination,
+        journal=journal if only is None else None,
+        codec=codec,
+        names=names,
+        timings=timings,
+    )
+    _estimate(plan)
+    return plan
@@ -0,0 +1,137 @@
+# ⌘
+#
+#  /fileknight/core/procpool.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from core.hashing import STORED_ALGORITHM, new_hasher, thread_buffer
+
+# A worker process costs an interpreter start (spawn) and a round trip per shard, so one is
+# only added for this much hashing; below it everything is hashed in the calling process.
+BYTES_PER_PROCESS = 256 * 1024 * 1024
+FILES_PER_PROCESS = 64
+SHARDS_PER_PROCESS = 4  # smaller shards even out files that hash slower than their size says
+
+_SEP = "\0"  # can't occur in a path
+
+
+def usable_cpus() -> int:
+    """
+    CPUs this process may run on (its affinity mask, e.g. under taskset or a container's cpuset),
+    not every CPU in the machine.
+    """
+    if hasattr(os, "sched_getaffinity"):  # not on Windows / macOS
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def auto_processes(files: int, nbytes: int, limit: int | None = None) -> int:
+    """
+    Worker processes worth starting to hash files totalling nbytes: one per BYTES_PER_PROCESS
+    (and FILES_PER_PROCESS), at most one per usable CPU. limit None = auto, 0 = never (hash in-process),
+    N = at most N.
+    """
+    if limit == 0:
+        return 0
+    wanted = min(usable_cpus(), nbytes // BYTES_PER_PROCESS, files // FILES_PER_PROCESS)
+    if limit is not None:
+        wanted = min(wanted, limit)
+    return wanted if wanted >= 2 else 0
+
+
+def size_shards(sizes: list[int], shards: int) -> list[list[int]]:
+    """
+    Split file indexes into shards of about equal total size (largest files first, each one into
+    the lightest shard so far). Each shard keeps its files in index order.
+    """
+    shards = max(1, min(shards, len(sizes)))
+    heap = [(0, i) for i in range(shards)]
+    out: list[list[int]] = [[] for _ in range(shards)]
+    for index in sorted(range(len(sizes)), key=sizes.__getitem__, reverse=True):
+        total, shard = heapq.heappop(heap)
+        out[shard].append(index)
+        heapq.heappush(heap, (total + sizes[index], shard))
+    for shard in out:
+        shard.sort()
+    return [shard for shard in out if shard]
+
+
+def _hash_shard(paths: str, algorithm: str) -> tuple[bytes, bytes]:
+    """
+    Worker side: hash each path (joined by _SEP). Returns the raw digests back to back and
+    one status byte per file (0 = unreadable), not a list of objects to pickle.
+    """
+    digests = bytearray()
+    status = bytearray()
+    view = thread_buffer()
+    size = new_hasher(algorithm).digest_size
+    for path in paths.split(_SEP):
+        h = new_hasher(algorithm)
+        try:
+            with open(path, "rb", buffering=0) as f:
+                while n := f.readinto(view):
+                    h.update(view[:n])
+        except OSError:
+            digests += bytes(size)
+            status.append(0)
+            continue
+        digests += h.digest()
+        status.append(1)
+    return bytes(digests), bytes(status)
+
+
+def hash_many(
+    paths: list[Path],
+    sizes: list[int],
+    algorithm: str = STORED_ALGORITHM,
+    processes: int | None = None,
+    threads: int = 1,
+) -> list[str | None]:
+    """
+    Hex digests of the files (None where one can't be read), like core.hashing.hash_file.
+    With enough data (auto_processes; processes as its limit) the files are split into size-balanced
+    shards hashed by a pool of worker processes, so hashing is not serialized on the GIL; otherwise
+    they are hashed here, on up to threads threads.
+    """
+    names = [os.fspath(path) for path in paths]
+    if not names:
+        return []
+    count = auto_processes(len(names), sum(sizes), processes)
+    if count == 0 and threads <= 1:
+        return _unpack(*_hash_shard(_SEP.join(names), algorithm), algorithm)
+
+    if count == 0:
+        shards = size_shards(sizes, threads)
+        pool: ThreadPoolExecutor | ProcessPoolExecutor = ThreadPoolExecutor(max_workers=len(shards))
+    else:
+        shards = size_shards(sizes, count * SHARDS_PER_PROCESS)
+        # spawn: forking a process that runs the copy pool's threads is not safe
+        pool = ProcessPoolExecutor(max_workers=count, mp_context=multiprocessing.get_context("spawn"))
+    results: list[str | None] = [None] * len(names)
+    with pool:
+        futures = [
+            pool.submit(_hash_shard, _SEP.join(names[i] for i in shard), algorithm)
+            for shard in shards
+        ]
+        for shard, future in zip(shards, futures):
+            for index, digest in zip(shard, _unpack(*future.result(), algorithm)):
+                results[index] = digest
+    return results
+
+
+def _unpack(digests: bytes, status: bytes, algorithm: str) -> list[str | None]:
+    size = new_hasher(algorithm).digest_size
+    return [
+        digests[i * size:(i + 1) * size].hex() if ok else None
+        for i, ok in enumerate(status)
+    ]
@@ -0,0 +1,77 @@
+# ⌘
+#
+#  /fileknight/core/progress.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+class CancelledError(Exception):
+    """
+    Raised at a file boundary once a run's cancel event is set.
+    """
+
+
+@dataclass(frozen=True)
+class Progress:
+    entry: str
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+def check_cancel(cancel: threading.Event | None) -> None:
+    if cancel is not None and cancel.is_set():
+        raise CancelledError("Cancelled")
+
+
+class ProgressTracker:
+    """
+    Thread-safe counter for one entry's copy phase.
+    Workers call advance() after each file and check() before starting one;
+    the callback gets a Progress snapshot every time (it must be cheap and thread-safe,
+    e.g. queue.put).
+    """
+
+    def __init__(
+        self,
+        entry: str,
+        files_total: int,
+        bytes_total: int,
+        callback: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        self.entry = entry
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.callback = callback
+        self.cancel = cancel
+        self._files_done = 0
+        self._bytes_done = 0
+        self._lock = threading.Lock()
+        self._emit(0, 0)
+
+    def _emit(self, files_done: int, bytes_done: int) -> None:
+        if self.callback is not None:
+            self.callback(Progress(self.entry, files_done, self.files_total, bytes_done, self.bytes_total))
+
+    def check(self) -> None:
+        check_cancel(self.cancel)
+
+    def advance(self, nbytes: int) -> None:
+        with self._lock:
+            self._files_done += 1
+            self._bytes_done += nbytes
+            files_done, bytes_done = self._files_done, self._bytes_done
+        self._emit(files_done, bytes_done)
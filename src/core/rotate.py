@@ -0,0 +1,175 @@
+# ⌘
+#
+#  /fileknight/core/rotate.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import errno
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+STAMP_FORMAT = "%Y-%m-%d_%H%M%S"
+DEFAULT_KEEP_DAILY = 7
+DEFAULT_KEEP_WEEKLY = 4
+
+_ROTATION_RE = re.compile(r"^\d{4}-\d{2}-\d{2}_\d{6}(?:-\d+)?$")
+_LEFTOVER_RE = re.compile(r"^\.(\d{4}-\d{2}-\d{2}_\d{6}(?:-\d+)?)\.(?:part|deleting)$")
+
+# A hard link can't be made here (other filesystem, FAT/exFAT, too many links to that inode):
+# the file is copied from the source instead.
+_NO_LINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS}
+
+
+@dataclass
+class RotatePlan:
+    """
+    The rotate-mode side of a Plan: which snapshot is made, what it links, what retention drops.
+    """
+    folder: Path  # destination_root/<entry.name>
+    name: str  # folder name of the new snapshot
+    previous: Path | None  # root of the newest finished snapshot's tree (unchanged files link to it)
+    links: list[str] = field(default_factory=list)  # unchanged source rels, hard-linked from previous
+    prune: list[str] = field(default_factory=list)  # older snapshots retention drops once this one is in
+
+
+def list_rotations(folder: Path) -> list[str]:
+    """
+    Finished snapshots of a rotate entry, oldest first (rotation_key order).
+    """
+    try:
+        names = [e.name for e in os.scandir(folder) if e.is_dir(follow_symlinks=False) and _ROTATION_RE.match(e.name)]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return sorted(names, key=rotation_key)
+
+
+def rotation_time(name: str) -> datetime:
+    return datetime.strptime(name[:17], STAMP_FORMAT)
+
+
+def rotation_key(name: str) -> tuple[datetime, int]:
+    """
+    Sort key: time, then the same-second suffix as a number (no suffix = 1), so -10 comes after -9.
+    """
+    suffix = name[18:]  # after "YYYY-MM-DD_HHMMSS-"
+    return rotation_time(name), int(suffix) if suffix else 1
+
+
+def _taken_names(folder: Path) -> list[str]:
+    """
+    Every snapshot name in use in folder: finished ones and the ones interrupted runs left
+    half-built (.part) or half-removed (.deleting).
+    """
+    try:
+        found = [e.name for e in os.scandir(folder)]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    names = [name for name in found if _ROTATION_RE.match(name)]
+    names.extend(m.group(1) for m in map(_LEFTOVER_RE.match, found) if m)
+    return names
+
+
+def new_rotation_name(folder: Path, now: datetime) -> str:
+    """
+    Name for a snapshot taken now in folder. Another run within the same second gets a suffix
+    above any that second has used (-2, -3, ...), leftovers included, so a new snapshot always
+    sorts after the ones before it and never takes over the name of one being removed.
+    """
+    base = now.strftime(STAMP_FORMAT)
+    used = [rotation_key(name)[1] for name in _taken_names(folder) if name[:17] == base]
+    return f"{base}-{max(used) + 1}" if used else base
+
+
+def retain(names: list[str], keep_daily: int, keep_weekly: int) -> set[str]:
+    """
+    The snapshots a keep-N-daily / M-weekly policy keeps: the newest one of each of the
+    keep_daily most recent days that have a snapshot, the newest of each of the keep_weekly
+    most recent ISO weeks, and always the newest overall. Both 0 keeps everything.
+    """
+    if keep_daily <= 0 and keep_weekly <= 0:
+        return set(names)
+    newest_first = sorted(names, key=rotation_key, reverse=True)
+    days: dict[object, str] = {}
+    weeks: dict[object, str] = {}
+    for name in newest_first:
+        when = rotation_time(name)
+        day, week = when.date(), when.isocalendar()[:2]
+        if day not in days and len(days) < keep_daily:
+            days[day] = name
+        if week not in weeks and len(weeks) < keep_weekly:
+            weeks[week] = name
+    return set(newest_first[:1]) | set(days.values()) | set(weeks.values())
+
+
+def partial_dir(folder: Path, name: str) -> Path:
+    """
+    Where a snapshot is built; it is renamed to its final name only once complete.
+    """
+    return folder / f".{name}.part"
+
+
+def clear_leftovers(folder: Path) -> None:
+    """
+    Remove what interrupted runs left: unfinished snapshots and half-pruned ones.
+    """
+    try:
+        leftovers = [e.path for e in os.scandir(folder) if _LEFTOVER_RE.match(e.name)]
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    for path in leftovers:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def link_files(previous: Path, root: Path, rels: list[str], names: dict[str, str] | None = None) -> list[str]:
+    """
+    Hard-link every rel (its stored name under names) from the previous snapshot into root.
+    Returns the rels that could not be linked (the caller copies those instead).
+    Folders must exist already.
+    """
+    names = names or {}
+    failed: list[str] = []
+    no_links = False
+    for rel in rels:
+        stored = names.get(rel, rel)
+        if no_links:
+            failed.append(rel)
+            continue
+        try:
+            os.link(previous / stored, root / stored)
+        except FileNotFoundError:
+            failed.append(rel)  # removed from the previous snapshot since it was planned
+        except OSError as ex:
+            if ex.errno not in _NO_LINK_ERRNOS:
+                raise
+            failed.append(rel)
+            no_links = ex.errno != errno.EMLINK  # the filesystem can't link at all: stop trying
+    return failed
+
+
+def commit_rotation(folder: Path, name: str) -> Path:
+    final = folder / name
+    os.replace(partial_dir(folder, name), final)
+    return final
+
+
+def prune_rotations(folder: Path, names: list[str]) -> None:
+    """
+    Drop old snapshots. Each is renamed out of the way first, so it disappears at once and an
+    interrupted removal is finished by the next run; deleting a snapshot only drops link counts
+    for the files newer snapshots still share.
+    """
+    for name in names:
+        doomed = folder / f".{name}.deleting"
+        try:
+            os.replace(folder / name, doomed)
+        except FileNotFoundError:
+            continue
+        shutil.rmtree(doomed, ignore_errors=True)
@@ -0,0 +1,205 @@
+# ⌘
+#
+#  /fileknight/core/scanner.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+import stat
+from collections.abc import Iterator
+from pathlib import Path
+
+from core.filters import PathFilter, Scope
+from core.models import FileRecord
+
+
+def record_from_stat(st: os.stat_result) -> FileRecord:
+    return FileRecord(
+        stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime_ns, st.st_ino, mode=stat.S_IMODE(st.st_mode)
+    )
+
+
+def walk(
+    root: Path,
+    follow_symlinks: bool = True,
+    path_filter: PathFilter | None = None,
+    within: str = "",
+) -> Iterator[tuple[str, FileRecord]]:
+    """
+    Stream (relative posix path, record) for every dir and regular file below root.
+
+    Iterative os.scandir walk: directories are classified from the DirEntry type
+    (no stat), files reuse the DirEntry stat result (free on Windows, one call elsewhere).
+    Parents are always yielded before their children.
+
+    - Symlinks are followed when follow_symlinks is True (loops are cut by
+      device/inode), and skipped otherwise. Dangling links are skipped.
+    - Sockets, FIFOs and device nodes are skipped: copying them would block or fail.
+    - With a path_filter (core.filters), excluded paths are left out and excluded folders
+      are not entered at all. within is root's own path in the filtered tree ("a/b"),
+      when walking a folder below the tree the patterns are anchored at.
+    """
+    if not root.is_dir():
+        return
+
+    seen: set[tuple[int, int]] = set()
+    if follow_symlinks:
+        st = root.stat()
+        seen.add((st.st_dev, st.st_ino))
+
+    base = within + "/" if within else ""
+    scope: Scope | None = None
+    if path_filter is not None:
+        scope = path_filter.locate(root.parents[within.count("/")] if within else root, within, True)
+        if scope is None:
+            return
+    held: dict[str, FileRecord] = {}  # include filter: folders not yielded until something inside is
+
+    stack: list[tuple[str, str, Scope | None]] = [(os.fspath(root), "", scope)]
+    while stack:
+        dir_path, prefix, scope = stack.pop()
+        try:
+            it = os.scandir(dir_path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue  # vanished or unreadable since it was listed
+
+        subdirs: list[tuple[str, str, Scope | None]] = []
+        with it:
+            listing = list(it)
+        if path_filter is not None and scope is not None:
+            scope = path_filter.enter(scope, dir_path, base + prefix, [e.name for e in listing])
+
+        for entry in listing:
+            rel = prefix + entry.name
+            try:
+                if entry.is_symlink():
+                    if not follow_symlinks:
+                        continue
+                    st = entry.stat()  # follows the link
+                    if stat.S_ISDIR(st.st_mode):
+                        key = (st.st_dev, st.st_ino)
+                        if key in seen:
+                            continue  # loop back into a dir we already walk
+                        seen.add(key)
+                    elif not stat.S_ISREG(st.st_mode):
+                        continue
+                    rec = record_from_stat(st)
+                elif entry.is_dir(follow_symlinks=False):
+                    if follow_symlinks:
+                        st = entry.stat(follow_symlinks=False)
+                        seen.add((st.st_dev, st.st_ino))
+                        rec = record_from_stat(st)
+                    else:
+                        rec = FileRecord(True, 0, 0, entry.inode())
+                elif entry.is_file(follow_symlinks=False):
+                    rec = record_from_stat(entry.stat(follow_symlinks=False))
+                else:
+                    continue
+            except FileNotFoundError:
+                continue  # vanished between listing and stat, or dangling symlink
+
+            if path_filter is None or scope is None:
+                yield rel, rec
+                if rec.is_dir:
+                    subdirs.append((entry.path, rel + "/", None))
+                continue
+
+            if path_filter.excluded(scope, base + rel, rec.is_dir):
+                continue
+            if rec.is_dir:
+                inner = path_filter.descend(scope, base + rel)
+                subdirs.append((entry.path, rel + "/", inner))
+                if not inner.selected:
+                    held[rel] = rec
+                    continue
+            elif not path_filter.selected(scope, base + rel, False):
+                continue
+            if held:
+                yield from _release(held, rel)
+            yield rel, rec
+
+        stack.extend(reversed(subdirs))
+
+
+def _release(held: dict[str, FileRecord], rel: str) -> Iterator[tuple[str, FileRecord]]:
+    """
+    Yield (and forget) the held folders above rel, outermost first.
+    """
+    end = rel.find("/")
+    while end != -1:
+        parent = rel[:end]
+        if parent in held:
+            yield parent, held.pop(parent)
+        end = rel.find("/", end + 1)
+
+
+def scan_tree(
+    root: Path, follow_symlinks: bool = True, path_filter: PathFilter | None = None
+) -> dict[str, FileRecord]:
+    """
+    Materialise walk() as {relative posix path: record} (insertion order = walk order).
+    """
+    return dict(walk(root, follow_symlinks, path_filter))
+
+
+def top_level_paths(rels: list[str]) -> list[str]:
+    """
+    Drop every path that lives under another one in the list ("a" covers "a/b").
+    """
+    kept: list[str] = []
+    for rel in sorted(set(rels)):
+        if kept and (kept[-1] == "" or rel.startswith(kept[-1] + "/")):
+            continue
+        kept.append(rel)
+    return kept
+
+
+def scan_paths(
+    root: Path, rels: list[str], follow_symlinks: bool = True, path_filter: PathFilter | None = None
+) -> dict[str, FileRecord]:
+    """
+    Scan only some paths below root: each rel (walked when it is a dir) plus its ancestors,
+    so a partial diff can still create missing parent folders. Missing rels are left out,
+    and so are the ones path_filter excludes.
+    """
+    index: dict[str, FileRecord] = {}
+    for rel in top_level_paths(rels):
+        if rel == "":
+            return scan_tree(root, follow_symlinks, path_filter)
+
+        parent = rel.rpartition("/")[0]
+        if path_filter is not None and parent and path_filter.locate(root, parent, True) is None:
+            continue  # inside an excluded folder
+
+        path = root / rel
+        try:
+            st: os.stat_result | None = path.stat() if follow_symlinks else path.lstat()
+        except FileNotFoundError:
+            st = None  # gone: its ancestors are still scanned
+        if st is not None:
+            if not (stat.S_ISDIR(st.st_mode) or stat.S_ISREG(st.st_mode)):
+                continue  # symlink we don't follow, or a special file
+            if path_filter is not None and path_filter.locate(root, rel, stat.S_ISDIR(st.st_mode)) is None:
+                continue
+
+        parts = rel.split("/")
+        for depth in range(1, len(parts)):
+            ancestor = "/".join(parts[:depth])
+            if ancestor not in index:
+                try:
+                    index[ancestor] = record_from_stat((root / ancestor).stat())
+                except FileNotFoundError:
+                    break
+
+        if st is None:
+            continue
+        is_dir = stat.S_ISDIR(st.st_mode)
+        index[rel] = record_from_stat(st)
+        if is_dir:
+            for child, rec in walk(path, follow_symlinks, path_filter, rel):
+                index[f"{rel}/{child}"] = rec
+    return index
@@ -0,0 +1,373 @@
+# ⌘
+#
+#  /fileknight/core/snapshot.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from core.hashing import STORED_ALGORITHM, copy_stream_and_hash
+from core.metrics import timed
+from core.models import CopyResult, FileRecord
+from core.procpool import auto_processes, hash_many
+from core.progress import ProgressCallback, ProgressTracker
+from core.tee import SourceReads
+from core.throttle import Pace, Throttle
+
+STORE_DIR_NAME = ".fileknight_store"
+SNAPSHOTS_DIR_NAME = "snapshots"
+
+
+@dataclass
+class SnapshotInfo:
+    snapshot_id: str
+    path: Path
+    created_at: str
+    files: int
+    total_bytes: int
+
+
+def store_dir(destination_root: Path) -> Path:
+    """
+    One object store shared by every snapshot entry: destination_root/.fileknight_store/objects
+    """
+    return destination_root / STORE_DIR_NAME / "objects"
+
+
+def snapshots_dir(destination_root: Path, entry_name: str) -> Path:
+    return destination_root / entry_name / SNAPSHOTS_DIR_NAME
+
+
+def blob_path(objects: Path, digest: str) -> Path:
+    return objects / digest[:2] / digest
+
+
+def store_blob(
+    src: Path, objects: Path, pace: Pace | None = None, source: IO[bytes] | None = None
+) -> tuple[str, bool]:
+    """
+    Hash src while copying it into a temp file inside the store (single read),
+    then move it to its content address. Returns (digest, stored_new).
+    source is src's data already opened elsewhere (core.tee).
+    """
+    objects.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".incoming-", dir=objects)
+    tmp = Path(tmp_name)
+    try:
+        try:
+            digest = copy_stream_and_hash(src, fd, STORED_ALGORITHM, pace, source)
+        finally:
+            os.close(fd)
+        target = blob_path(objects, digest)
+        if target.exists():
+            tmp.unlink()
+            return digest, False
+        target.parent.mkdir(exist_ok=True)
+        os.replace(tmp, target)
+        return digest, True
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def verify_blobs(
+    objects: Path, digests: list[str], sizes: list[int], processes: int | None = None, threads: int = 1
+) -> list[bool]:
+    """
+    Re-read stored objects and check each still hashes to its address (False when missing).
+    Each distinct digest is read once; worker processes do it when there is a lot to re-read (core.procpool).
+    """
+    unique = list(dict.fromkeys(digests))
+    size_of = dict(zip(digests, sizes))
+    found = hash_many(
+        [blob_path(objects, digest) for digest in unique], [size_of[d] for d in unique],
+        STORED_ALGORITHM, processes, threads,
+    )
+    ok = {digest: digest == got for digest, got in zip(unique, found)}
+    return [ok[digest] for digest in digests]
+
+
+def read_manifest(path: Path) -> dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def latest_manifest(destination_root: Path, entry_name: str) -> Path | None:
+    folder = snapshots_dir(destination_root, entry_name)
+    if not folder.is_dir():
+        return None
+    manifests = sorted(folder.glob("*.json"))
+    return manifests[-1] if manifests else None
+
+
+def _new_snapshot_path(folder: Path) -> Path:
+    stamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    path = folder / f"{stamp}.json"
+    n = 1
+    while path.exists():
+        path = folder / f"{stamp}_{n}.json"
+        n += 1
+    return path
+
+
+def plan_snapshot(
+    src_index: dict[str, FileRecord],
+    destination_root: Path,
+    entry_name: str,
+) -> tuple[dict[str, dict[str, Any]], list[str]]:
+    """
+    Split the source files into (reused, to_store):
+    files whose size + mtime match the latest snapshot reuse its digest without being read;
+    the rest must be hashed and stored (their content may still turn out to be in the store).
+    """
+    objects = store_dir(destination_root)
+    previous: dict[str, dict[str, Any]] = {}
+    last = latest_manifest(destination_root, entry_name)
+    if last is not None:
+        previous = read_manifest(last).get("files", {})
+
+    reused: dict[str, dict[str, Any]] = {}
+    to_store: list[str] = []
+    for rel, rec in src_index.items():
+        if rec.is_dir:
+            continue
+        old = previous.get(rel)
+        if (
+            old is not None
+            and old["size"] == rec.size
+            and old["mtime_ns"] == rec.mtime_ns
+            and blob_path(objects, old["digest"]).exists()
+        ):
+            reused[rel] = {**old, "mode": rec.mode}
+        else:
+            to_store.append(rel)
+    return reused, to_store
+
+
+def _known_blobs(
+    base: Path, src_index: dict[str, FileRecord], to_store: list[str], objects: Path, processes: int | None
+) -> dict[str, str]:
+    """
+    rel -> digest for the to_store files whose content the store already has, found by hashing
+    them in a process pool. Only done when the pool would be used (auto_processes) and the store
+    is not empty: a file found there is then never copied, while each one that is not gets read
+    again by store_blob, which is cheaper than it sounds right after the pool read it (page cache).
+    """
+    sizes = [src_index[rel].size for rel in to_store]
+    if not auto_processes(len(to_store), sum(sizes), processes) or not any(objects.glob("*/*")):
+        return {}
+    digests = hash_many([base / rel for rel in to_store], sizes, STORED_ALGORITHM, processes)
+    return {
+        rel: digest for rel, digest in zip(to_store, digests)
+        if digest is not None and blob_path(objects, digest).is_file()
+    }
+
+
+def _drop_bad_blobs(
+    files: dict[str, dict[str, Any]],
+    bad: set[str],
+    objects: Path,
+    destination_root: Path,
+    entry_name: str,
+) -> None:
+    """
+    Keep the manifest from pointing at blobs that failed verification (and were removed):
+    files stored as one of the bad digests keep their record from the latest snapshot when
+    its blob is still there, or are left out; either way the next run stores them again.
+    """
+    previous: dict[str, dict[str, Any]] = {}
+    last = latest_manifest(destination_root, entry_name)
+    if last is not None:
+        previous = read_manifest(last).get("files", {})
+    for rel in [rel for rel, info in files.items() if info["digest"] in bad]:
+        old = previous.get(rel)
+        if old is not None and old["digest"] not in bad and blob_path(objects, old["digest"]).exists():
+            files[rel] = old
+        else:
+            del files[rel]
+
+
+def take_snapshot(
+    source: Path,
+    src_index: dict[str, FileRecord],
+    destination_root: Path,
+    entry_name: str,
+    result: CopyResult,
+    reused: dict[str, dict[str, Any]],
+    to_store: list[str],
+    workers: int = 1,
+    verify: bool = False,
+    cancel: threading.Event | None = None,
+    progress: ProgressCallback | None = None,
+    timings: dict[str, float] | None = None,
+    throttle: Throttle | None = None,
+    reads: SourceReads | None = None,
+    processes: int | None = None,
+) -> Path:
+    """
+    Store the to_store files once by content and write a manifest for this run
+    (reused + to_store come from plan_snapshot).
+    Counts: copied = new blobs stored, skipped = content already in the store.
+    src_index is the scan of a directory source; a file source passes {name: record}.
+    verify=True re-reads every blob written by this run and checks it against its digest;
+    a file whose blob fails is reported in result.verify_failed and not recorded with that blob.
+    A cancelled run stops at a file boundary and writes no manifest (stored blobs stay for next time).
+    timings (phase -> seconds) gets the "copy" (store + verify) and "commit" (manifest write) phases.
+    throttle (core.throttle) limits the files and bytes read into the store.
+    reads (core.tee) supplies the source files that are read once for several destinations.
+    processes limits the hashing worker processes (core.procpool): with enough data, the files are
+    hashed in a process pool first when the store already has content, so the ones it holds
+    (touched, renamed or copied files) are not written again; verification re-reads the same way.
+    """
+    objects = store_dir(destination_root)
+    folder = snapshots_dir(destination_root, entry_name)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    base = source if source.is_dir() else source.parent
+    files: dict[str, dict[str, Any]] = dict(reused)
+    dirs = [rel for rel, rec in src_index.items() if rec.is_dir]
+    result.skipped += len(reused)
+
+    tracker = None
+    if cancel is not None or progress is not None:
+        tracker = ProgressTracker(entry_name, len(to_store), sum(src_index[r].size for r in to_store), progress, cancel)
+
+    known = _known_blobs(base, src_index, to_store, objects, processes) if reads is None and throttle is None else {}
+
+    def store(rel: str) -> tuple[str, bool]:
+        if tracker is not None:
+            tracker.check()
+        if rel in known:
+            if tracker is not None:
+                tracker.advance(src_index[rel].size)
+            return known[rel], False
+        pace = None
+        if throttle is not None:
+            if throttle.limits_files:
+                throttle.file()
+            pace = throttle.pacer()
+        source = reads.open(rel) if reads is not None else None
+        if source is None:
+            stored_blob = store_blob(base / rel, objects, pace)
+        else:
+            with source:
+                stored_blob = store_blob(base / rel, objects, pace, source)
+        if tracker is not None:
+            tracker.advance(src_index[rel].size)
+        return stored_blob
+
+    timings = timings if timings is not None else {}
+    with timed(timings, "copy"):
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            stored = list(pool.map(store, to_store))
+
+        for rel, (digest, new) in zip(to_store, stored):
+            rec = src_index[rel]
+            files[rel] = {"digest": digest, "size": rec.size, "mtime_ns": rec.mtime_ns, "mode": rec.mode}
+            if new:
+                result.copied += 1
+                result.bytes_copied += rec.size
+            else:
+                result.skipped += 1
+
+        if verify:
+            written = [(rel, digest) for rel, (digest, new) in zip(to_store, stored) if new]
+            checks = verify_blobs(
+                objects, [digest for _rel, digest in written], [src_index[rel].size for rel, _digest in written],
+                processes, max(1, workers),
+            )
+            bad: set[str] = set()
+            for (rel, digest), ok in zip(written, checks):
+                result.verified += 1
+                if not ok:
+                    result.verify_failed.append(rel)
+                    blob_path(objects, digest).unlink(missing_ok=True)
+                    bad.add(digest)
+            if bad:
+                _drop_bad_blobs(files, bad, objects, destination_root, entry_name)
+
+    with timed(timings, "commit"):
+        manifest = {
+            "entry": entry_name,
+            "source": str(source),
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "dirs": sorted(dirs),
+            "files": files,
+        }
+        target = _new_snapshot_path(folder)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, target)
+    return target
+
+
+def list_snapshots(destination_root: Path, entry_name: str) -> list[SnapshotInfo]:
+    folder = snapshots_dir(destination_root, entry_name)
+    if not folder.is_dir():
+        return []
+
+    infos: list[SnapshotInfo] = []
+    for path in sorted(folder.glob("*.json")):
+        data = read_manifest(path)
+        files = data.get("files", {})
+        infos.append(SnapshotInfo(
+            snapshot_id=path.stem,
+            path=path,
+            created_at=str(data.get("created_at", "")),
+            files=len(files),
+            total_bytes=sum(int(f.get("size", 0)) for f in files.values()),
+        ))
+    return infos
+
+
+def restore_snapshot(
+    destination_root: Path,
+    entry_name: str,
+    target: Path,
+    snapshot_id: str | None = None,
+) -> SnapshotInfo:
+    """
+    Rebuild a snapshot (latest when snapshot_id is None) under target.
+    """
+    infos = list_snapshots(destination_root, entry_name)
+    if not infos:
+        raise FileNotFoundError(f"No snapshots found for entry: {entry_name}")
+
+    if snapshot_id is None:
+        info = infos[-1]
+    else:
+        matches = [i for i in infos if i.snapshot_id == snapshot_id]
+        if not matches:
+            raise FileNotFoundError(f"Snapshot not found: {entry_name}/{snapshot_id}")
+        info = matches[0]
+
+    data = read_manifest(info.path)
+    objects = store_dir(destination_root)
+
+    for rel in data.get("dirs", []):
+        (target / rel).mkdir(parents=True, exist_ok=True)
+
+    for rel, meta in data.get("files", {}).items():
+        blob = blob_path(objects, meta["digest"])
+        if not blob.exists():
+            raise FileNotFoundError(f"Missing object {meta['digest']} for {rel}")
+        out = target / rel
+        out.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(blob, out)
+        os.chmod(out, meta.get("mode", 0o644))
+        os.utime(out, ns=(meta["mtime_ns"], meta["mtime_ns"]))
+
+    return info
@@ -0,0 +1,271 @@
+# ⌘
+#
+#  /fileknight/core/tee.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import IO
+
+TEE_CHUNK = 1024 * 1024
+DEFAULT_BUDGET = 128 * 1024 * 1024  # source data held for destinations that are behind, across all files
+
+
+class _Shared:
+    """
+    One source file read once for several destinations.
+    """
+
+    def __init__(self, path: Path, readers: set[str]) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.waiting = set(readers)  # destinations that have not opened it yet
+        self.streams: set[_TeeStream] = set()
+        self.file: IO[bytes] | None = None
+        self.chunks: deque[tuple[int, bytes]] = deque()  # (offset, data), oldest first
+        self.front = 0  # bytes read from disk so far
+        self.eof = False
+        self.evicted = False
+
+    @property
+    def buffered(self) -> int:
+        return sum(len(data) for _offset, data in self.chunks)
+
+    def trim(self) -> int:
+        """
+        Drop the chunks every reader is past (none while a destination has yet to open the file).
+        Returns the bytes freed. Call with lock held.
+        """
+        if self.waiting:
+            return 0
+        if not self.streams:
+            low = self.front
+        else:
+            low = min(stream.pos for stream in self.streams)
+        freed = 0
+        while self.chunks and self.chunks[0][0] + len(self.chunks[0][1]) <= low:
+            freed += len(self.chunks.popleft()[1])
+        if not self.streams and self.file is not None:
+            self.file.close()
+            self.file = None
+        return freed
+
+    def evict(self) -> int:
+        """
+        Stop sharing: readers behind fall back to reading the file themselves. Call with lock held.
+        """
+        freed = self.buffered
+        self.chunks.clear()
+        self.evicted = True
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        return freed
+
+
+class _TeeStream:
+    """
+    Read-only stream of a shared file for one destination. Whichever destination is furthest
+    ahead does the actual reads; the others are served from memory, or from the file itself
+    once they have fallen too far behind (see SharedReads).
+    """
+
+    def __init__(self, owner: SharedReads, shared: _Shared) -> None:
+        self._owner = owner
+        self._shared = shared
+        self._direct: IO[bytes] | None = None
+        self.pos = 0
+
+    def _detach(self) -> None:
+        self._direct = open(self._shared.path, "rb")
+        self._direct.seek(self.pos)
+        self._owner.count_reread()
+
+    def read(self, n: int = -1) -> bytes:
+        """
+        Up to n bytes (all that is left when n < 0); fewer only at the end of the file,
+        like a regular file (tarfile relies on it).
+        """
+        parts: list[bytes] = []
+        got = 0
+        while n is None or n < 0 or got < n:
+            data = self._read_some(-1 if n is None or n < 0 else n - got)
+            if not data:
+                break
+            parts.append(data)
+            got += len(data)
+        return b"".join(parts) if len(parts) != 1 else parts[0]
+
+    def _read_some(self, n: int) -> bytes:
+        if self._direct is not None:
+            data = self._direct.read(n)
+            self.pos += len(data)
+            return data
+
+        shared = self._shared
+        added = freed = 0
+        with shared.lock:
+            if shared.evicted:
+                self._detach()
+            else:
+                if self.pos >= shared.front and not shared.eof:
+                    if shared.file is None:
+                        shared.file = open(shared.path, "rb")
+                        shared.file.seek(shared.front)
+                    data = shared.file.read(TEE_CHUNK)
+                    if data:
+                        shared.chunks.append((shared.front, data))
+                        shared.front += len(data)
+                        added = len(data)
+                    else:
+                        shared.eof = True
+                out = b""
+                for offset, data in shared.chunks:
+                    if offset <= self.pos < offset + len(data):
+                        start = self.pos - offset
+                        end = len(data) if n < 0 else min(len(data), start + n)
+                        out = data[start:end]
+                        break
+                if not out and self.pos < shared.front:
+                    self._detach()  # data already dropped (a reader the plan did not announce)
+                else:
+                    self.pos += len(out)
+                    freed = shared.trim()
+        if self._direct is not None:
+            return self._read_some(n)
+        self._owner.account(shared, added - freed)
+        return out
+
+    def close(self) -> None:
+        if self._direct is not None:
+            self._direct.close()
+        shared = self._shared
+        with shared.lock:
+            shared.streams.discard(self)
+            freed = shared.trim()
+        self._owner.account(shared, -freed)
+
+    def __enter__(self) -> _TeeStream:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class SharedReads:
+    """
+    Fan-out reads: every file that more than one destination needs is read from the source once
+    and handed to each of them, so N destinations cost one read of the source.
+    Destinations run at their own pace: data a destination has not consumed yet is kept in
+    memory, and once that exceeds budget the oldest files stop being shared, so a slow
+    destination re-reads those itself instead of holding up the others (rereads counts them).
+    A destination that stops early must call leave() so nothing is kept for it.
+    """
+
+    def __init__(self, src_root: Path, readers: dict[str, set[str]], budget: int = DEFAULT_BUDGET) -> None:
+        """
+        readers maps rel -> the destinations that will read it.
+        """
+        self.src_root = src_root
+        self.budget = budget
+        self.rereads = 0
+        self._shared = {
+            rel: _Shared(src_root / rel, ids) for rel, ids in readers.items() if len(ids) > 1
+        }
+        self._lock = threading.Lock()
+        self._buffered = 0
+        self._order: OrderedDict[int, _Shared] = OrderedDict()  # files holding data, oldest first
+
+    def count_reread(self) -> None:
+        with self._lock:
+            self.rereads += 1
+
+    def account(self, shared: _Shared, delta: int) -> None:
+        """
+        Track bytes held after shared gained or freed data; evict the oldest files while over budget.
+        """
+        if delta == 0:
+            return
+        victims: list[_Shared] = []
+        with self._lock:
+            self._buffered += delta
+            if shared.chunks:
+                self._order.setdefault(id(shared), shared)
+            else:
+                self._order.pop(id(shared), None)
+            if self._buffered > self.budget:
+                # oldest first; the file being read goes last (a single file bigger than the budget)
+                victims = [s for s in self._order.values() if s is not shared]
+                if id(shared) in self._order:
+                    victims.append(shared)
+        for victim in victims:
+            if not victim.lock.acquire(blocking=False):
+                continue  # busy: try the next one
+            try:
+                freed = victim.evict() if not victim.evicted else 0
+            finally:
+                victim.lock.release()
+            with self._lock:
+                self._buffered -= freed
+                self._order.pop(id(victim), None)
+                if self._buffered <= self.budget:
+                    break
+
+    def open(self, rel: str, reader: str) -> IO[bytes] | None:
+        """
+        A stream of rel's shared data for reader, or None when rel is not shared (only one
+        destination reads it, or it was evicted): the caller then reads the file itself, on its
+        own fast path (core.fastcopy), instead of through a tee.
+        """
+        shared = self._shared.get(rel)
+        if shared is None:
+            return None
+        with shared.lock:
+            shared.waiting.discard(reader)
+            if shared.evicted:
+                stream = None
+            else:
+                stream = _TeeStream(self, shared)
+                shared.streams.add(stream)
+        if stream is None:
+            self.count_reread()
+            return None
+        return stream  # type: ignore[return-value]
+
+    def leave(self, reader: str) -> None:
+        """
+        reader will not open anything more (finished, failed or cancelled).
+        """
+        for shared in self._shared.values():
+            with shared.lock:
+                if reader not in shared.waiting:
+                    continue
+                shared.waiting.discard(reader)
+                freed = shared.trim()
+            self.account(shared, -freed)
+
+    def view(self, reader: str) -> SourceReads:
+        return SourceReads(self, reader)
+
+
+class SourceReads:
+    """
+    One destination's handle on SharedReads: open(rel) returns the source file's data stream,
+    or None when rel is not shared and should be read directly.
+    """
+
+    def __init__(self, shared: SharedReads, reader: str) -> None:
+        self._shared = shared
+        self.reader = reader
+
+    def open(self, rel: str) -> IO[bytes] | None:
+        return self._shared.open(rel, self.reader)
+
+    def leave(self) -> None:
+        self._shared.leave(self.reader)
@@ -0,0 +1,141 @@
+# ⌘
+#
+#  /fileknight/core/throttle.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.models import Entry
+
+BYTES_PER_MBIT = 125_000  # max_mbps is in megabits per second, like link speeds
+BURST_SECONDS = 0.25  # how far ahead of the rate a bucket may run after being idle
+PACED_CHUNK = 128 * 1024  # copy granularity while bytes are limited (unlimited copies keep their big chunks)
+
+Pace = Callable[[int], None]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. rate <= 0 means unlimited.
+    Callers take tokens first and wait off the debt afterwards, so a big request is
+    paced as smoothly as many small ones and nobody spins.
+    """
+
+    def __init__(self, rate: float = 0.0) -> None:
+        self._lock = threading.Lock()
+        self.set_rate(rate)
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self.rate = max(0.0, float(rate))
+            self.burst = max(1.0, self.rate * BURST_SECONDS)
+            self.tokens = self.burst
+            self.stamp = time.monotonic()
+
+    def reserve(self, n: float) -> float:
+        """
+        Take n tokens; return how long the caller must sleep to stay within the rate.
+        """
+        with self._lock:
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            self.tokens -= n
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class Throttle:
+    """
+    max_mbps + max_files_per_sec limits (0 = unlimited) for a run or one of its entries.
+    An entry's throttle has the run's as parent: both limits apply, the tighter one wins.
+    Limits can be changed with configure() while copies are running (daemon reload, GUI);
+    the new rate applies from the next chunk.
+    """
+
+    def __init__(self, max_mbps: float = 0.0, max_files_per_sec: float = 0.0, parent: Throttle | None = None) -> None:
+        self.parent = parent
+        self._bytes = TokenBucket()
+        self._files = TokenBucket()
+        self._children: dict[tuple[str, str], Throttle] = {}
+        self._lock = threading.Lock()
+        self.configure(max_mbps, max_files_per_sec)
+
+    def configure(self, max_mbps: float, max_files_per_sec: float) -> None:
+        self.max_mbps = max(0.0, float(max_mbps))
+        self.max_files_per_sec = max(0.0, float(max_files_per_sec))
+        self._bytes.set_rate(self.max_mbps * BYTES_PER_MBIT)
+        self._files.set_rate(self.max_files_per_sec)
+
+    def _chain(self) -> list[Throttle]:
+        chain: list[Throttle] = []
+        node: Throttle | None = self
+        while node is not None:
+            chain.append(node)
+            node = node.parent
+        return chain
+
+    @property
+    def limits_bytes(self) -> bool:
+        return any(t.max_mbps > 0 for t in self._chain())
+
+    @property
+    def limits_files(self) -> bool:
+        return any(t.max_files_per_sec > 0 for t in self._chain())
+
+    def pace(self, nbytes: int) -> None:
+        """
+        Account for nbytes just transferred, sleeping as long as the tightest limit requires.
+        """
+        wait = max(t._bytes.reserve(nbytes) for t in self._chain())
+        if wait > 0:
+            time.sleep(wait)
+
+    def file(self) -> None:
+        """
+        Call before starting each file.
+        """
+        wait = max(t._files.reserve(1) for t in self._chain())
+        if wait > 0:
+            time.sleep(wait)
+
+    def pacer(self) -> Pace | None:
+        """
+        pace, or None when no byte limit is set (copies then run without any per-chunk hook).
+        Read once per file, so a limit set at runtime applies from the next file on the fast paths.
+        """
+        return self.pace if self.limits_bytes else None
+
+    def for_entry(self, entry: Entry) -> Throttle:
+        """
+        The child throttle of an entry (created with the entry's limits on first use and
+        kept for the life of this throttle, so runtime changes stick).
+        """
+        key = (entry.name, str(entry.source))
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = Throttle(entry.max_mbps, entry.max_files_per_sec, parent=self)
+            return child
+
+
+def entry_throttle(run: Throttle | None, entry: Entry) -> Throttle | None:
+    """
+    Throttle for one entry's copies: the run's child when there is a run throttle,
+    a standalone one when only the entry has limits, None when nothing is limited.
+    """
+    if run is not None:
+        return run.for_entry(entry)
+    if entry.max_mbps > 0 or entry.max_files_per_sec > 0:
+        return Throttle(entry.max_mbps, entry.max_files_per_sec)
+    return None
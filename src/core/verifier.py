@@ -0,0 +1,143 @@
+# ⌘
+#
+#  /fileknight/core/verifier.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from lzma import LZMAError
+from pathlib import Path
+
+from core.copier import compute_destination_paths
+from core.compression import dst_names, hash_decompressed, resolve_codec
+from core.filters import entry_filter
+from core.hashing import FAST_ALGORITHM, hash_file
+from core.metrics import timed
+from core.models import CopyResult, Entry, RunOptions
+from core.pack import pack_dir, verify_pack
+from core.procpool import hash_many
+from core.rotate import list_rotations
+from core.scanner import record_from_stat, walk
+from core.snapshot import latest_manifest, read_manifest, store_dir, verify_blobs
+
+
+def _same_content(src: Path, dst: Path, compressed: bool = False) -> bool:
+    try:
+        if compressed:
+            return hash_file(src, FAST_ALGORITHM) == hash_decompressed(dst, FAST_ALGORITHM)
+        if src.stat().st_size != dst.stat().st_size:
+            return False
+        return hash_file(src, FAST_ALGORITHM) == hash_file(dst, FAST_ALGORITHM)
+    except (FileNotFoundError, EOFError, LZMAError, gzip.BadGzipFile):
+        return False
+
+
+def _same_files(pairs: list[tuple[Path, Path]], sizes: list[int], processes: int | None, threads: int) -> list[bool]:
+    """
+    _same_content for uncompressed pairs, in one batch: sizes are checked first, then both sides
+    of the pairs left are hashed together (core.procpool: worker processes on big trees).
+    """
+    ok = [False] * len(pairs)
+    todo: list[int] = []
+    for i, (_src, dst) in enumerate(pairs):
+        try:
+            if dst.stat().st_size == sizes[i]:
+                todo.append(i)
+        except OSError:
+            pass
+    paths = [pairs[i][0] for i in todo] + [pairs[i][1] for i in todo]
+    digests = hash_many(paths, [sizes[i] for i in todo] * 2, FAST_ALGORITHM, processes, threads)
+    for n, i in enumerate(todo):
+        ok[i] = digests[n] is not None and digests[n] == digests[len(todo) + n]
+    return ok
+
+
+def _verify_snapshot(entry: Entry, destination_root: Path, result: CopyResult, processes: int | None) -> None:
+    manifest = latest_manifest(destination_root, entry.name)
+    if manifest is None:
+        raise FileNotFoundError(f"No snapshots found for entry: {entry.name}")
+    result.destination = manifest
+
+    objects = store_dir(destination_root)
+    files = read_manifest(manifest).get("files", {})
+    checks = verify_blobs(
+        objects, [meta["digest"] for meta in files.values()], [int(meta.get("size", 0)) for meta in files.values()],
+        processes, max(1, entry.workers),
+    )
+    for rel, ok in zip(files, checks):
+        result.verified += 1
+        if not ok:
+            result.verify_failed.append(rel)
+
+
+def verify_item(entry: Entry, destination_root: Path, dry_run: bool, options: RunOptions) -> CopyResult:
+    """
+    Check an existing backup without copying anything (--verify-only).
+    copy/mirror: every source file must exist in the destination with identical content
+    (compressed files are decompressed to compare).
+    snapshot: every object referenced by the latest snapshot must still match its digest.
+    pack: every source file must be in the pack index, and its packed data identical.
+    rotate: like copy, against the newest snapshot.
+    Same signature as copy_item so it can be passed to run_entries; dry_run is ignored.
+    """
+    if not entry.source.exists():
+        raise FileNotFoundError(f"Source does not exist: {entry.source}")
+
+    dst_dir, dst_item = compute_destination_paths(entry, destination_root)
+    if entry.mode == "rotate":
+        rotations = list_rotations(dst_dir)
+        if not rotations:
+            raise FileNotFoundError(f"No snapshots found for entry: {entry.name}")
+        dst_item = dst_dir / rotations[-1] / entry.source.name
+    result = CopyResult(destination=dst_item)
+
+    if entry.mode == "snapshot":
+        with timed(result.timings, "verify"):
+            _verify_snapshot(entry, destination_root, result, options.hash_processes)
+        return result
+
+    with timed(result.timings, "scan"):
+        if entry.source.is_dir():
+            src_root, dst_root = entry.source, dst_item
+            files = {
+                rel: rec for rel, rec in walk(entry.source, entry.follow_symlinks, entry_filter(entry))
+                if not rec.is_dir
+            }
+        else:
+            src_root, dst_root = entry.source.parent, dst_item.parent
+            files = {entry.source.name: record_from_stat(entry.source.stat())}
+        codec = resolve_codec(entry.compression)
+        names = dst_names(files, codec, entry.compress_min_size, entry.compress_skip) if codec else {}
+        rels = list(files)
+        pairs = [(src_root / rel, dst_root / names.get(rel, rel), rel in names) for rel in rels]
+
+    if entry.mode == "pack":
+        result.destination = pack_dir(destination_root, entry.name)
+        with timed(result.timings, "verify"):
+            result.verify_failed.extend(verify_pack(result.destination, src_root, rels))
+        result.verified += len(rels)
+        return result
+
+    with timed(result.timings, "verify"):
+        plain = [i for i, (_src, _dst, compressed) in enumerate(pairs) if not compressed]
+        checks = [False] * len(pairs)
+        same = _same_files(
+            [pairs[i][:2] for i in plain], [files[rels[i]].size for i in plain], options.hash_processes,
+            max(1, entry.workers),
+        )
+        for i, ok in zip(plain, same):
+            checks[i] = ok
+        packed = [i for i, (_src, _dst, compressed) in enumerate(pairs) if compressed]
+        with ThreadPoolExecutor(max_workers=max(1, entry.workers)) as pool:  # decompression: threads
+            for i, ok in zip(packed, pool.map(lambda i: _same_content(*pairs[i]), packed)):
+                checks[i] = ok
+    for rel, ok in zip(rels, checks):
+        result.verified += 1
+        if not ok:
+            result.verify_failed.append(rel)
+    return result
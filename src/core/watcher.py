@@ -0,0 +1,242 @@
+# ⌘
+#
+#  /fileknight/core/watcher.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+from abc import ABC, abstractmethod
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from core.filters import PathFilter
+from core.models import FileRecord
+from core.scanner import scan_tree, walk
+
+# linux/inotify.h
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 256 * 1024
+
+
+class Watcher(ABC):
+    """
+    Reports paths that changed below a set of roots.
+    poll() returns the changed absolute paths seen within `timeout` seconds;
+    `overflowed` is set when events were lost and the caller should rescan everything.
+    """
+
+    overflowed: bool = False
+
+    @abstractmethod
+    def poll(self, timeout: float) -> set[Path]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher(Watcher):
+    """
+    Linux inotify through ctypes: one watch per directory, new directories are watched as they appear.
+    A single-file root only watches the folder holding it (not the folder's subtree), and only
+    events for that file are reported. filters (one per root, or None) prune the folders their
+    exclude patterns leave out, so trees like node_modules or .git don't use up inotify watches.
+    """
+
+    def __init__(self, roots: list[Path], filters: list[PathFilter | None] | None = None) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: dict[int, Path] = {}
+        self._only: dict[int, set[str]] = {}  # wd -> the file names reported (single-file roots); absent = all
+        self.overflowed = False
+        self._roots = list(zip(roots, filters or [None] * len(roots)))
+        try:
+            for root, path_filter in self._roots:
+                self._watch_tree(root, path_filter)
+        except BaseException:
+            self.close()
+            raise
+
+    def _add_watch(self, path: Path) -> int | None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return None  # gone already or unreadable; a parent event still reports it
+            raise OSError(err, f"inotify_add_watch failed for {path}")  # e.g. ENOSPC: watch limit
+        self._paths[wd] = path
+        return wd
+
+    def _watch_file(self, path: Path) -> None:
+        known = set(self._paths)
+        wd = self._add_watch(path.parent)
+        if wd is None:
+            return
+        if wd not in known:
+            self._only[wd] = {path.name}
+        elif wd in self._only:
+            self._only[wd].add(path.name)
+        # else: the folder is already watched whole, as part of a directory root
+
+    def _watch_tree(self, root: Path, path_filter: PathFilter | None = None, within: str = "") -> None:
+        """
+        Watch the folder root/within and every folder below it that path_filter lets through.
+        """
+        if not root.is_dir():
+            self._watch_file(root)
+            return
+        top = root / within if within else root
+        if path_filter is not None and path_filter.locate(root, within, True) is None:
+            return
+        dirs = [top] + [top / rel for rel, rec in walk(top, False, path_filter, within) if rec.is_dir]
+        for path in dirs:
+            wd = self._add_watch(path)
+            if wd is not None:
+                self._only.pop(wd, None)  # also inside a directory root: report everything
+
+    def poll(self, timeout: float) -> set[Path]:
+        changed: set[Path] = set()
+        ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not ready:
+            return changed
+
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            base = self._paths.get(wd)
+            if base is None:
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                self._only.pop(wd, None)
+                continue
+
+            only = self._only.get(wd)
+            if only is not None:
+                name = os.fsdecode(raw_name)
+                if not raw_name:  # the folder itself was moved or deleted
+                    changed.update(base / file_name for file_name in only)
+                elif name in only:
+                    changed.add(base / name)
+                continue
+            path = base / os.fsdecode(raw_name) if raw_name else base
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_new_dir(path)
+        return changed
+
+    def _watch_new_dir(self, path: Path) -> None:
+        for root, path_filter in self._roots:
+            if root.is_dir() and path.is_relative_to(root):
+                self._watch_tree(root, path_filter, path.relative_to(root).as_posix())
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(Watcher):
+    """
+    Fallback for platforms without inotify (or when the watch limit is hit):
+    rescans every root each `interval` seconds and reports what differs.
+    """
+
+    def __init__(
+        self, roots: list[Path], interval: float = 30.0, filters: list[PathFilter | None] | None = None
+    ) -> None:
+        self.roots = roots
+        self.interval = interval
+        self.overflowed = False
+        self._filters = dict(zip(roots, filters or [None] * len(roots)))
+        self._state = {root: self._scan(root) for root in roots}
+        self._next = time.monotonic() + interval
+
+    def _scan(self, root: Path) -> dict[str, FileRecord]:
+        if root.is_dir():
+            return scan_tree(root, path_filter=self._filters.get(root))
+        try:
+            st = root.stat()
+        except FileNotFoundError:
+            return {}
+        return {"": FileRecord(False, st.st_size, st.st_mtime_ns, st.st_ino)}
+
+    def poll(self, timeout: float) -> set[Path]:
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(0.0, timeout))
+            return set()
+        time.sleep(max(0.0, wait))
+        self._next = time.monotonic() + self.interval
+
+        changed: set[Path] = set()
+        for root in self.roots:
+            before = self._state[root]
+            after = self._scan(root)
+            for rel in before.keys() | after.keys():
+                old, new = before.get(rel), after.get(rel)
+                if old is None or new is None or old.is_dir != new.is_dir:
+                    changed.add(root / rel if rel else root)
+                elif not new.is_dir and old[:3] != new[:3]:  # a dir's own mtime just echoes its children
+                    changed.add(root / rel if rel else root)
+            self._state[root] = after
+        return changed
+
+
+def make_watcher(
+    roots: list[Path], poll_interval: float = 30.0, filters: list[PathFilter | None] | None = None
+) -> tuple[Watcher, str | None]:
+    """
+    inotify on Linux, polling everywhere else or when inotify can't be set up.
+    filters (one per root) leave excluded folders unwatched (core.filters.watch_filter).
+    Returns (watcher, why inotify could not be used); the reason is None when it is used or not on Linux.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots, filters), None
+        except (OSError, AttributeError) as ex:
+            return PollingWatcher(roots, poll_interval, filters), str(ex)
+    return PollingWatcher(roots, poll_interval, filters), None
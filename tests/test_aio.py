@@ -0,0 +1,78 @@
+# ⌘
+#
+#  /fileknight/tests/test_aio.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core.copier import copy_item
+from core.manifest import INDEX_FILE_NAME
+from core.models import EngineSettings, Entry, RunOptions
+
+
+def _fixture(src):
+    (src / "docs" / "deep" / "er").mkdir(parents=True)
+    (src / "empty").mkdir()
+    (src / "top.txt").write_text("top")
+    (src / "docs" / "a.txt").write_text("a" * 1000)
+    (src / "docs" / "gone.txt").write_text("soon deleted")
+    (src / "docs" / "deep" / "er" / "b.bin").write_bytes(os.urandom(200_000))
+    (src / "old").mkdir()
+    (src / "old" / "x.txt").write_text("x")
+
+
+def _change(src):
+    (src / "docs" / "a.txt").write_text("changed")
+    os.utime(src / "docs" / "a.txt", ns=(1, 1))
+    (src / "docs" / "gone.txt").unlink()
+    (src / "old" / "x.txt").unlink()
+    (src / "old").rmdir()
+    (src / "docs" / "new.txt").write_text("new")
+
+
+def _tree(root):
+    state = {}
+    for folder, dirs, files in os.walk(root):
+        for name in dirs:
+            state[os.path.relpath(os.path.join(folder, name), root)] = None
+        for name in files:
+            if name == INDEX_FILE_NAME:
+                continue
+            path = os.path.join(folder, name)
+            with open(path, "rb") as f:
+                state[os.path.relpath(path, root)] = (f.read(), os.stat(path).st_mtime_ns)
+    return state
+
+
+def _counts(result):
+    return (result.copied, result.updated, result.skipped, result.deleted, result.bytes_copied, result.verified)
+
+
+@pytest.mark.parametrize("mode", ["mirror", "copy"])
+def test_async_engine_matches_the_thread_pool(tmp_path, mode):
+    src = tmp_path / "src"
+    _fixture(src)
+    entry = Entry("E", src, mode, workers=4, verify=True)
+    engines = {
+        "threads": (tmp_path / "threads", RunOptions()),
+        "async": (tmp_path / "async", RunOptions(engine=EngineSettings(name="async", data_in_flight=3))),
+    }
+
+    for step in (None, _change):
+        if step is not None:
+            step(src)
+        results = {name: copy_item(entry, root, False, options) for name, (root, options) in engines.items()}
+        assert _counts(results["async"]) == _counts(results["threads"])
+        assert results["async"].verify_failed == results["threads"].verify_failed == []
+        assert _tree(tmp_path / "async" / "E") == _tree(tmp_path / "threads" / "E")
+
+    # the second run really did update and (in mirror mode) delete
+    assert results["threads"].updated == 1
+    assert results["threads"].deleted == (2 if mode == "mirror" else 0)
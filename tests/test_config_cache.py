@@ -0,0 +1,64 @@
+# ⌘
+#
+#  /fileknight/tests/test_config_cache.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from core.config_cache import cache_path, load_compiled, read_cache
+from core.config_manager import validate_entries
+
+
+def _config(tmp_path):
+    path = tmp_path / "config.json"
+    cfg = {
+        "destination_root": str(tmp_path / "dst"),
+        "language": "en",
+        "entries": [
+            {"name": "docs", "source": str(tmp_path / "docs"), "mode": "rotate", "exclude": ["*.tmp", "!keep.tmp"]},
+            {"name": "pics", "source": str(tmp_path / "pics"), "mode": "copy", "compression": "gzip"},
+        ],
+    }
+    path.write_text(json.dumps(cfg), encoding="utf-8")
+    return path, cfg
+
+
+def test_cached_entries_match_a_fresh_parse(tmp_path):
+    path, cfg = _config(tmp_path)
+    load_compiled(path)
+
+    cached = read_cache(path)
+
+    assert cached is not None
+    assert cached.entry_list() == validate_entries(cfg)
+    assert [e.name for e in cached.entry_list("pics")] == ["pics"]
+    assert json.loads(cache_path(path).read_text(encoding="utf-8"))["version"] >= 1  # plain JSON
+
+
+def test_changed_config_is_recompiled(tmp_path):
+    path, cfg = _config(tmp_path)
+    load_compiled(path)
+    cfg["entries"].pop()
+    path.write_text(json.dumps(cfg) + " ", encoding="utf-8")
+
+    assert read_cache(path) is None
+    assert [e.name for e in load_compiled(path).entry_list()] == ["docs"]
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_cache_writable_by_others_is_ignored(tmp_path):
+    path, _cfg = _config(tmp_path)
+    load_compiled(path)
+    cache = cache_path(path)
+    assert cache.stat().st_mode & 0o077 == 0
+
+    cache.chmod(0o666)
+    assert read_cache(path) is None
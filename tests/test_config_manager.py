@@ -0,0 +1,18 @@
+# ⌘
+#
+#  /fileknight/tests/test_config_manager.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+from core.config_manager import parse_delta_threshold
+
+
+def test_delta_threshold_is_off_unless_set():
+    assert parse_delta_threshold(None) == 0
+    assert parse_delta_threshold("lots") == 0
+    assert parse_delta_threshold(-5) == 0
+    assert parse_delta_threshold(64) == 64 * 1024 * 1024
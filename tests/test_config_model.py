@@ -0,0 +1,57 @@
+# ⌘
+#
+#  /fileknight/tests/test_config_model.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import json
+
+from core.config_manager import validate_entries
+from core.config_model import ConfigModel
+
+
+def _cfg(tmp_path):
+    return {
+        "_meta": {"version": 1},
+        "destination_root": str(tmp_path / "dst"),
+        "entries": [
+            {"name": "b", "source": str(tmp_path / "b"), "mode": "copy"},
+            {"source": str(tmp_path / "nameless")},
+            {"name": "a", "source": str(tmp_path / "a"), "mode": "mirror"},
+            {"name": "b", "source": str(tmp_path / "b2"), "mode": "copy"},
+            {"name": "c", "source": str(tmp_path / "c"), "mode": "snapshot"},
+        ],
+    }
+
+
+def test_entries_keep_file_order_like_validate_entries(tmp_path):
+    cfg = _cfg(tmp_path)
+    model = ConfigModel(tmp_path / "config.json", json.loads(json.dumps(cfg)))
+
+    assert model.names() == ["b", "a", "c"]
+    assert [(e.name, e.source) for e in model.entries()] == [(e.name, e.source) for e in validate_entries(cfg)]
+    assert model.to_config()["entries"] == cfg["entries"]
+
+
+def test_edits_keep_order_and_save(tmp_path):
+    path = tmp_path / "config.json"
+    model = ConfigModel(path, _cfg(tmp_path))
+    model.entries()
+
+    assert model.upsert_entry("a", str(tmp_path / "a2"), "copy") is False
+    assert model.upsert_entry("d", str(tmp_path / "d"), "bogus") is True
+    assert model.remove_entry("b") is True
+    assert model.remove_entry("b") is False
+
+    assert model.save() is True
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["_meta"] == {"version": 1}
+    assert [item.get("name") for item in saved["entries"]] == [None, "a", "c", "d"]
+    assert saved["entries"][3]["mode"] == "mirror"
+    assert [e.name for e in model.entries()] == [e.name for e in validate_entries(saved)]
+    assert model.entries()[0].source == tmp_path / "a2"
+    assert model.save() is False
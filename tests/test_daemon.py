@@ -0,0 +1,41 @@
+# ⌘
+#
+#  /fileknight/tests/test_daemon.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import threading
+
+from core import daemon
+from core.models import DaemonSettings, Entry, RunOptions
+from core.watcher import Watcher
+
+
+def test_watcher_is_set_up_before_the_first_full_run(tmp_path, monkeypatch):
+    calls: list[str] = []
+    stop = threading.Event()
+
+    class FakeWatcher(Watcher):
+        def poll(self, timeout):
+            stop.set()
+            return set()
+
+    def make_watcher(roots, poll_interval, filters):
+        calls.append("watch")
+        return FakeWatcher(), None
+
+    def run_entries(entries, roots, **kwargs):
+        calls.append("full run")
+        return []
+
+    monkeypatch.setattr(daemon, "make_watcher", make_watcher)
+    monkeypatch.setattr(daemon, "run_entries", run_entries)
+    entry = Entry("D", tmp_path, "mirror")
+
+    daemon.run_daemon([entry], [tmp_path / "dst"], 1, RunOptions(), DaemonSettings(), lambda *a: None, stop)
+
+    assert calls == ["watch", "full run"]
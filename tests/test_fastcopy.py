@@ -0,0 +1,52 @@
+# ⌘
+#
+#  /fileknight/tests/test_fastcopy.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core import fastcopy
+
+
+def _zero(*args, **kwargs) -> int:
+    return 0
+
+
+@pytest.fixture(autouse=True)
+def _forget_unsupported():
+    fastcopy._unsupported.clear()
+    yield
+    fastcopy._unsupported.clear()
+
+
+def test_kernel_copy_that_moves_nothing_falls_back(tmp_path, monkeypatch):
+    src = tmp_path / "src.bin"
+    dst = tmp_path / "dst.bin"
+    data = os.urandom(200_000)
+    src.write_bytes(data)
+    monkeypatch.setattr(fastcopy, "STRATEGY_CHAIN", [
+        (fastcopy.COPY_FILE_RANGE, fastcopy._copy_file_range),
+        (fastcopy.SENDFILE, fastcopy._sendfile),
+    ])
+    if hasattr(os, "copy_file_range"):
+        monkeypatch.setattr(os, "copy_file_range", _zero)
+    if hasattr(os, "sendfile"):
+        monkeypatch.setattr(os, "sendfile", _zero)
+
+    used = fastcopy.copy_file(src, dst)
+
+    assert used == fastcopy.READWRITE
+    assert dst.read_bytes() == data
+
+
+def test_kernel_copy_that_stops_short_is_an_error(monkeypatch):
+    calls = iter([10, 0])
+    with pytest.raises(OSError):
+        fastcopy._kernel_loop(lambda *args: next(calls), 0, 1, 100)
@@ -0,0 +1,72 @@
+# ⌘
+#
+#  /fileknight/tests/test_filters.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import pytest
+
+from core.filters import IGNORE_FILE_NAME, PathFilter
+from core.scanner import scan_tree
+
+# (include, exclude, rel, is_dir, kept)
+CASES = [
+    # anchoring: a pattern with a "/" matches from the base folder, one without at any depth
+    ((), ("/build",), "build", True, False),
+    ((), ("/build",), "src/build", True, True),
+    ((), ("build",), "src/build", True, False),
+    ((), ("docs/*.md",), "docs/a.md", False, False),
+    ((), ("docs/*.md",), "x/docs/a.md", False, True),
+    ((), ("docs/*.md",), "docs/sub/a.md", False, True),  # * stops at "/"
+    ((), ("*.md",), "docs/sub/a.md", False, False),
+    # **
+    ((), ("**/cache",), "cache", True, False),
+    ((), ("**/cache",), "a/b/cache", True, False),
+    ((), ("logs/**",), "logs", True, True),  # everything inside, not the folder itself
+    ((), ("logs/**",), "logs/x/y.txt", False, False),
+    ((), ("a/**/b",), "a/b", False, False),
+    ((), ("a/**/b",), "a/x/y/b", False, False),
+    ((), ("a/**/b",), "x/a/b", False, True),
+    # trailing "/": folders only
+    ((), ("tmp/",), "tmp", True, False),
+    ((), ("tmp/",), "tmp", False, True),
+    ((), ("tmp/",), "x/tmp", True, False),
+    # ! negation: the last matching pattern decides
+    ((), ("*.log", "!keep.log"), "a.log", False, False),
+    ((), ("*.log", "!keep.log"), "d/keep.log", False, True),
+    ((), ("!keep.log", "*.log"), "keep.log", False, False),
+    # nothing is re-included below an excluded folder
+    ((), ("build/", "!build/keep.txt"), "build/keep.txt", False, False),
+    ((), ("build/", "!keep.txt"), "build/keep.txt", False, False),
+    ((), ("build/*", "!build/keep.txt"), "build/keep.txt", False, True),  # the folder itself is not excluded
+    # include keeps only what it matches; a matched folder selects everything below
+    (("*.py",), (), "a/b.py", False, True),
+    (("*.py",), (), "a/b.txt", False, False),
+    (("src/",), (), "src/x/y.txt", False, True),
+    (("src/",), (), "other/y.txt", False, False),
+    (("*.py",), ("tests/",), "tests/t.py", False, False),  # exclude wins over include
+]
+
+
+@pytest.mark.parametrize("include, exclude, rel, is_dir, kept", CASES)
+def test_pattern_table(tmp_path, include, exclude, rel, is_dir, kept):
+    path_filter = PathFilter(include, exclude)
+    assert (path_filter.locate(tmp_path, rel, is_dir) is not None) is kept
+
+
+def test_walk_prunes_excluded_folders_and_honours_ignore_files(tmp_path):
+    for rel in ("build/keep.txt", "build/out.o", "src/a.py", "src/a.log", "src/sub/b.log", "src/sub/c.py"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+    (tmp_path / IGNORE_FILE_NAME).write_text("*.log\n")
+    (tmp_path / "src" / "sub" / IGNORE_FILE_NAME).write_text("!b.log\n")  # deeper file takes precedence
+
+    index = scan_tree(tmp_path, path_filter=PathFilter((), ("build/", "!build/keep.txt")))
+
+    assert sorted(rel for rel in index if IGNORE_FILE_NAME not in rel) == [
+        "src", "src/a.py", "src/sub", "src/sub/b.log", "src/sub/c.py",
+    ]
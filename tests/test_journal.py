@@ -0,0 +1,95 @@
+# ⌘
+#
+#  /fileknight/tests/test_journal.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import filecmp
+import os
+import threading
+
+import pytest
+
+from core import journal as journal_module
+from core.copier import copy_item
+from core.journal import JOURNAL_FILE_NAME
+from core.models import Entry, RunOptions
+from core.progress import CancelledError
+
+
+def test_resume_copies_only_what_the_interrupted_run_did_not(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    for i in range(30):
+        path = src / f"d{i % 3}" / f"f{i}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"file {i}" * 100)
+    entry = Entry("J", src, "mirror")
+    cancel = threading.Event()
+
+    def progress(p):
+        if p.files_done >= 10:
+            cancel.set()
+
+    with pytest.raises(CancelledError):
+        copy_item(entry, dst, False, RunOptions(cancel=cancel, progress=progress))
+    journal = dst / "J" / JOURNAL_FILE_NAME
+    done = len(journal.read_text(encoding="utf-8").splitlines()) - 1  # minus the header
+    assert 10 <= done < 30
+
+    result = copy_item(entry, dst, False, RunOptions(resume=True))
+
+    assert result.plan.resumed
+    assert result.copied == 30 - done
+    assert result.skipped == done
+    assert not journal.exists()
+    assert not list(dst.rglob("*.part"))
+    match, mismatch, errors = filecmp.cmpfiles(
+        src, dst / "J" / "src", [p.relative_to(src).as_posix() for p in src.rglob("*.txt")], shallow=False
+    )
+    assert (len(match), mismatch, errors) == (30, [], [])
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to name fsynced descriptors")
+def test_files_are_durable_before_they_are_journaled(tmp_path, monkeypatch):
+    tmp_path = tmp_path.resolve()  # compared with the paths /proc reports
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_text("a")
+    (src / "sub" / "b.txt").write_text("b")
+    journal_file = dst / "J" / JOURNAL_FILE_NAME
+    events: list[tuple[str, ...]] = []
+    real_fsync, real_replace = os.fsync, os.replace
+
+    def fsync(fd):
+        target = os.readlink(f"/proc/self/fd/{fd}")
+        recorded = journal_file.read_text(encoding="utf-8") if journal_file.is_file() else ""
+        events.append(("fsync", target, recorded))
+        real_fsync(fd)
+
+    def replace(a, b):
+        events.append(("replace", str(a), str(b)))
+        real_replace(a, b)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    monkeypatch.setattr(os, "replace", replace)
+    monkeypatch.setattr(journal_module, "SYNC_INTERVAL", 0.0)  # write the records after every file
+
+    result = copy_item(Entry("J", src, "mirror"), dst, False)
+
+    assert result.copied == 2
+    assert result.timings["fsync"] > 0
+    for rel in ("a.txt", "sub/b.txt"):
+        final = dst / "J" / "src" / rel
+        moves = [i for i, e in enumerate(events) if e[0] == "replace" and e[2] == str(final)]
+        assert len(moves) == 1
+        tmp = events[moves[0]][1]
+        data_synced = [i for i, e in enumerate(events) if e[:2] == ("fsync", tmp)]
+        assert data_synced and data_synced[0] < moves[0]
+        dir_synced = [
+            e for e in events[moves[0]:] if e[:2] == ("fsync", str(final.parent)) and f'{{"rel":"{rel}"' not in e[2]
+        ]
+        assert dir_synced  # the folder was flushed before the journal named the file
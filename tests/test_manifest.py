@@ -0,0 +1,46 @@
+# ⌘
+#
+#  /fileknight/tests/test_manifest.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import sqlite3
+
+from core.manifest import index_path, load_index, save_index
+from core.models import FileRecord
+
+
+def test_index_round_trip_without_inodes(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    dst.mkdir()
+    path = index_path(dst)
+    save_index(path, src, dst, [("a.txt", FileRecord(False, 3, 123, 987, "abc"))], [], replace=True)
+
+    assert load_index(path, src, dst) == {"a.txt": FileRecord(False, 3, 123, 0, "abc")}
+
+
+def test_schema_1_index_is_dropped_and_rebuilt(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    dst.mkdir()
+    path = index_path(dst)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executescript(
+            "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE files (path TEXT PRIMARY KEY, is_dir INTEGER NOT NULL, size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL, digest TEXT);"
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("version", "1"), ("source", str(src)), ("target", str(dst))],
+        )
+        conn.execute("INSERT INTO files VALUES ('old.txt', 0, 1, 1, 42, NULL)")
+    conn.close()
+
+    assert load_index(path, src, dst) is None
+    save_index(path, src, dst, [("new.txt", FileRecord(False, 2, 5, 7))], [], replace=True)
+    assert load_index(path, src, dst) == {"new.txt": FileRecord(False, 2, 5, 0)}
@@ -0,0 +1,47 @@
+# ⌘
+#
+#  /fileknight/tests/test_metrics.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import threading
+import time
+
+from core.copier import copy_item
+from core.metrics import timed
+from core.models import Entry
+
+
+def test_timed_adds_up_across_threads(monkeypatch):
+    clock = iter(range(0, 10_000, 1))
+    monkeypatch.setattr(time, "perf_counter", lambda: next(clock))
+    timings: dict[str, float] = {}
+
+    def work():
+        for _ in range(100):
+            with timed(timings, "fsync"):
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert timings["fsync"] >= 800  # every block counted at least one tick; none lost to a race
+
+
+def test_copy_reports_fsync_and_commit_phases(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(5):
+        (src / f"{i}.txt").write_text(str(i))
+
+    result = copy_item(Entry("M", src, "mirror", workers=2), tmp_path / "dst", False)
+
+    assert result.timings["fsync"] > 0
+    assert "commit" in result.timings
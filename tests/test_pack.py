@@ -0,0 +1,85 @@
+# ⌘
+#
+#  /fileknight/tests/test_pack.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+import stat
+
+import pytest
+
+from core.models import FileRecord
+from core.pack import (
+    PackPlan,
+    _read_stream,
+    commit_pack,
+    read_pack_index,
+    restore_pack,
+    write_segments,
+)
+
+LONG_DIR = "a-folder-name-long-enough-to-need-pax-headers-" * 2
+SIZES = {
+    "empty.bin": 0,
+    "one.bin": 1,
+    "block-less-one.bin": 511,
+    "block.bin": 512,
+    "block-plus-one.bin": 513,
+    "big.bin": 300_000,
+    f"{LONG_DIR}/{'ação-ünïcode-' * 6}.txt": 1500,  # > 100 bytes and non-ASCII: PAX path header
+}
+
+
+def _tree(root):
+    index = {}
+    for i, (rel, size) in enumerate(SIZES.items()):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(bytes((i * 31 + n) % 251 for n in range(size)))
+        st = path.stat()
+        index[rel] = FileRecord(False, st.st_size, st.st_mtime_ns, st.st_ino, mode=stat.S_IMODE(st.st_mode))
+    st = (root / LONG_DIR).stat()
+    index[LONG_DIR] = FileRecord(True, 0, st.st_mtime_ns, st.st_ino)
+    return index
+
+
+@pytest.mark.parametrize("codec", [None, "gzip"])
+def test_pack_round_trip_by_index_offsets(tmp_path, codec):
+    src, folder, target = tmp_path / "src", tmp_path / "pack", tmp_path / "restored"
+    src_index = _tree(src)
+    rels = sorted(rel for rel, rec in src_index.items() if not rec.is_dir)
+
+    # a small segment size spreads the files over several segments
+    state = write_segments(folder, src, src_index, rels, 1, codec, segment_size=64 * 1024, verify=True)
+    assert state.failed == []
+    assert len(state.segments) > 1
+    commit_pack(folder, "docs", src, codec, src_index, PackPlan(), state)
+
+    files = read_pack_index(folder)["files"]
+    assert sorted(files) == rels
+    for rel, meta in files.items():
+        with _read_stream(folder / meta["segment"]) as stream:
+            stream.seek(meta["offset"])
+            assert stream.read(meta["size"]) == (src / rel).read_bytes(), rel
+
+    assert restore_pack(folder, target) == len(rels)
+    for rel in rels:
+        assert (target / rel).read_bytes() == (src / rel).read_bytes(), rel
+        assert os.stat(target / rel).st_mtime_ns == src_index[rel].mtime_ns
+
+
+def test_restore_one_file_from_the_pack(tmp_path):
+    src, folder, target = tmp_path / "src", tmp_path / "pack", tmp_path / "restored"
+    src_index = _tree(src)
+    rels = sorted(rel for rel, rec in src_index.items() if not rec.is_dir)
+    state = write_segments(folder, src, src_index, rels, 1, None)
+    commit_pack(folder, "docs", src, None, src_index, PackPlan(), state)
+
+    assert restore_pack(folder, target, only="block-plus-one.bin") == 1
+    assert [p.name for p in target.iterdir()] == ["block-plus-one.bin"]
+    assert (target / "block-plus-one.bin").read_bytes() == (src / "block-plus-one.bin").read_bytes()
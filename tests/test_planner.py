@@ -0,0 +1,57 @@
+# ⌘
+#
+#  /fileknight/tests/test_planner.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core.copier import copy_item
+from core.models import Entry, RunOptions
+
+
+def _counts(result):
+    return result.copied, result.updated, result.skipped, result.deleted, result.bytes_copied
+
+
+def _source(src):
+    (src / "docs" / "old").mkdir(parents=True)
+    (src / "a.txt").write_text("a")
+    (src / "docs" / "b.txt").write_text("b" * 100)
+    (src / "docs" / "gone.txt").write_text("gone")
+    (src / "docs" / "old" / "c.txt").write_text("c")
+
+
+def _change(src):
+    (src / "a.txt").write_text("changed a")
+    os.utime(src / "a.txt", ns=(1, 1))
+    (src / "docs" / "gone.txt").unlink()
+    (src / "docs" / "old" / "c.txt").unlink()
+    (src / "docs" / "old").rmdir()
+    (src / "docs" / "new.txt").write_text("new")
+
+
+@pytest.mark.parametrize("mode", ["mirror", "copy", "pack"])
+@pytest.mark.parametrize("rescan", [False, True])
+def test_dry_run_counts_match_the_real_run(tmp_path, mode, rescan):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _source(src)
+    entry = Entry("P", src, mode)
+    options = RunOptions(rescan=rescan)
+
+    for step in (None, _change):
+        if step is not None:
+            step(src)
+        planned = copy_item(entry, dst, True, options)
+        done = copy_item(entry, dst, False, options)
+        assert _counts(planned) == _counts(done)
+
+    assert done.updated == 1
+    assert done.copied == 1
+    assert done.deleted == {"mirror": 2, "copy": 0, "pack": 2}[mode]
@@ -0,0 +1,64 @@
+# ⌘
+#
+#  /fileknight/tests/test_procpool.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+
+from core import procpool, snapshot
+from core.hashing import STORED_ALGORITHM, hash_file
+from core.models import CopyResult
+from core.scanner import scan_tree
+
+
+def _many_processes(monkeypatch):
+    monkeypatch.setattr(procpool, "BYTES_PER_PROCESS", 1)
+    monkeypatch.setattr(procpool, "FILES_PER_PROCESS", 1)
+    monkeypatch.setattr(procpool, "usable_cpus", lambda: 2)
+
+
+def test_hash_many_in_processes_matches_hash_file(tmp_path, monkeypatch):
+    _many_processes(monkeypatch)
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"{i}.bin"
+        path.write_bytes(os.urandom(1000 * (i + 1)))
+        paths.append(path)
+    paths.append(tmp_path / "missing.bin")
+
+    digests = procpool.hash_many(paths, [1] * len(paths), STORED_ALGORITHM)
+
+    assert digests == [hash_file(path, STORED_ALGORITHM) for path in paths[:-1]] + [None]
+
+
+def test_snapshot_skips_content_the_store_has(tmp_path, monkeypatch):
+    _many_processes(monkeypatch)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    for i in range(4):
+        (src / f"{i}.txt").write_text(f"file {i}")
+
+    def run():
+        index = scan_tree(src)
+        reused, to_store = snapshot.plan_snapshot(index, dst, "E")
+        result = CopyResult(destination=dst)
+        snapshot.take_snapshot(src, index, dst, "E", result, reused, to_store, verify=True, processes=2)
+        return result, to_store
+
+    run()
+    for i in range(4):
+        os.utime(src / f"{i}.txt", ns=(1, 1))  # touched: new mtime, same content
+    stored = []
+    real_store = snapshot.store_blob
+    monkeypatch.setattr(snapshot, "store_blob", lambda src, *args: stored.append(src) or real_store(src, *args))
+
+    result, to_store = run()
+
+    assert len(to_store) == 4
+    assert stored == []
+    assert (result.copied, result.skipped, result.verify_failed) == (0, 4, [])
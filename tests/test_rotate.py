@@ -0,0 +1,92 @@
+# ⌘
+#
+#  /fileknight/tests/test_rotate.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from core import planner
+from core.copier import copy_item
+from core.models import Entry
+from core.rotate import list_rotations, new_rotation_name, retain
+
+NOON = datetime(2026, 9, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOON]
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now[0]
+
+    monkeypatch.setattr(planner, "datetime", Clock)
+    return now
+
+
+def _write(path, text, stamp):
+    path.write_text(text)
+    os.utime(path, (stamp, stamp))  # distinct mtimes even where the filesystem clock is coarse
+
+
+def test_same_second_suffixes_sort_numerically(tmp_path):
+    names = ["2026-09-01_120000", "2026-09-01_120000-10", "2026-09-01_120000-9", "2026-09-01_120000-2"]
+    for name in names:
+        (tmp_path / name).mkdir()
+
+    assert list_rotations(tmp_path) == [
+        "2026-09-01_120000", "2026-09-01_120000-2", "2026-09-01_120000-9", "2026-09-01_120000-10",
+    ]
+    assert new_rotation_name(tmp_path, NOON) == "2026-09-01_120000-11"
+    assert retain(names, 1, 0) == {"2026-09-01_120000-10"}
+
+
+def test_new_name_skips_leftovers(tmp_path):
+    (tmp_path / "2026-09-01_120000").mkdir()
+    (tmp_path / ".2026-09-01_120000-3.deleting").mkdir()
+    (tmp_path / ".2026-09-01_120000-4.part").mkdir()
+
+    assert new_rotation_name(tmp_path, NOON) == "2026-09-01_120000-5"
+    assert new_rotation_name(tmp_path, NOON + timedelta(seconds=1)) == "2026-09-01_120001"
+
+
+def test_runs_in_one_second_stay_in_order_after_pruning(tmp_path, clock):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    entry = Entry("R", src, "rotate", keep_daily=1, keep_weekly=0)
+    for run in range(3):
+        _write(src / "file.txt", f"run {run}", 1_000_000 + run)
+        copy_item(entry, dst, False)
+
+    # same day: each run prunes the one before, yet never reuses its name
+    assert list_rotations(dst / "R") == ["2026-09-01_120000-3"]
+    assert (dst / "R" / "2026-09-01_120000-3" / "src" / "file.txt").read_text() == "run 2"
+
+
+def test_retention_prunes_and_links(tmp_path, clock):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    (src / "same.txt").write_text("unchanged")
+    entry = Entry("R", src, "rotate", keep_daily=2, keep_weekly=0)
+    for day in range(4):
+        clock[0] = NOON + timedelta(days=day)
+        _write(src / "changing.txt", f"day {day}", 1_000_000 + day)
+        result = copy_item(entry, dst, False)
+
+    kept = list_rotations(dst / "R")
+    assert kept == ["2026-09-03_120000", "2026-09-04_120000"]
+    assert result.deleted == 1
+    newest = dst / "R" / kept[-1] / "src"
+    assert (newest / "changing.txt").read_text() == "day 3"
+    assert (newest / "same.txt").stat().st_nlink == 2  # shared with the other kept snapshot
+    assert not [p for p in (dst / "R").iterdir() if p.name.startswith(".")]
@@ -0,0 +1,50 @@
+# ⌘
+#
+#  /fileknight/tests/test_snapshot.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import os
+
+from core import snapshot
+from core.models import CopyResult
+from core.scanner import scan_tree
+
+
+def _run(src, dst, verify=False):
+    index = scan_tree(src)
+    reused, to_store = snapshot.plan_snapshot(index, dst, "E")
+    result = CopyResult(destination=dst)
+    manifest = snapshot.take_snapshot(src, index, dst, "E", result, reused, to_store, verify=verify)
+    return result, snapshot.read_manifest(manifest)
+
+
+def test_verify_failure_keeps_the_manifest_on_existing_blobs(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    (src / "kept.txt").write_text("first")
+    (src / "new.txt").write_text("new")
+    _run(src, dst)
+
+    (src / "kept.txt").write_text("second version")
+    os.utime(src / "kept.txt", ns=(1, 1))
+    (src / "other.txt").write_text("other")
+    monkeypatch.setattr(snapshot, "verify_blobs", lambda objects, digests, *args: [False] * len(digests))
+    result, data = _run(src, dst, verify=True)
+
+    assert sorted(result.verify_failed) == ["kept.txt", "other.txt"]
+    objects = snapshot.store_dir(dst)
+    for info in data["files"].values():
+        assert snapshot.blob_path(objects, info["digest"]).is_file()
+    assert "other.txt" not in data["files"]  # no earlier version to fall back to
+    assert data["files"]["kept.txt"]["size"] == len("first")  # the previous snapshot's record
+
+    monkeypatch.undo()
+    result, data = _run(src, dst, verify=True)
+    assert result.verify_failed == []
+    assert sorted(data["files"]) == ["kept.txt", "new.txt", "other.txt"]
+    assert result.copied == 2
@@ -0,0 +1,24 @@
+# ⌘
+#
+#  /fileknight/tests/test_tee.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+from core.tee import SharedReads
+
+
+def test_only_files_read_by_several_destinations_are_teed(tmp_path):
+    (tmp_path / "one.bin").write_bytes(b"one")
+    (tmp_path / "both.bin").write_bytes(b"both" * 1000)
+    shared = SharedReads(tmp_path, {"one.bin": {"a"}, "both.bin": {"a", "b"}})
+    a, b = shared.view("a"), shared.view("b")
+
+    assert a.open("one.bin") is None
+
+    with a.open("both.bin") as fa, b.open("both.bin") as fb:
+        assert fa.read() == fb.read() == b"both" * 1000
+    assert shared.rereads == 0
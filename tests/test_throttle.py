@@ -0,0 +1,80 @@
+# ⌘
+#
+#  /fileknight/tests/test_throttle.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import pytest
+
+import core.throttle as throttle_module
+from core.throttle import BURST_SECONDS, BYTES_PER_MBIT, PACED_CHUNK, Throttle, TokenBucket
+
+
+class FakeClock:
+    """
+    Stands in for the time module: sleep() only moves the clock forward.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(throttle_module, "time", fake)
+    return fake
+
+
+def test_bucket_allows_a_burst_up_to_capacity(clock):
+    bucket = TokenBucket(1000.0)
+    assert bucket.burst == 1000.0 * BURST_SECONDS
+
+    assert bucket.reserve(bucket.burst) == 0.0
+    assert bucket.reserve(100) == pytest.approx(0.1)
+
+
+def test_idle_bucket_refills_only_to_capacity(clock):
+    bucket = TokenBucket(1000.0)
+    bucket.reserve(bucket.burst)
+
+    clock.now += 60.0  # long idle: tokens stop at burst, not 60 s worth
+    assert bucket.reserve(bucket.burst) == 0.0
+    assert bucket.reserve(1000) == pytest.approx(1.0)
+
+
+def test_throttle_holds_the_configured_rate(clock):
+    mbps = 8.0
+    rate = mbps * BYTES_PER_MBIT
+    throttle = Throttle(max_mbps=mbps)
+    total = 40 * PACED_CHUNK
+
+    for _ in range(total // PACED_CHUNK):
+        throttle.pace(PACED_CHUNK)
+
+    # everything beyond the initial burst is paid for at exactly the configured rate
+    assert clock.slept == pytest.approx((total - rate * BURST_SECONDS) / rate)
+
+
+def test_tighter_of_entry_and_run_limit_wins(clock):
+    run = Throttle(max_mbps=8.0)
+    child = Throttle(max_mbps=2.0, parent=run)
+    rate = 2.0 * BYTES_PER_MBIT
+    total = 20 * PACED_CHUNK
+
+    for _ in range(total // PACED_CHUNK):
+        child.pace(PACED_CHUNK)
+
+    assert clock.slept == pytest.approx((total - rate * BURST_SECONDS) / rate)
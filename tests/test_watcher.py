@@ -0,0 +1,85 @@
+# ⌘
+#
+#  /fileknight/tests/test_watcher.py
+#
+#  Created by @jonathaxs on 2026-10-17.
+#
+# ⌘
+
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from core.filters import compile_filter
+from core.watcher import InotifyWatcher, Watcher, make_watcher
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+
+@linux_only
+def test_single_file_root_reports_only_that_file(tmp_path):
+    target = tmp_path / "notes.txt"
+    target.write_text("a")
+    (tmp_path / "sub").mkdir()
+    watcher = InotifyWatcher([target])
+    try:
+        (tmp_path / "other.txt").write_text("b")
+        (tmp_path / "sub" / "deep.txt").write_text("c")
+        (tmp_path / "newdir").mkdir()
+        (tmp_path / "newdir" / "inside.txt").write_text("d")
+        assert watcher.poll(0.2) == set()
+
+        target.write_text("changed")
+        assert watcher.poll(0.2) == {target}
+    finally:
+        watcher.close()
+
+
+def test_make_watcher_returns_the_fallback_reason(tmp_path, monkeypatch, capsys):
+    import core.watcher as watcher_module
+
+    def broken(*args):
+        raise OSError(28, "watch limit")
+
+    monkeypatch.setattr(watcher_module.sys, "platform", "linux")
+    monkeypatch.setattr(watcher_module, "InotifyWatcher", broken)
+    watcher, reason = make_watcher([tmp_path], 5.0)
+    watcher.close()
+    assert isinstance(watcher, watcher_module.PollingWatcher)
+    assert "watch limit" in reason
+    assert capsys.readouterr().out == ""
+
+
+@linux_only
+def test_excluded_folders_are_not_watched(tmp_path):
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "app").mkdir()
+    watcher = InotifyWatcher([tmp_path], [compile_filter((), ("node_modules/",))])
+    try:
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x")
+        (tmp_path / "node_modules" / "new").mkdir()
+        (tmp_path / "app" / "main.py").write_text("y")
+
+        assert watcher.poll(0.2) == {tmp_path / "app" / "main.py"}
+    finally:
+        watcher.close()
+
+
+@linux_only
+def test_file_created_in_a_new_folder_is_reported(tmp_path):
+    watcher = InotifyWatcher([tmp_path])
+    try:
+        (tmp_path / "new").mkdir()
+        assert tmp_path / "new" in watcher.poll(0.2)  # the folder appears, and is now watched
+
+        (tmp_path / "new" / "file.txt").write_text("x")
+        assert tmp_path / "new" / "file.txt" in watcher.poll(0.2)
+    finally:
+        watcher.close()
+
+
+def test_watcher_needs_a_poll():
+    with pytest.raises(TypeError):
+        Watcher()